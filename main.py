@@ -1,9 +1,77 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from importlib.util import find_spec
+from fastapi import FastAPI, Response, status
+from fastapi.responses import PlainTextResponse
+from fastapi.logger import logger
 import uvicorn
+import os
 import sys
+import time
 from src.backend.checkout import checkoutRouter
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.database.dbConnectionFactory import DBConnectionFactory
+from src.backend.database.migrations import migrate_database, check_query_plans
+from src.backend.dao.mmapCatalog import build_from_database
+from src.backend.config.configService import AppConfig, config_service
+from src.backend.checkout.quoteCache import quote_cache
+from src.backend.metrics.metrics import registry
+from src.backend.metrics.metricsMiddleware import MetricsMiddleware
+from src.backend.metrics.profilingMiddleware import ProfilingMiddleware
+from src.backend.metrics.collectors import register_default_collectors
 
-app = FastAPI()
+
+async def warm_up(config: AppConfig) -> dict:
+    """
+    Gets a worker ready for traffic: schema, catalog snapshot and open connections
+
+    Returns: what was warmed, reported by /ready
+    """
+    started = time.perf_counter()
+    quote_cache.configure(capacity=config.quote_cache.capacity)
+    catalog = config.catalog
+    uses_sqlite = catalog.backend == "sqlite" or (catalog.backend == "memory" and catalog.memory_source == "sqlite")
+    connections = 0
+    if uses_sqlite:
+        migrate_database(dbpath=config.dbpath)
+        for name, steps in check_query_plans(dbpath=config.dbpath).items():
+            logger.warning(f"Query {name} is not using an index - {steps}")
+    if catalog.backend == "mmap" and not os.path.exists(catalog.mmap_path):
+        migrate_database(dbpath=config.dbpath)
+        version = build_from_database(dbpath=config.dbpath, path=catalog.mmap_path)
+        logger.info(f"Binary catalog {version} built at {catalog.mmap_path}")
+    try:
+        await catalog_store.load(config=config)
+    except Exception as e:
+        logger.warning(f"Catalog snapshot not loaded, falling back to database lookups - {e}")
+    if uses_sqlite:
+        factory = DBConnectionFactory(config=config)
+        connections = await factory.run(factory.pool.warm, config.server.warm_connections)
+    snapshot = catalog_store.snapshot
+    return {
+        "catalog_version": snapshot.version if snapshot is not None else None,
+        "catalog_items": len(snapshot) if snapshot is not None else 0,
+        "connections": connections,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    config = config_service.load()
+    config_service.install_signal_handler()
+    app.state.warm_up = await warm_up(config=config)
+    app.state.ready = True
+    logger.info(f"Worker {os.getpid()} ready - {app.state.warm_up}")
+    yield
+    app.state.ready = False
+    DBConnectionFactory.shutdown_executor()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+profiling = config_service.get().profiling
+if profiling.enabled:
+    app.add_middleware(ProfilingMiddleware, config=profiling)
+register_default_collectors()
 
 app.include_router(checkoutRouter.router)
 
@@ -11,14 +79,47 @@ app.include_router(checkoutRouter.router)
 def root():
     return {"message": "API is running"}
 
+@app.get("/ready")
+def ready(response: Response) -> dict:
+    """
+    Readiness probe, 503 until this worker has finished warming up
+    """
+    if not getattr(app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"ready": False}
+    return {"ready": True, **app.state.warm_up}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    "Prometheus text format metrics"
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+def server_options(config: AppConfig) -> dict:
+    """
+    uvicorn settings for production: no reload, one worker per core unless server.workers
+    says otherwise, and uvloop / httptools when they are installed
+    """
+    server = config.server
+    return {
+        "host": server.host,
+        "port": server.port,
+        "workers": server.workers or os.cpu_count() or 1,
+        "reload": False,
+        "loop": "uvloop" if find_spec("uvloop") else "asyncio",
+        "http": "httptools" if find_spec("httptools") else "h11",
+        "timeout_keep_alive": server.keep_alive,
+        "backlog": server.backlog,
+        "log_config": "./config/prod_log_conf.yml",
+    }
+
 def main(args = ""):
     if args == "prod":
-        uvicorn.run("main:app", host="localhost", port=8000, reload=True, log_config="./config/prod_log_conf.yml")
+        uvicorn.run("main:app", **server_options(config_service.load()))
     else:
         uvicorn.run("main:app", host="localhost", port=8000, reload=True, log_config="./config/dev_log_conf.yml")
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
-        arg = sys.argv[1]
-        main(arg)
-    main()
\ No newline at end of file
+        main(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,79 @@
+import argparse
+import csv
+import json
+import os
+import random
+from src.backend.database.catalogImport import import_catalog
+
+
+def sku_code(index: int) -> str:
+    return f"SKU{index:07d}"
+
+
+def generate_csvs(out_dir: str, skus: int, offer_ratio: float = 0.3, seed: int = 42) -> tuple[str, str]:
+    """
+    Writes prices.csv and offers.csv in the same layout as src/backend/database
+
+    Output is deterministic for a given seed, so runs are comparable between machines
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    prices_path = os.path.join(out_dir, "prices.csv")
+    offers_path = os.path.join(out_dir, "offers.csv")
+    with open(prices_path, "w", newline="") as prices_file, open(offers_path, "w", newline="") as offers_file:
+        prices = csv.writer(prices_file)
+        offers = csv.writer(offers_file)
+        prices.writerow(["id", "code", "price"])
+        offers.writerow(["id", "code", "amount", "offerprice"])
+        offer_id = 1
+        for index in range(1, skus + 1):
+            price = rng.randint(5, 500)
+            prices.writerow([index, sku_code(index), price])
+            if rng.random() < offer_ratio:
+                amount = rng.randint(2, 5)
+                offers.writerow([offer_id, sku_code(index), amount, price * amount * rng.randint(70, 95) // 100])
+                offer_id += 1
+    return prices_path, offers_path
+
+
+def build_database(dbpath: str, prices_path: str, offers_path: str) -> str:
+    """
+    Loads the generated CSVs into a fresh SQLite database with the catalog importer
+    """
+    import_catalog(dbpath=dbpath, prices_path=prices_path, offers_path=offers_path, fresh=True)
+    return dbpath
+
+
+def write_pricing_json(path: str, prices_path: str, offers_path: str) -> str:
+    """
+    Writes the generated CSVs as a pricing.json file for the JSON catalog backend
+    """
+    pricing = {}
+    with open(prices_path, newline="") as file:
+        for row in csv.DictReader(file):
+            pricing[row["code"]] = {"price": int(row["price"])}
+    with open(offers_path, newline="") as file:
+        for row in csv.DictReader(file):
+            pricing[row["code"]].setdefault("offers", []).append({"amount": int(row["amount"]), "price": int(row["offerprice"])})
+    with open(path, "w") as file:
+        json.dump(pricing, file)
+    return path
+
+
+def generate_catalog(out_dir: str, skus: int, seed: int = 42) -> str:
+    prices_path, offers_path = generate_csvs(out_dir=out_dir, skus=skus, seed=seed)
+    return build_database(dbpath=os.path.join(out_dir, "shoppingitems.db"), prices_path=prices_path, offers_path=offers_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalog and SQLite database")
+    parser.add_argument("--skus", type=int, default=10000)
+    parser.add_argument("--out", default="./bench_data")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    dbpath = generate_catalog(out_dir=args.out, skus=args.skus, seed=args.seed)
+    print(f"Catalog with {args.skus} SKUs written to {dbpath}")
+
+
+if __name__ == "__main__":
+    main()
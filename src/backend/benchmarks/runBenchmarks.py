@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from src.backend.benchmarks.catalogGenerator import generate_catalog, sku_code, write_pricing_json
+from src.backend.checkout.functions import CheckoutItem, get_total, get_totals
+from src.backend.checkout.quoteCache import quote_cache
+from src.backend.config.configService import AppConfig
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.dao.catalogBackend import clear_backends, get_backend
+
+DEFAULT_SIZES = [10, 10000, 1000000]
+BASKET_LINES = [1, 10, 100, 1000]
+BACKENDS = ["sqlite", "json", "memory", "columnar"]
+
+
+async def measure(factory, iterations: int, warmup: int = 3) -> dict:
+    """
+    Awaits factory() repeatedly and summarises wall-clock latency in microseconds
+    """
+    for _ in range(warmup):
+        await factory()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        await factory()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "mean_us": statistics.fmean(samples),
+        "p50_us": samples[len(samples) // 2],
+        "p95_us": samples[min(int(len(samples) * 0.95), len(samples) - 1)],
+        "min_us": samples[0],
+    }
+
+
+def random_basket(rng: random.Random, skus: int, lines: int) -> list[CheckoutItem]:
+    return [CheckoutItem(code=sku_code(rng.randint(1, skus)), quant=rng.randint(1, 12)) for _ in range(lines)]
+
+
+async def run_size(skus: int, work_dir: str, iterations: int) -> dict:
+    dbpath = generate_catalog(out_dir=f"{work_dir}/{skus}", skus=skus)
+    config = AppConfig.from_dict({"dbpath": dbpath})
+    rng = random.Random(skus)
+    results = {}
+    line = random_basket(rng, skus, 1)[0]
+
+    catalog_store.clear()
+    results["get_total.db"] = await measure(lambda: get_total(line, config=config), iterations)
+    for lines in BASKET_LINES:
+        basket = random_basket(rng, skus, lines)
+        results[f"checkout.db.{lines}_lines"] = await measure(lambda: get_totals(basket, config=config), iterations)
+
+    await catalog_store.load(config=config)
+    try:
+        quote_cache.clear()
+        results["get_total.snapshot"] = await measure(lambda: get_total(line, config=config), iterations)
+        for lines in BASKET_LINES:
+            basket = random_basket(rng, skus, lines)
+            results[f"checkout.snapshot.{lines}_lines"] = await measure(lambda: get_totals(basket, config=config), iterations)
+    finally:
+        catalog_store.clear()
+        quote_cache.clear()
+
+    listing_iterations = max(1, iterations // 10) if skus >= 100000 else iterations
+    results["catalog_listing"] = await measure(lambda: get_backend(config=config).get_all(table="prices"), listing_iterations, warmup=1)
+    results.update(await run_backends(dbpath=dbpath, rng=rng, skus=skus, iterations=iterations))
+    return {f"{skus}_skus.{name}": result for name, result in results.items()}
+
+
+async def run_backends(dbpath: str, rng: random.Random, skus: int, iterations: int) -> dict:
+    """
+    Times the same lookups through every catalog backend
+    """
+    out_dir = os.path.dirname(dbpath)
+    json_path = write_pricing_json(path=os.path.join(out_dir, "pricing.json"), prices_path=os.path.join(out_dir, "prices.csv"),
+                                   offers_path=os.path.join(out_dir, "offers.csv"))
+    code = sku_code(rng.randint(1, skus))
+    codes = [sku_code(rng.randint(1, skus)) for _ in range(100)]
+    results = {}
+    try:
+        for kind in BACKENDS:
+            config = AppConfig.from_dict({"dbpath": dbpath, "catalog": {"backend": kind, "json_path": json_path}})
+            backend = get_backend(config=config)
+            await backend.get_item(code)
+            results[f"backend.{kind}.get_item"] = await measure(lambda: backend.get_item(code), iterations)
+            results[f"backend.{kind}.get_items_100"] = await measure(lambda: backend.get_items(codes), iterations)
+    finally:
+        clear_backends()
+    return results
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    Lists benchmarks whose p50 is more than max_regression slower than the baseline
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = result["p50_us"] / previous["p50_us"] if previous["p50_us"] else 1.0
+        result["baseline_p50_us"] = previous["p50_us"]
+        result["ratio"] = ratio
+        if ratio > 1 + max_regression:
+            regressions.append(f"{name}: p50 {result['p50_us']:.1f}us vs baseline {previous['p50_us']:.1f}us ({ratio:.2f}x)")
+    return regressions
+
+
+async def run(sizes: list[int], iterations: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for skus in sizes:
+            results.update(await run_size(skus=skus, work_dir=work_dir, iterations=iterations))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Checkout performance benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", default="./bench_results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p50 slowdown, 0.2 = 20%%")
+    parser.add_argument("--save-baseline", help="also write the results here as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(sizes=args.sizes, iterations=args.iterations))
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            regressions = compare(results=results, baseline=json.load(file)["results"], max_regression=args.max_regression)
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "sizes": args.sizes, "iterations": args.iterations},
+        "results": results,
+        "regressions": regressions,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+
+    for name, result in results.items():
+        print(f"{name:45} p50 {result['p50_us']:12.1f}us  p95 {result['p95_us']:12.1f}us")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import numpy as np
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.dao.columnarCatalog import ColumnarCatalog
+from src.backend.checkout.pricingEngine import PricingPlan, plan_for
+
+
+class CatalogArrays:
+    """
+    Catalog encoded as integer-indexed NumPy columns for vectorised pricing
+
+    Row i holds the unit price and best-value offer tier of codes[i]. Items whose plan
+    needs the multi-tier table are flagged in tiered and priced through their plan.
+    """
+    __slots__ = ("index", "items", "catalog", "plans", "prices", "best_amounts", "best_prices", "tiered")
+
+    def __init__(self, items: dict[str, CatalogItem]):
+        self.catalog = None
+        self.plans = {}
+        self.items = list(items.values())
+        self.index = {item.code: i for i, item in enumerate(self.items)}
+        plans = [plan_for(item) for item in self.items]
+        self.prices = np.fromiter((plan.price for plan in plans), dtype=np.int64, count=len(plans))
+        self.best_amounts = np.fromiter((plan.best_amount or 0 for plan in plans), dtype=np.int64, count=len(plans))
+        self.best_prices = np.fromiter((plan.best_price or 0 for plan in plans), dtype=np.int64, count=len(plans))
+        self.tiered = np.fromiter((plan.table is not None for plan in plans), dtype=bool, count=len(plans))
+
+    @classmethod
+    def from_columnar(cls, catalog: ColumnarCatalog) -> "CatalogArrays":
+        """
+        Derives the columns straight from a ColumnarCatalog's rows, without building an item per code
+
+        Offers that do not beat the unit price are ignored as in PricingPlan, and items with more
+        than one offer left are flagged tiered.
+        """
+        arrays = cls.__new__(cls)
+        arrays.catalog, arrays.plans, arrays.items, arrays.index = catalog, {}, None, None
+        arrays.prices = catalog.prices
+        owners, amounts, offer_prices = catalog.offer_rows, catalog.offer_amounts, catalog.offer_prices
+        useful = (amounts > 0) & (offer_prices < arrays.prices[owners] * amounts)
+        counts = np.bincount(owners[useful], minlength=len(arrays.prices))
+        single = useful & (counts[owners] == 1)
+        arrays.best_amounts = np.zeros(len(arrays.prices), dtype=np.int64)
+        arrays.best_prices = np.zeros(len(arrays.prices), dtype=np.int64)
+        arrays.best_amounts[owners[single]] = amounts[single]
+        arrays.best_prices[owners[single]] = offer_prices[single]
+        arrays.tiered = counts > 1
+        return arrays
+
+    def code_ids(self, codes: list[str]) -> np.ndarray:
+        """
+        Returns: the row of every code, -1 for unknown codes
+        """
+        if self.catalog is not None:
+            return self.catalog.code_ids(codes)
+        index = self.index
+        return np.fromiter((index.get(code, -1) for code in codes), dtype=np.int64, count=len(codes))
+
+    def plan(self, row: int) -> PricingPlan:
+        if self.catalog is None:
+            return plan_for(self.items[row])
+        plan = self.plans.get(row)
+        if plan is None:
+            plan = self.plans[row] = plan_for(self.catalog.item_at(row))
+        return plan
+
+    def line_totals(self, item_ids: np.ndarray, quants: np.ndarray) -> np.ndarray:
+        """
+        Prices every (item id, quantity) line at once, unknown items (id -1) cost 0
+        """
+        if not len(self.prices):
+            return np.zeros(len(item_ids), dtype=np.int64)
+        known = item_ids >= 0
+        ids = np.where(known, item_ids, 0)
+        prices = self.prices[ids]
+        amounts = self.best_amounts[ids]
+        has_offer = (amounts > 0) & (quants > 0)
+        bundles, remainder = np.divmod(quants, np.where(has_offer, amounts, 1))
+        totals = np.where(has_offer, bundles * self.best_prices[ids] + remainder * prices, quants * prices)
+        tiered_lines = np.flatnonzero(known & self.tiered[ids])
+        for line in tiered_lines:
+            totals[line] = self.plan(int(ids[line])).total(int(quants[line]))
+        return np.where(known, totals, 0)
+
+
+INT64_MAX = int(np.iinfo(np.int64).max)
+
+_snapshot_arrays = (None, None)
+
+def arrays_for_snapshot(snapshot) -> CatalogArrays:
+    """
+    Returns the arrays for a catalog snapshot, encoding it only once per version
+    """
+    global _snapshot_arrays
+    version, arrays = _snapshot_arrays
+    if version != snapshot.version or arrays is None:
+        if isinstance(snapshot.items, ColumnarCatalog):
+            arrays = CatalogArrays.from_columnar(snapshot.items)
+        else:
+            arrays = CatalogArrays(snapshot.items)
+        _snapshot_arrays = (snapshot.version, arrays)
+    return arrays
+
+
+def price_baskets(baskets: list[list], catalog: CatalogArrays) -> list[int]:
+    """
+    Prices many baskets of CheckoutItem lines in one vectorised pass
+
+    No line costs more than its quantity at the unit price, so when the largest quantity at
+    the highest unit price, times the number of lines, could leave int64 the baskets are
+    priced line by line with Python ints instead
+
+    Returns:
+        list[int]: one total per basket, in the order given
+    """
+    sizes = [len(basket) for basket in baskets]
+    quant_list = [line.quant for basket in baskets for line in basket]
+    item_ids = catalog.code_ids([line.code for basket in baskets for line in basket])
+    largest_quant = max(map(abs, quant_list), default=0)
+    highest_price = int(np.abs(catalog.prices).max()) if len(catalog.prices) else 0
+    if largest_quant * highest_price * len(quant_list) > INT64_MAX:
+        return exact_basket_totals(sizes=sizes, item_ids=item_ids.tolist(), quants=quant_list, catalog=catalog)
+    quants = np.array(quant_list, dtype=np.int64)
+    basket_ids = np.repeat(np.arange(len(baskets)), sizes)
+    totals = np.zeros(len(baskets), dtype=np.int64)
+    np.add.at(totals, basket_ids, catalog.line_totals(item_ids=item_ids, quants=quants))
+    return totals.tolist()
+
+
+def exact_basket_totals(sizes: list[int], item_ids: list[int], quants: list[int], catalog: CatalogArrays) -> list[int]:
+    totals = []
+    line = 0
+    for size in sizes:
+        lines = zip(item_ids[line:line + size], quants[line:line + size])
+        totals.append(sum(catalog.plan(row).total(quant) for row, quant in lines if row >= 0))
+        line += size
+    return totals
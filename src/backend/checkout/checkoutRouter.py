@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Response, status
+import json
+from fastapi import APIRouter, Body, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.logger import logger
-from src.backend.dao.readDao import ReadDao
-from src.backend.checkout.functions import CheckoutItem, get_total
+from src.backend.dao.catalogBackend import get_backend
+from src.backend.checkout.functions import CheckoutItem, get_totals, get_batch_totals, normalize_basket
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.config.configService import AppConfig, get_config
+from src.backend.checkout.httpCache import catalog_etag, etag_for, not_modified, cache_headers, not_modified_response
+from src.backend.checkout.responseCache import IDENTITY, choose_encoding, response_cache
 
 
 router = APIRouter(
@@ -19,18 +25,98 @@ def check_route() -> dict:
     """
     return {"message": "Checkout Route is working"}
 
+@router.post("/catalog/reload")
+async def reload_catalog(response: Response, config: AppConfig = Depends(get_config)) -> dict:
+    """
+    Reloads the in-memory catalog snapshot from the catalog backend
+    
+    Returns:
+        dict: version and size of the snapshot now in use
+    """
+    try:
+        snapshot = await catalog_store.reload(config=config)
+        return {"message": "Catalog reloaded", "version": snapshot.version, "items": len(snapshot)}
+    except Exception as e:
+        response.status_code = 500
+        return {"message": f"Exception - {e}"}
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+async def stream_table(table: str, config: AppConfig, headers: dict | None = None) -> StreamingResponse:
+    """
+    Streams a whole table as newline delimited JSON, one row per line, chunk by chunk
+    """
+    chunks = await get_backend(config=config).stream_all(table=table, chunk_size=config.streaming.chunk_size)
+
+    async def encode():
+        async for columns, rows in chunks:
+            yield "".join(json.dumps(dict(zip(columns, row)), separators=(",", ":")) + "\n" for row in rows).encode()
+
+    return StreamingResponse(encode(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+async def cached_table(table: str, request: Request, config: AppConfig) -> Response | None:
+    """
+    Serves a whole table from the response cache, as bytes encoded once per catalog version
+
+    The body is encoded from the snapshot's own rows, never the live backend, so the bytes
+    always belong to the version they are cached and tagged under. The ETag names the
+    content coding actually used, so it is resolved from the cached body before
+    If-None-Match is checked. Returns None when no snapshot that can list its rows is loaded.
+    """
+    snapshot = await catalog_store.current(config=config)
+    if snapshot is None:
+        return None
+    rows = snapshot.rows(table)
+    if rows is None:
+        return None
+
+    async def load_rows():
+        return rows
+
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), offered=config.http.compression)
+    body, used = await response_cache.get(table=table, version=snapshot.version, encoding=encoding,
+                                          load_rows=load_rows, min_size=config.http.compression_min_size)
+    etag = etag_for(version=snapshot.version, variant="" if used == IDENTITY else f"-{used}")
+    if not_modified(request, etag):
+        return not_modified_response(etag=etag, config=config)
+    headers = cache_headers(etag=etag, config=config)
+    if used != IDENTITY:
+        headers["Content-Encoding"] = used
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.get("/prices")
-async def get_prices(response: Response) -> list[dict]:
-    "Gets all prices from prices table"
+async def get_prices(request: Request, response: Response, stream: bool = False, config: AppConfig = Depends(get_config)) -> list[dict]:
+    """
+    Gets all prices from prices table
+    
+    Streams newline delimited JSON when stream=1 or the client accepts application/x-ndjson.
+    Responses carry the catalog ETag and If-None-Match answers 304 without a query.
+    With a catalog snapshot loaded the body comes pre-encoded, and compressed per
+    Accept-Encoding, from the response cache.
+    """
     try:
-        price_data = await ReadDao().get_all_items(table="prices")
+        streaming = wants_stream(request, stream)
+        if not streaming and config.http.response_cache:
+            cached = await cached_table(table="prices", request=request, config=config)
+            if cached is not None:
+                return cached
+        etag = await catalog_etag(config=config, variant="-ndjson" if streaming else "")
+        if not_modified(request, etag):
+            return not_modified_response(etag=etag, config=config)
+        if streaming:
+            return await stream_table(table="prices", config=config, headers=cache_headers(etag=etag, config=config))
+        price_data = await get_backend(config=config).get_all(table="prices")
+        response.headers.update(cache_headers(etag=etag, config=config))
         return price_data
     except Exception as e:
         response.status_code = 404
         return [{"message": f"Exception  - {e}"}]
 
 @router.get("/prices/{priceid}")
-async def get_price_with_id(priceid:int, response:Response) -> list[dict]:
+async def get_price_with_id(priceid:int, request: Request, response:Response, config: AppConfig = Depends(get_config)) -> list[dict]:
     """
     Get single offer from offer table
     
@@ -41,7 +127,11 @@ async def get_price_with_id(priceid:int, response:Response) -> list[dict]:
         item: list[dict] -> the item
     """
     try:
-        price_data = await ReadDao().get_single_item(table="prices", column="id", value=str(priceid))
+        etag = await catalog_etag(config=config)
+        if not_modified(request, etag):
+            return not_modified_response(etag=etag, config=config)
+        price_data = await get_backend(config=config).get_by_id(table="prices", id=priceid)
+        response.headers.update(cache_headers(etag=etag, config=config))
         return price_data
     except Exception as e:
         response.status_code = 404
@@ -49,10 +139,28 @@ async def get_price_with_id(priceid:int, response:Response) -> list[dict]:
         
 
 @router.get("/offers")
-async def get_offers(response: Response) -> list[dict]:
-    "Gets all offers from offers table"
+async def get_offers(request: Request, response: Response, stream: bool = False, config: AppConfig = Depends(get_config)) -> list[dict]:
+    """
+    Gets all offers from offers table
+    
+    Streams newline delimited JSON when stream=1 or the client accepts application/x-ndjson.
+    Responses carry the catalog ETag and If-None-Match answers 304 without a query.
+    With a catalog snapshot loaded the body comes pre-encoded, and compressed per
+    Accept-Encoding, from the response cache.
+    """
     try:
-        offer_data = await ReadDao().get_all_items(table="offers")
+        streaming = wants_stream(request, stream)
+        if not streaming and config.http.response_cache:
+            cached = await cached_table(table="offers", request=request, config=config)
+            if cached is not None:
+                return cached
+        etag = await catalog_etag(config=config, variant="-ndjson" if streaming else "")
+        if not_modified(request, etag):
+            return not_modified_response(etag=etag, config=config)
+        if streaming:
+            return await stream_table(table="offers", config=config, headers=cache_headers(etag=etag, config=config))
+        offer_data = await get_backend(config=config).get_all(table="offers")
+        response.headers.update(cache_headers(etag=etag, config=config))
 
         return offer_data
     except Exception as e:
@@ -60,7 +168,7 @@ async def get_offers(response: Response) -> list[dict]:
         return [{"message": f"Exception  - {e}"}]
 
 @router.get("/offer/{offerid}")
-async def get_offer_with_id(offerid:int, response: Response) -> list[dict]:
+async def get_offer_with_id(offerid:int, request: Request, response: Response, config: AppConfig = Depends(get_config)) -> list[dict]:
     """
     Get single offer from offer table
     
@@ -71,29 +179,52 @@ async def get_offer_with_id(offerid:int, response: Response) -> list[dict]:
         offer: list[dict] -> the offer
     """
     try:
-        offer_data = await ReadDao().get_single_item(table="offers", column="id", value=str(offerid))
+        etag = await catalog_etag(config=config)
+        if not_modified(request, etag):
+            return not_modified_response(etag=etag, config=config)
+        offer_data = await get_backend(config=config).get_by_id(table="offers", id=offerid)
+        response.headers.update(cache_headers(etag=etag, config=config))
         return offer_data
     except Exception as e:
         response.status_code = 404
         return [{"message": f"Exception - {e}"}]
 
 @router.post("/")
-async def checkout(items:list[CheckoutItem], response:Response) -> dict:
+async def checkout(response:Response, items:list[CheckoutItem] | dict[str, int] | str = Body(), config: AppConfig = Depends(get_config)) -> dict:
     """
     Takes checkout list and returns a subtotal
     
     Input:
-        items: List of items
+        items: List of items, a {code: quantity} map or a scan string such as "AABAC"
         
     Returns:
         int: subtotal of items
     """
-    subtotal = 0
     try:
-        for item in items:
-            subtotal += await get_total(item)
+        lines = normalize_basket(items)
+        subtotal = sum(await get_totals(lines, config=config))
+        for item in lines:
             logger.info(f"Code: {item.code}, Quant:{item.quant}")
         return {"message": "Checkout complete", "total": subtotal}
     except Exception as e:
         response.status_code = 400
-        return [{"message": f"Execption - {e}"}]
\ No newline at end of file
+        return [{"message": f"Execption - {e}"}]
+
+@router.post("/batch")
+async def checkout_batch(response:Response, baskets:list[list[CheckoutItem] | dict[str, int] | str] = Body(), config: AppConfig = Depends(get_config)) -> dict:
+    """
+    Prices many baskets in one request
+    
+    Input:
+        baskets: List of baskets, each in any form checkout accepts
+        
+    Returns:
+        dict: totals, one subtotal per basket in the order given
+    """
+    try:
+        totals = await get_batch_totals([normalize_basket(basket) for basket in baskets], config=config)
+        logger.info(f"Batch checkout: {len(baskets)} baskets")
+        return {"message": "Batch checkout complete", "totals": totals}
+    except Exception as e:
+        response.status_code = 400
+        return {"message": f"Exception - {e}"}
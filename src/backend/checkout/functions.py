@@ -1,39 +1,173 @@
 from pydantic import BaseModel
-from src.backend.dao.readDao import ReadDao
+from src.backend.dao.catalogBackend import get_backend
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.config.configService import AppConfig, config_service
+from src.backend.checkout.pricingEngine import plan_for
+from src.backend.checkout.batchPricing import CatalogArrays, arrays_for_snapshot, price_baskets
+from src.backend.checkout.quoteCache import quote_cache
+from src.backend.metrics.metrics import PRICING
 from fastapi.logger import logger
+import asyncio
+import re
+import time
+from collections import Counter
+from collections.abc import Mapping
 
 class CheckoutItem(BaseModel):
     code: str = ""
     quant: int = 0
+
+SCAN_SEPARATORS = re.compile(r"[\s,]+")
+
+def normalize_basket(basket: list[CheckoutItem] | dict[str, int] | str) -> list[CheckoutItem]:
+    """
+    Merges a basket into one line per code before pricing, so repeated scans of an item
+    are priced together and looked up once
+
+    Input:
+        basket: list of CheckoutItem (or {"code", "quant"} dicts), a {code: quantity} map,
+            or a scan string with one code per unit - "AABAC" for single letter codes, or
+            codes separated by commas or whitespace ("SKU1,SKU1 SKU2")
+
+    Returns:
+        list[CheckoutItem]: one line per code in first scanned order, quantities summed.
+        Lines with no code, and codes whose quantity sums to zero or less or is missing, are dropped
+    """
+    if isinstance(basket, str):
+        scanned = SCAN_SEPARATORS.split(basket.strip()) if SCAN_SEPARATORS.search(basket.strip()) else basket.strip()
+        quants = Counter(scanned)
+    elif isinstance(basket, Mapping):
+        quants = basket
+    else:
+        quants = {}
+        for line in basket:
+            code, quant = (line.get("code", ""), line.get("quant")) if isinstance(line, Mapping) else (line.code, line.quant)
+            quants[code] = quants.get(code, 0) + (quant or 0)
+    return [CheckoutItem(code=code, quant=quant) for code, quant in quants.items() if code and quant and quant > 0]
     
 #Orchestrator Function
-async def get_total(item: CheckoutItem) -> int:
-    item_data = await get_item_data(item_code=item.code)
-    if item_data.empty:
+async def get_total(item: CheckoutItem, config: AppConfig | None = None) -> int:
+    snapshot = catalog_store.snapshot
+    if snapshot is not None:
+        catalog_item = snapshot.get(item.code)
+        if catalog_item is None:
+            logger.debug(f"No item in catalog {snapshot.version} for {item}, returning 0")
+            return 0
+        return quote_total(version=snapshot.version, catalog_item=catalog_item, quant=item.quant)
+    catalog_item = to_catalog_item(await get_item_data(item_code=item.code, config=config))
+    if catalog_item is None:
         logger.debug(f"No item data for {item}, returning 0")
         return 0
-    item_total = calculate_total(item_data=item_data, quant=item.quant)
-    return item_total
+    return calculate_catalog_total(catalog_item=catalog_item, quant=item.quant)
+
+#Orchestrator Function
+async def get_totals(items: list[CheckoutItem], config: AppConfig | None = None) -> list[int]:
+    snapshot = catalog_store.snapshot
+    if snapshot is not None:
+        basket_data, version = snapshot.items, snapshot.version
+    else:
+        basket_data = await get_basket_data(item_codes=[item.code for item in items], config=config)
+        version = None
+    totals = []
+    for item in items:
+        catalog_item = basket_data.get(item.code)
+        if catalog_item is None:
+            logger.debug(f"No item data for {item}, returning 0")
+            totals.append(0)
+            continue
+        totals.append(quote_total(version=version, catalog_item=catalog_item, quant=item.quant))
+    return totals
+
+#Orchestrator Function
+async def get_batch_totals(baskets: list[list[CheckoutItem]], config: AppConfig | None = None) -> list[int]:
+    snapshot = catalog_store.snapshot
+    if snapshot is not None:
+        catalog = arrays_for_snapshot(snapshot)
+    else:
+        basket_data = await get_basket_data(item_codes=[item.code for basket in baskets for item in basket], config=config)
+        catalog = CatalogArrays(basket_data)
+    return price_baskets(baskets=baskets, catalog=catalog)
+
+async def get_basket_data(item_codes:list[str], config: AppConfig | None = None) -> dict[str, CatalogItem]:
+    """
+    Looks up every distinct code in a basket
+
+    checkout.resolution picks one get_items call ("batch") or one get_item per code run
+    concurrently ("concurrent"), for backends where single lookups are cheap but each has latency
+    """
+    item_codes = list(dict.fromkeys(code for code in item_codes if code))
+    if not item_codes:
+        return {}
+    config = config or config_service.get()
+    if config.checkout.resolution == "concurrent":
+        return await get_items_concurrently(item_codes=item_codes, config=config)
+    return await get_backend(config=config).get_items(codes=item_codes)
+
+async def get_items_concurrently(item_codes:list[str], config: AppConfig) -> dict[str, CatalogItem]:
+    """
+    Runs get_item for each code with at most checkout.max_concurrency lookups in flight
+
+    If any lookup fails, the error of the first failing code in basket order is raised
+    """
+    backend = get_backend(config=config)
+    semaphore = asyncio.Semaphore(config.checkout.max_concurrency)
+
+    async def lookup(code):
+        async with semaphore:
+            return to_catalog_item(await backend.get_item(code=code))
+
+    results = await asyncio.gather(*(lookup(code) for code in item_codes), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return {code: item for code, item in zip(item_codes, results) if item is not None}
 
-async def get_item_data(item_code:str="") -> dict:
+async def get_item_data(item_code:str="", config: AppConfig | None = None) -> CatalogItem | dict | None:
     if not item_code:
         return {}
-    return await ReadDao().get_item_and_offer(table ="prices", column="code", value=item_code)
+    return await get_backend(config=config).get_item(code=item_code)
+
+def to_catalog_item(item_data) -> CatalogItem | None:
+    """
+    Normalises item data to a CatalogItem
+
+    Accepts a CatalogItem, or a DataFrame of (code, price, amount, offerprice) rows
+    from analytics callers using as_frame
+    """
+    if item_data is None or isinstance(item_data, CatalogItem):
+        return item_data
+    if isinstance(item_data, dict) or item_data.empty:
+        return None
+    prices = item_data["price"].tolist()
+    codes = item_data["code"].tolist() if "code" in item_data else [""]
+    rows = [(codes[0], prices[0], _none_if_nan(amount), _none_if_nan(offerprice))
+            for amount, offerprice in zip(item_data["amount"].tolist(), item_data["offerprice"].tolist())]
+    return CatalogItem.from_rows(rows)
+
+def _none_if_nan(value):
+    # NaN is the only value not equal to itself
+    if value is None or value != value:
+        return None
+    return value
 
 def calculate_total(item_data, quant:int) -> int:
-    offer_amount = item_data["amount"].item()
-    offer_value = item_data["offerprice"].item()
-    if not offer_amount and not offer_value:
-        return item_data["price"].item() * quant
-    return calculate_total_with_offer (item_data=item_data, quant=quant)
-
-def calculate_total_with_offer(item_data:dict, quant: int) -> int:
-    offer_amount = item_data["amount"].item()
-    offer_value = item_data["offerprice"].item()
-    total = 0
-    while quant >= offer_amount:
-        total += offer_value
-        quant -= offer_amount
-    total += item_data["price"].item() * quant
+    return calculate_catalog_total(catalog_item=to_catalog_item(item_data), quant=quant)
+
+def calculate_total_with_offer(item_data, quant: int) -> int:
+    return calculate_catalog_total(catalog_item=to_catalog_item(item_data), quant=quant)
+
+def calculate_catalog_total(catalog_item: CatalogItem, quant: int) -> int:
+    start = time.perf_counter()
+    total = plan_for(catalog_item).total(quant)
+    PRICING.observe(time.perf_counter() - start)
     return total
 
+def quote_total(version: str | None, catalog_item: CatalogItem, quant: int) -> int:
+    """
+    calculate_catalog_total behind the quote cache, items outside a versioned catalog are not cached
+    """
+    if version is None:
+        return calculate_catalog_total(catalog_item=catalog_item, quant=quant)
+    return quote_cache.get_or_compute(version=version, code=catalog_item.code, quant=quant,
+                                      compute=lambda: calculate_catalog_total(catalog_item=catalog_item, quant=quant))
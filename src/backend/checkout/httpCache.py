@@ -0,0 +1,39 @@
+from fastapi import Request, Response
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.config.configService import AppConfig
+
+
+async def catalog_etag(config: AppConfig, variant: str = "") -> str | None:
+    """
+    Strong ETag for a catalog representation, or None when no catalog snapshot is loaded
+
+    variant separates representations of the same URL, e.g. JSON and NDJSON
+    """
+    snapshot = await catalog_store.current(config=config)
+    if snapshot is None:
+        return None
+    return etag_for(version=snapshot.version, variant=variant)
+
+
+def etag_for(version: str, variant: str = "") -> str:
+    return f'"{version}{variant}"'
+
+
+def not_modified(request: Request, etag: str | None) -> bool:
+    if etag is None:
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cache_headers(etag: str | None, config: AppConfig) -> dict:
+    if etag is None:
+        return {}
+    return {"ETag": etag, "Cache-Control": config.http.cache_control, "Vary": "Accept, Accept-Encoding"}
+
+
+def not_modified_response(etag: str, config: AppConfig) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag=etag, config=config))
@@ -0,0 +1,125 @@
+import heapq
+from src.backend.dao.catalogItem import CatalogItem
+
+
+class PricingPlan:
+    """
+    Offers for one item compiled into a form that prices any quantity in constant time
+
+    Tiers that cost at least as much as buying the units singly are dropped. With one
+    tier the total is a single divmod. With several, every quantity is some number of
+    best-value tier bundles plus x units bought singly or in other tiers, where x has the
+    quantity's residue modulo best_amount. Weighing each x by how much it costs over the
+    same units at the best tier's unit price, a shortest path over the best_amount
+    residues finds the cheapest x for every residue, so any quantity at or above it is
+    priced by one lookup and a multiplication.
+
+    Quantities below the cheapest x of their residue are taken from a table of exact
+    totals. Its size is the largest such x, which is usually under best_amount plus the
+    largest bundle size, where a table up to best_amount times the largest bundle size
+    would be needed otherwise. Plans are compiled when a catalog snapshot is built, off
+    the event loop, see compile_plans.
+    """
+    __slots__ = ("price", "tiers", "best_amount", "best_price", "residues", "table")
+
+    def __init__(self, price: int, offers: tuple = ()):
+        self.price = price
+        cheapest = {}
+        for amount, offerprice in offers:
+            if amount > 0 and offerprice < price * amount:
+                cheapest[amount] = min(offerprice, cheapest.get(amount, offerprice))
+        self.tiers = tuple(sorted(cheapest.items()))
+        self.best_amount, self.best_price = None, None
+        self.residues, self.table = None, None
+        if not self.tiers:
+            return
+        # Lowest price per unit, compared by cross multiplying to stay in integers
+        best_amount, best_price = self.tiers[0]
+        for amount, offerprice in self.tiers[1:]:
+            if offerprice * best_amount < best_price * amount:
+                best_amount, best_price = amount, offerprice
+        self.best_amount, self.best_price = best_amount, best_price
+        if len(self.tiers) > 1:
+            self.residues, bound = self._cheapest_residues()
+            self.table = self._build_table(bound=bound)
+
+    def _cheapest_residues(self) -> tuple[list[int], int]:
+        """
+        Dijkstra over quantities modulo best_amount, where buying amount units for offerprice
+        costs offerprice * best_amount - amount * best_price, best_amount times the premium paid
+        over the best tier. No step is negative as no tier beats the best unit price.
+
+        Returns: (cheapest premium per residue, one past the largest quantity reaching one)
+        """
+        modulus, best_price = self.best_amount, self.best_price
+        steps = [(1, self.price * modulus - best_price)]
+        steps += [(amount, offerprice * modulus - amount * best_price) for amount, offerprice in self.tiers
+                  if amount != modulus]
+        # Ties go to the smaller quantity so the exact table stays as short as possible
+        cheapest = [None] * modulus
+        cheapest[0] = (0, 0)
+        heap = [(0, 0, 0)]
+        while heap:
+            premium, quant, residue = heapq.heappop(heap)
+            if cheapest[residue] != (premium, quant):
+                continue
+            for amount, cost in steps:
+                candidate = (premium + cost, quant + amount)
+                following = (residue + amount) % modulus
+                if cheapest[following] is None or candidate < cheapest[following]:
+                    cheapest[following] = candidate
+                    heapq.heappush(heap, (*candidate, following))
+        return [premium for premium, _ in cheapest], max(quant for _, quant in cheapest) + 1
+
+    def _build_table(self, bound: int) -> list[int]:
+        table = [0] * bound
+        for quant in range(1, bound):
+            cost = table[quant - 1] + self.price
+            for amount, offerprice in self.tiers:
+                if amount > quant:
+                    break
+                candidate = table[quant - amount] + offerprice
+                if candidate < cost:
+                    cost = candidate
+            table[quant] = cost
+        return table
+
+    def total(self, quant: int) -> int:
+        if quant <= 0 or self.best_amount is None:
+            return self.price * quant
+        if self.table is None:
+            bundles, remainder = divmod(quant, self.best_amount)
+            return bundles * self.best_price + remainder * self.price
+        if quant < len(self.table):
+            return self.table[quant]
+        # Cheapest premium for the residue plus every unit at the best tier's unit price
+        return (self.residues[quant % self.best_amount] + quant * self.best_price) // self.best_amount
+
+
+def plan_for(catalog_item: CatalogItem) -> PricingPlan:
+    """
+    Returns the item's compiled plan, compiling it on first use
+    """
+    plan = catalog_item.plan
+    if plan is None:
+        plan = PricingPlan(price=catalog_item.price, offers=catalog_item.offers)
+        catalog_item.plan = plan
+    return plan
+
+
+def compile_plans(items) -> int:
+    """
+    Compiles the plan of every item that has none yet, run when a catalog snapshot is built so
+    checkouts never compile on the event loop
+
+    Input:
+        items: iterable of CatalogItem
+
+    Returns: number of plans compiled
+    """
+    compiled = 0
+    for catalog_item in items:
+        if catalog_item.plan is None:
+            plan_for(catalog_item)
+            compiled += 1
+    return compiled
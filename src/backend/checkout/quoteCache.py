@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+
+
+class QuoteCache:
+    """
+    Bounded, thread-safe LRU of line totals keyed by (catalog version, code, quantity)
+
+    Entries from an older catalog version are never served; the first lookup against
+    a new version drops the whole cache.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def configure(self, capacity: int):
+        with self._lock:
+            self.capacity = capacity
+            while len(self._entries) > max(capacity, 0):
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get_or_compute(self, version: str, code: str, quant: int, compute) -> int:
+        """
+        Returns the cached total for the line, calling compute() and storing the result on a miss
+        """
+        if self.capacity <= 0:
+            return compute()
+        key = (version, code, quant)
+        with self._lock:
+            if version != self._version:
+                self._invalidate(version=version)
+            total = self._entries.get(key)
+            if total is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return total
+            self._stats["misses"] += 1
+        total = compute()
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = total
+                if len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return total
+
+    def _invalidate(self, version):
+        if self._entries:
+            self._stats["invalidations"] += 1
+        self._entries.clear()
+        self._version = version
+
+    def clear(self):
+        with self._lock:
+            self._invalidate(version=None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "capacity": self.capacity, **self._stats}
+
+
+quote_cache = QuoteCache()
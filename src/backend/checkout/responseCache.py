@@ -0,0 +1,120 @@
+import asyncio
+import gzip
+import json
+import threading
+from src.backend.dao.singleFlight import SingleFlight
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IDENTITY = "identity"
+COMPRESSORS = {"gzip": lambda body: gzip.compress(body, compresslevel=6)}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+
+
+def choose_encoding(accept_encoding: str, offered: list[str]) -> str:
+    """
+    Picks the content coding for a response from the request's Accept-Encoding header
+
+    Input:
+        accept_encoding: header value, e.g. "gzip;q=0.8, br"
+        offered: codings the server is willing to use, most preferred first
+
+    Returns: highest q-value coding from offered that is available, "identity" when none is acceptable
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip()] = weight
+    best, best_weight = IDENTITY, 0.0
+    for coding in offered:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if coding in COMPRESSORS and weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def encode_rows(rows) -> bytes:
+    # Same bytes FastAPI's JSONResponse would produce for the list
+    rows = rows if isinstance(rows, list) else list(rows)
+    return json.dumps(rows, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    """
+    Fully encoded JSON bodies of whole-table responses, kept per table for one catalog version
+
+    The identity body is encoded once per version and each compressed variant is made from
+    it the first time a client asks for that coding. Encoding runs in a thread and
+    concurrent misses share one build, so the serialisation cost is paid once per catalog
+    change rather than per request. A new version replaces the table's bodies.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._stats = {"hits": 0, "misses": 0}
+
+    async def get(self, table: str, version: str, encoding: str, load_rows, min_size: int = 1024) -> tuple[bytes, str]:
+        """
+        Input:
+            table: table name, e.g. "prices"
+            version: catalog version the rows belong to
+            encoding: wanted coding from choose_encoding
+            load_rows: no argument coroutine function returning the table rows of that version
+            min_size: bodies smaller than this are never compressed
+
+        Returns: (body, coding actually used)
+        """
+        async def identity():
+            return await asyncio.to_thread(encode_rows, await load_rows())
+
+        body = await self._variant(table=table, version=version, encoding=IDENTITY, build=identity)
+        if encoding == IDENTITY or len(body) < min_size:
+            return body, IDENTITY
+
+        async def compressed():
+            return await asyncio.to_thread(COMPRESSORS[encoding], body)
+
+        return await self._variant(table=table, version=version, encoding=encoding, build=compressed), encoding
+
+    async def _variant(self, table: str, version: str, encoding: str, build) -> bytes:
+        with self._lock:
+            entry = self._entries.get(table)
+            if entry is not None and entry[0] == version and encoding in entry[1]:
+                self._stats["hits"] += 1
+                return entry[1][encoding]
+            self._stats["misses"] += 1
+        body = await self._flight.do(key=(table, version, encoding), func=build)
+        with self._lock:
+            entry = self._entries.get(table)
+            if entry is None or entry[0] != version:
+                entry = self._entries[table] = (version, {})
+            entry[1][encoding] = body
+        return body
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "bytes": sum(len(body) for _, bodies in self._entries.values() for body in bodies.values())}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats = {"hits": 0, "misses": 0}
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,175 @@
+import os
+import signal
+import threading
+import time
+import logging
+import yaml
+from typing import Literal
+from yaml.loader import SafeLoader
+from pydantic import BaseModel, ConfigDict, PositiveInt, PrivateAttr
+
+
+class PoolConfig(BaseModel):
+    max_size: int = 8
+    acquire_timeout: float = 5.0
+    health_check_interval: float = 30.0
+    file_check_interval: float = 1.0
+
+
+class ExecutorConfig(BaseModel):
+    max_workers: int = 8
+
+
+class StreamingConfig(BaseModel):
+    chunk_size: int = 500
+
+
+class CatalogConfig(BaseModel):
+    refresh_interval: float = 1.0
+    backend: str = "sqlite"
+    json_path: str | None = None
+    json_latency: float = 0.0
+    memory_source: str = "sqlite"
+    mmap_path: str = "./src/backend/database/catalog.bin"
+
+
+class HttpConfig(BaseModel):
+    cache_control: str = "no-cache"
+    response_cache: bool = True
+    compression: list[str] = ["br", "gzip"]
+    compression_min_size: int = 1024
+
+
+class QuoteCacheConfig(BaseModel):
+    capacity: int = 10000
+
+
+class ServerConfig(BaseModel):
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 0
+    keep_alive: int = 5
+    backlog: int = 2048
+    warm_connections: int = 4
+
+
+class CheckoutConfig(BaseModel):
+    resolution: Literal["batch", "concurrent"] = "batch"
+    max_concurrency: PositiveInt = 16
+
+
+class ProfilingConfig(BaseModel):
+    enabled: bool = False
+    header: str = "X-Profile"
+    token: str = ""
+    sample_rate: float = 0.0
+    mode: str = "cprofile"
+    sample_interval: float = 0.001
+    output_dir: str = "./profiles"
+
+
+class AppConfig(BaseModel):
+    """
+    Typed view of config.yml, unknown keys are kept so new sections can be added freely
+    """
+    model_config = ConfigDict(extra="allow", frozen=True)
+
+    dbpath: str | None = None
+    pool: PoolConfig = PoolConfig()
+    executor: ExecutorConfig = ExecutorConfig()
+    streaming: StreamingConfig = StreamingConfig()
+    catalog: CatalogConfig = CatalogConfig()
+    http: HttpConfig = HttpConfig()
+    quote_cache: QuoteCacheConfig = QuoteCacheConfig()
+    checkout: CheckoutConfig = CheckoutConfig()
+    server: ServerConfig = ServerConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
+
+    _raw: dict = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, raw: dict | None) -> "AppConfig":
+        config = cls.model_validate(raw or {})
+        config._raw = raw or {}
+        return config
+
+    @property
+    def raw(self) -> dict:
+        return self._raw
+
+
+class ConfigService:
+    """
+    Process-wide holder of the application config
+
+    The file is parsed once and only re-read when its mtime changes (checked at most
+    every check_interval seconds) or when a reload is requested, e.g. by SIGHUP
+    """
+
+    def __init__(self, path: str = "./config/config.yml", check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.logger = logging.getLogger()
+        self._config = None
+        self._mtime = None
+        self._next_check = 0.0
+        self._reload_requested = False
+        self._lock = threading.Lock()
+
+    def get(self) -> AppConfig:
+        config = self._config
+        if config is not None and not self._reload_requested and time.monotonic() < self._next_check:
+            return config
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            if self._config is None or self._reload_requested or self._file_changed():
+                self._load()
+            return self._config
+
+    def load(self) -> AppConfig:
+        with self._lock:
+            return self._load()
+
+    def request_reload(self, *_):
+        self._reload_requested = True
+
+    def install_signal_handler(self) -> bool:
+        """
+        Reloads the config on SIGHUP, where the platform has it and we are on the main thread
+        """
+        if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signal.SIGHUP, self.request_reload)
+        return True
+
+    def _file_changed(self) -> bool:
+        try:
+            return os.stat(self.path).st_mtime_ns != self._mtime
+        except OSError:
+            return False
+
+    def _load(self) -> AppConfig:
+        self._reload_requested = False
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, "r") as file:
+                config = AppConfig.from_dict(yaml.load(file, Loader=SafeLoader))
+        except Exception as e:
+            if self._config is None:
+                raise
+            self.logger.error(f"ERROR: Could not reload {self.path}, keeping previous config - {e}")
+            return self._config
+        self._config = config
+        self._mtime = mtime
+        self.logger.info(f"Loaded config from {self.path}")
+        return config
+
+
+config_service = ConfigService()
+
+
+def get_config() -> AppConfig:
+    """
+    FastAPI dependency returning the current process-wide config
+    """
+    return config_service.get()
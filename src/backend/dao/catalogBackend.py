@@ -0,0 +1,166 @@
+import threading
+from typing import AsyncIterator, Protocol, runtime_checkable
+from src.backend.dao.readDao import ReadDao
+from src.backend.dao.daoRoutines import DaoRoutines, row_chunks
+from src.backend.dao.mmapCatalog import MmapCatalogBackend
+from src.backend.dao.columnarCatalog import ColumnarCatalogBackend
+from src.backend.dao.catalogItem import CatalogItem, items_from_rows
+from src.backend.config.configService import AppConfig, config_service
+
+
+@runtime_checkable
+class CatalogBackend(Protocol):
+    """
+    Read interface every catalog source implements, selected by catalog.backend in config.yml
+
+    Tables are "prices" (id, code, price) and "offers" (id, code, amount, offerprice)
+    """
+
+    async def get_item(self, code: str) -> CatalogItem | None:
+        ...
+
+    async def get_items(self, codes: list[str]) -> dict[str, CatalogItem]:
+        """
+        Returns: items keyed by code, unknown codes are left out
+        """
+        ...
+
+    async def get_all(self, table: str) -> list[dict]:
+        ...
+
+    async def get_by_id(self, table: str, id: int) -> list[dict]:
+        ...
+
+    async def stream_all(self, table: str, chunk_size: int = 500) -> AsyncIterator[tuple[tuple, list[tuple]]]:
+        """
+        Returns: async iterator of (columns, rows) chunks, raising before it is returned for a missing table
+        """
+        ...
+
+
+class SqliteCatalogBackend:
+    """
+    Catalog backend over the SQLite database at config.dbpath
+    """
+
+    def __init__(self, config: AppConfig | None = None):
+        self.dao = ReadDao(config=config)
+
+    async def get_item(self, code: str) -> CatalogItem | None:
+        return await self.dao.get_item_and_offer(table="prices", column="code", value=code)
+
+    async def get_items(self, codes: list[str]) -> dict[str, CatalogItem]:
+        return await self.dao.get_items_and_offers(table="prices", column="code", values=codes)
+
+    async def get_all(self, table: str) -> list[dict]:
+        return await self.dao.get_all_items(table=table)
+
+    async def get_by_id(self, table: str, id: int) -> list[dict]:
+        return await self.dao.get_single_item(table=table, column="id", value=str(id))
+
+    async def stream_all(self, table: str, chunk_size: int = 500):
+        return await self.dao.stream_all_items(table=table, chunk_size=chunk_size)
+
+
+class MemoryCatalogBackend:
+    """
+    Catalog backend held entirely in process memory, lookups never do I/O
+
+    Built from table rows, or from another backend which is read in full on first use and
+    again on every reload(), which CatalogStore.load calls so /catalog/reload picks up changes
+    """
+
+    def __init__(self, prices: list[dict] | None = None, offers: list[dict] | None = None, source: CatalogBackend | None = None):
+        self.source = source
+        self.items = None
+        self.tables = None
+        if prices is not None:
+            self._load(prices=prices, offers=offers or [])
+
+    def _load(self, prices: list[dict], offers: list[dict]):
+        # Build both before swapping so readers never pair new tables with old items
+        items = items_from_rows(prices=prices, offers=offers)
+        self.tables, self.items = {"prices": prices, "offers": offers}, items
+
+    async def reload(self):
+        # A source that keeps its own copy (a json file) has to re-read it first
+        source_reload = getattr(self.source, "reload", None)
+        if source_reload is not None:
+            await source_reload()
+        prices = await self.source.get_all(table="prices")
+        offers = await self.source.get_all(table="offers")
+        self._load(prices=prices, offers=offers)
+
+    async def _loaded(self) -> dict:
+        if self.items is None:
+            await self.reload()
+        return self.items
+
+    async def get_item(self, code: str) -> CatalogItem | None:
+        return (await self._loaded()).get(code)
+
+    async def get_items(self, codes: list[str]) -> dict[str, CatalogItem]:
+        items = await self._loaded()
+        return {code: items[code] for code in dict.fromkeys(codes) if code in items}
+
+    async def get_all(self, table: str) -> list[dict]:
+        await self._loaded()
+        return list(self._table(table))
+
+    async def get_by_id(self, table: str, id: int) -> list[dict]:
+        await self._loaded()
+        return [row for row in self._table(table) if row["id"] == id]
+
+    async def stream_all(self, table: str, chunk_size: int = 500):
+        await self._loaded()
+        return row_chunks(rows=self._table(table), chunk_size=chunk_size)
+
+    def _table(self, table: str) -> list[dict]:
+        if table not in self.tables:
+            raise ValueError(f"No table found for : {table}")
+        return self.tables[table]
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def _build_backend(kind: str, config: AppConfig) -> CatalogBackend:
+    if kind == "sqlite":
+        return SqliteCatalogBackend(config=config)
+    if kind == "json":
+        catalog = config.catalog
+        return DaoRoutines(path=catalog.json_path, latency=catalog.json_latency, bulk_latency=catalog.json_latency)
+    if kind == "memory":
+        return MemoryCatalogBackend(source=_build_backend(config.catalog.memory_source, config))
+    if kind == "columnar":
+        return ColumnarCatalogBackend(source=_build_backend(config.catalog.memory_source, config))
+    if kind == "mmap":
+        return MmapCatalogBackend(path=config.catalog.mmap_path, check_interval=config.catalog.refresh_interval)
+    raise ValueError(f"Unknown catalog backend : {kind}")
+
+
+def get_backend(config: AppConfig | None = None) -> CatalogBackend:
+    """
+    Returns the catalog backend named by catalog.backend
+
+    SQLite backends are cheap and built per call, JSON, memory, columnar and mmap backends
+    hold the whole catalog or its mapping so one instance is kept per set of settings
+    """
+    config = config or config_service.get()
+    catalog = config.catalog
+    if catalog.backend == "sqlite":
+        return SqliteCatalogBackend(config=config)
+    key = (catalog.backend, catalog.json_path, catalog.json_latency, catalog.memory_source, catalog.mmap_path, config.dbpath)
+    backend = _backends.get(key)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(key)
+            if backend is None:
+                backend = _backends[key] = _build_backend(catalog.backend, config)
+    return backend
+
+
+def clear_backends():
+    with _backends_lock:
+        _backends.clear()
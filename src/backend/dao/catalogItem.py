@@ -0,0 +1,47 @@
+class CatalogItem:
+    """
+    Price and offer rules for a single item code
+
+    offers is a tuple of (amount, offerprice) pairs, empty when the item has no offer.
+    plan holds the compiled pricing plan once the pricing engine has built it
+    """
+    __slots__ = ("code", "price", "offers", "plan")
+
+    def __init__(self, code: str, price: int, offers: tuple = ()):
+        self.code = code
+        self.price = price
+        self.offers = offers
+        self.plan = None
+
+    def __repr__(self) -> str:
+        return f"CatalogItem(code={self.code!r}, price={self.price!r}, offers={self.offers!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CatalogItem):
+            return NotImplemented
+        return (self.code, self.price, self.offers) == (other.code, other.price, other.offers)
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple]) -> "CatalogItem | None":
+        """
+        Builds an item from (code, price, amount, offerprice) join rows, one row per offer
+        """
+        if not rows:
+            return None
+        code, price = rows[0][0], rows[0][1]
+        offers = tuple((int(amount), int(offerprice)) for _, _, amount, offerprice in rows
+                       if amount is not None and offerprice is not None)
+        return cls(code=code, price=int(price), offers=offers)
+
+
+def items_from_rows(prices: list[dict], offers: list[dict]) -> dict[str, CatalogItem]:
+    """
+    Builds CatalogItems keyed by code from prices and offers table rows
+    """
+    offers_by_code = {}
+    for offer in offers:
+        if offer.get("amount") is None or offer.get("offerprice") is None:
+            continue
+        offers_by_code.setdefault(offer["code"], []).append((int(offer["amount"]), int(offer["offerprice"])))
+    return {row["code"]: CatalogItem(code=row["code"], price=int(row["price"]), offers=tuple(offers_by_code.get(row["code"], ())))
+            for row in prices}
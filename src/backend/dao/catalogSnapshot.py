@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from src.backend.checkout.pricingEngine import compile_plans
+from src.backend.dao.catalogBackend import get_backend
+from src.backend.dao.catalogItem import CatalogItem, items_from_rows
+from src.backend.config.configService import AppConfig, config_service
+from src.backend.database.connectionPool import file_identity
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the whole catalog at one point in time
+
+    version is a digest of the prices and offers rows, so it only changes when the data does.
+    tables keeps the rows a snapshot was built from, mapping views (mmap, columnar) serve
+    their own rows instead.
+    """
+    __slots__ = ("version", "items", "tables")
+
+    def __init__(self, version: str, items: dict[str, CatalogItem], tables: dict[str, list[dict]] | None = None):
+        self.version = version
+        self.items = items
+        self.tables = tables
+
+    def get(self, code: str) -> CatalogItem | None:
+        return self.items.get(code)
+
+    def rows(self, table: str):
+        """
+        Returns: the prices or offers rows of exactly this version, None when the snapshot cannot list them
+        """
+        if self.tables is not None:
+            if table not in self.tables:
+                raise ValueError(f"No table found for : {table}")
+            return self.tables[table]
+        if hasattr(self.items, "rows"):
+            return self.items.rows(table)
+        return None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @classmethod
+    def from_rows(cls, prices: list[dict], offers: list[dict]) -> "CatalogSnapshot":
+        return cls(version=catalog_version(prices=prices, offers=offers), items=items_from_rows(prices=prices, offers=offers),
+                   tables={"prices": prices, "offers": offers})
+
+
+def catalog_version(prices: list[dict], offers: list[dict]) -> str:
+    payload = json.dumps([prices, offers], sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+class CatalogStore:
+    """
+    Holds the current catalog snapshot for the process, read from the configured backend
+
+    Reloads build a complete new snapshot before swapping the reference, so readers
+    always see either the old catalog or the new one, never a mix.
+
+    For the SQLite backend a dedicated connection watches PRAGMA data_version, which moves whenever another
+    connection commits to the database, so writes by importers or other processes
+    are picked up by current() without re-reading the tables on every call. The
+    watch is reopened when the database file itself is replaced by a new one.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._watch = None
+        self._data_version = None
+        self._view = None
+        self._next_check = 0.0
+        self.logger = logging.getLogger()
+
+    @property
+    def snapshot(self) -> CatalogSnapshot | None:
+        return self._snapshot
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    async def load(self, config: AppConfig | None = None) -> CatalogSnapshot:
+        config = config or config_service.get()
+        backend = get_backend(config=config)
+        # Read data_version first so a commit that lands mid-load triggers another reload
+        if config.catalog.backend == "sqlite":
+            data_version = self._read_data_version(dbpath=config.dbpath)
+        else:
+            self._close_watch()
+            data_version = None
+        # Backends holding a copy of another source (memory, columnar) re-read it, so a load is always a reload
+        reload = getattr(backend, "reload", None)
+        if reload is not None:
+            await reload()
+        # Backends with their own versioned view (mmap and columnar catalogs) are used as they are
+        self._view = getattr(backend, "catalog_view", None)
+        if self._view is not None:
+            version, items = await self._view()
+            snapshot = await self._view_snapshot(version=version, items=items)
+        else:
+            prices = await backend.get_all(table="prices")
+            offers = await backend.get_all(table="offers")
+            # Building items and compiling their plans is CPU bound, keep it off the event loop
+            snapshot = await asyncio.to_thread(self._build, prices=prices, offers=offers)
+        self._snapshot = snapshot
+        self._data_version = data_version
+        self._next_check = time.monotonic() + config.catalog.refresh_interval
+        self.logger.info(f"Catalog snapshot {snapshot.version} loaded with {len(snapshot)} items")
+        return snapshot
+
+    @staticmethod
+    def _build(prices: list[dict], offers: list[dict]) -> CatalogSnapshot:
+        snapshot = CatalogSnapshot.from_rows(prices=prices, offers=offers)
+        compile_plans(snapshot.items.values())
+        return snapshot
+
+    @staticmethod
+    async def _view_snapshot(version: str, items) -> CatalogSnapshot:
+        # Views build items per lookup, but keep the tiered ones, so their plans can be compiled up front
+        tiered_items = getattr(items, "tiered_items", None)
+        if tiered_items is not None:
+            await asyncio.to_thread(compile_plans, tiered_items())
+        return CatalogSnapshot(version=version, items=items)
+
+    async def reload(self, config: AppConfig | None = None) -> CatalogSnapshot:
+        return await self.load(config=config)
+
+    async def current(self, config: AppConfig | None = None) -> CatalogSnapshot | None:
+        """
+        Returns the snapshot, first reloading it if the database has changed
+
+        The data_version check runs at most once per catalog.refresh_interval seconds
+        """
+        snapshot = self._snapshot
+        if snapshot is None or (self._watch is None and self._view is None) or time.monotonic() < self._next_check:
+            return snapshot
+        config = config or config_service.get()
+        self._next_check = time.monotonic() + config.catalog.refresh_interval
+        if self._view is not None:
+            version, items = await self._view()
+            if version != snapshot.version:
+                snapshot = self._snapshot = await self._view_snapshot(version=version, items=items)
+                self.logger.info(f"Catalog snapshot {version} swapped in with {len(snapshot)} items")
+            return snapshot
+        if self._read_data_version() != self._data_version:
+            snapshot = await self.reload(config=config)
+        return snapshot
+
+    def _read_data_version(self, dbpath: str | None = None):
+        try:
+            if self._watch is not None and file_identity(self._watch[0]) != self._watch[2]:
+                dbpath = dbpath or self._watch[0]
+                self._close_watch()
+            if dbpath is not None and (self._watch is None or self._watch[0] != dbpath):
+                self._close_watch()
+                con = sqlite3.connect(dbpath, check_same_thread=False)
+                self._watch = (dbpath, con, file_identity(dbpath))
+            if self._watch is None:
+                return None
+            return self._watch[2], self._watch[1].execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.warning(f"WARNING: Could not read data_version for catalog - {e}")
+            return None
+
+    def _close_watch(self):
+        if self._watch is not None:
+            self._watch[1].close()
+            self._watch = None
+
+    def clear(self):
+        self._snapshot = None
+        self._data_version = None
+        self._view = None
+        self._close_watch()
+
+
+catalog_store = CatalogStore()
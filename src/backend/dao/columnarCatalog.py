@@ -0,0 +1,340 @@
+import hashlib
+from array import array
+from collections.abc import Mapping
+import numpy as np
+from src.backend.dao.catalogItem import CatalogItem
+
+PRICE_COLUMNS = ("id", "code", "price")
+OFFER_COLUMNS = ("id", "code", "amount", "offerprice")
+
+
+class ColumnarCatalog(Mapping):
+    """
+    Whole catalog held as NumPy columns, mapping code -> CatalogItem
+
+    Each code gets a row number. codes is a fixed-width bytes column and the code -> row
+    index is an open addressing hash table (linear probing on Python's string hash) in
+    an int32 column, so no per-SKU Python objects are kept at all. ids and prices are
+    per row, the offers of all rows are stored back to back sorted by row then amount,
+    with offer_start[row]:offer_start[row + 1] marking each row's slice.
+
+    CatalogItems are only built for the codes actually looked up. Items with several
+    offer tiers are kept per row once built, so the pricing plan compiled onto them is
+    reused for as long as this version of the catalog is.
+    """
+
+    def __init__(self, codes: list[str], ids, prices, offer_rows, offer_ids, offer_amounts, offer_prices):
+        self.codes = np.array([code.encode() for code in codes], dtype=bytes) if codes else np.array([], dtype="S1")
+        self.table, self.mask = _hash_table(np.fromiter((hash(code) for code in codes), dtype=np.int64, count=len(codes)))
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.int64)
+        offer_rows = np.asarray(offer_rows, dtype=np.int32)
+        offer_amounts = np.asarray(offer_amounts, dtype=np.int64)
+        order = np.lexsort((offer_amounts, offer_rows))
+        self.offer_rows = offer_rows[order]
+        self.offer_ids = np.asarray(offer_ids, dtype=np.int64)[order]
+        self.offer_amounts = offer_amounts[order]
+        self.offer_prices = np.asarray(offer_prices, dtype=np.int64)[order]
+        self.offer_start = np.searchsorted(self.offer_rows, np.arange(len(codes) + 1)).astype(np.int64)
+        digest = hashlib.blake2b(digest_size=8)
+        for column in (self.codes, self.ids, self.prices, self.offer_rows, self.offer_ids, self.offer_amounts, self.offer_prices):
+            digest.update(column.tobytes())
+        self.version = digest.hexdigest()
+        self._tiered = {}
+
+    @classmethod
+    def from_rows(cls, prices, offers) -> "ColumnarCatalog":
+        """
+        Input:
+            prices: iterable of (id, code, price) tuples or prices table dicts
+            offers: iterable of (id, code, amount, offerprice) tuples or offers table dicts
+
+        A code listed twice in prices keeps its last row, offers for unknown codes or
+        without an amount and price are dropped
+        """
+        builder = ColumnarBuilder()
+        builder.add_prices(prices)
+        builder.add_offers(offers)
+        return builder.build()
+
+    def code_id(self, code: str) -> int:
+        """
+        Returns: row number of code, -1 when it is not in the catalog
+        """
+        key = code.encode()
+        table, mask, codes = self.table, self.mask, self.codes
+        position = hash(code) & mask
+        while True:
+            row = int(table[position])
+            if row < 0 or codes[row] == key:
+                return row
+            position = (position + 1) & mask
+
+    def code_ids(self, codes: list[str]) -> np.ndarray:
+        """
+        Bulk code_id, probing the hash table for every code at once
+
+        Returns: one row number per code, -1 for unknown codes
+        """
+        found = np.full(len(codes), -1, dtype=np.int64)
+        if not codes or not len(self.codes):
+            return found
+        keys = np.array([code.encode() for code in codes], dtype=bytes)
+        pending = np.arange(len(codes))
+        positions = np.fromiter((hash(code) for code in codes), dtype=np.int64, count=len(codes)) & self.mask
+        while pending.size:
+            rows = self.table[positions]
+            filled = rows >= 0
+            matched = filled & (self.codes[np.where(filled, rows, 0)] == keys[pending])
+            found[pending[matched]] = rows[matched]
+            probing = filled & ~matched
+            pending, positions = pending[probing], (positions[probing] + 1) & self.mask
+        return found
+
+    def item_at(self, row: int) -> CatalogItem:
+        item = self._tiered.get(row)
+        if item is not None:
+            return item
+        start, end = self.offer_start[row], self.offer_start[row + 1]
+        offers = tuple(zip(self.offer_amounts[start:end].tolist(), self.offer_prices[start:end].tolist()))
+        item = CatalogItem(code=self.codes[row].decode(), price=int(self.prices[row]), offers=offers)
+        if end - start > 1:
+            self._tiered[row] = item
+        return item
+
+    def tiered_items(self):
+        """
+        Yields the item of every row with several offer tiers, the ones whose plans are worth compiling ahead
+        """
+        for row in np.flatnonzero(np.diff(self.offer_start) > 1).tolist():
+            yield self.item_at(row)
+
+    def get(self, code: str, default=None) -> CatalogItem | None:
+        row = self.code_id(code)
+        return default if row < 0 else self.item_at(row)
+
+    def get_many(self, codes: list[str]) -> dict[str, CatalogItem]:
+        """
+        Returns: items keyed by code, unknown codes are left out
+        """
+        codes = list(dict.fromkeys(codes))
+        return {code: self.item_at(row) for code, row in zip(codes, self.code_ids(codes).tolist()) if row >= 0}
+
+    def __getitem__(self, code: str) -> CatalogItem:
+        item = self.get(code)
+        if item is None:
+            raise KeyError(code)
+        return item
+
+    def __contains__(self, code) -> bool:
+        return isinstance(code, str) and self.code_id(code) >= 0
+
+    def __iter__(self):
+        for start in range(0, len(self.codes), 10000):
+            for code in self.codes[start:start + 10000].tolist():
+                yield code.decode()
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def values(self):
+        for row in range(len(self.codes)):
+            yield self.item_at(row)
+
+    def chunks(self, table: str, chunk_size: int = 500):
+        """
+        Yields the prices or offers table as (columns, rows) chunks of tuples, in row order
+        """
+        if table == "prices":
+            columns, count = PRICE_COLUMNS, len(self.codes)
+        elif table == "offers":
+            columns, count = OFFER_COLUMNS, len(self.offer_ids)
+        else:
+            raise ValueError(f"No table found for : {table}")
+        for start in range(0, count, chunk_size):
+            end = start + chunk_size
+            if table == "prices":
+                codes = [code.decode() for code in self.codes[start:end].tolist()]
+                rows = zip(self.ids[start:end].tolist(), codes, self.prices[start:end].tolist())
+            else:
+                codes = [code.decode() for code in self.codes[self.offer_rows[start:end]].tolist()]
+                rows = zip(self.offer_ids[start:end].tolist(), codes, self.offer_amounts[start:end].tolist(),
+                           self.offer_prices[start:end].tolist())
+            yield columns, list(rows)
+
+    def rows(self, table: str):
+        """
+        Yields the prices or offers table rows as dicts, in row order
+        """
+        for columns, chunk in self.chunks(table=table, chunk_size=10000):
+            for row in chunk:
+                yield dict(zip(columns, row))
+
+    def rows_with_id(self, table: str, id: int) -> list[dict]:
+        if table == "prices":
+            matches = np.flatnonzero(self.ids == id)
+            return [{"id": id, "code": self.codes[row].decode(), "price": int(self.prices[row])} for row in matches]
+        if table == "offers":
+            matches = np.flatnonzero(self.offer_ids == id)
+            return [{"id": id, "code": self.codes[self.offer_rows[n]].decode(), "amount": int(self.offer_amounts[n]),
+                     "offerprice": int(self.offer_prices[n])} for n in matches]
+        raise ValueError(f"No table found for : {table}")
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in (self.codes, self.table, self.ids, self.prices, self.offer_start,
+                                                self.offer_rows, self.offer_ids, self.offer_amounts, self.offer_prices))
+
+
+def _hash_table(hashes: np.ndarray) -> tuple[np.ndarray, int]:
+    """
+    Builds a linear probing table of row numbers, at most half full, from each row's hash
+
+    Rows are inserted a round at a time: every row still waiting claims its slot if it
+    is empty (the lowest row wins a tie) and the rest move on to the next slot.
+
+    Returns: (table with -1 for empty slots, mask to apply to a hash)
+    """
+    size = 2
+    while size < 2 * len(hashes):
+        size *= 2
+    table = np.full(size, -1, dtype=np.int32)
+    pending = np.arange(len(hashes), dtype=np.int32)
+    positions = hashes & (size - 1)
+    while pending.size:
+        free = np.flatnonzero(table[positions] < 0)
+        slots, first = np.unique(positions[free], return_index=True)
+        winners = free[first]
+        table[slots] = pending[winners]
+        waiting = np.ones(pending.size, dtype=bool)
+        waiting[winners] = False
+        pending, positions = pending[waiting], (positions[waiting] + 1) & (size - 1)
+    return table, size - 1
+
+
+class ColumnarBuilder:
+    """
+    Accumulates prices then offers rows into compact arrays for a ColumnarCatalog
+
+    Rows can be added in chunks, so a catalog streamed from a backend never exists as a
+    list of dicts. The code dict used while building is dropped with the builder.
+    """
+
+    def __init__(self):
+        self.codes = []
+        self.index = {}
+        self.ids = array("q")
+        self.prices = array("q")
+        self.offer_rows = array("q")
+        self.offer_ids = array("q")
+        self.offer_amounts = array("q")
+        self.offer_prices = array("q")
+
+    def add_prices(self, rows):
+        index, codes, ids, prices = self.index, self.codes, self.ids, self.prices
+        for row in rows:
+            if isinstance(row, dict):
+                row = (row["id"], row["code"], row["price"])
+            item_id, code, price = row
+            position = index.setdefault(code, len(codes))
+            if position == len(codes):
+                codes.append(code)
+                ids.append(int(item_id))
+                prices.append(int(price))
+            else:
+                ids[position] = int(item_id)
+                prices[position] = int(price)
+
+    def add_offers(self, rows):
+        index = self.index
+        for row in rows:
+            if isinstance(row, dict):
+                row = (row["id"], row["code"], row.get("amount"), row.get("offerprice"))
+            offer_id, code, amount, offerprice = row
+            position = index.get(code)
+            if position is None or amount is None or offerprice is None:
+                continue
+            self.offer_rows.append(position)
+            self.offer_ids.append(int(offer_id))
+            self.offer_amounts.append(int(amount))
+            self.offer_prices.append(int(offerprice))
+
+    def build(self) -> ColumnarCatalog:
+        # np.frombuffer reads the arrays in place instead of copying them element by element
+        return ColumnarCatalog(codes=self.codes, ids=np.frombuffer(self.ids, dtype=np.int64),
+                               prices=np.frombuffer(self.prices, dtype=np.int64),
+                               offer_rows=np.frombuffer(self.offer_rows, dtype=np.int64),
+                               offer_ids=np.frombuffer(self.offer_ids, dtype=np.int64),
+                               offer_amounts=np.frombuffer(self.offer_amounts, dtype=np.int64),
+                               offer_prices=np.frombuffer(self.offer_prices, dtype=np.int64))
+
+
+class ColumnarCatalogBackend:
+    """
+    Catalog backend serving a ColumnarCatalog, read in full from another backend on first use and on reload()
+    """
+
+    def __init__(self, source=None, catalog: ColumnarCatalog | None = None):
+        self.source = source
+        self.catalog = catalog
+
+    async def reload(self):
+        # A source that keeps its own copy (a json file) has to re-read it first
+        source_reload = getattr(self.source, "reload", None)
+        if source_reload is not None:
+            await source_reload()
+        self.catalog = await load_columnar(self.source)
+
+    async def _loaded(self) -> ColumnarCatalog:
+        if self.catalog is None:
+            await self.reload()
+        return self.catalog
+
+    async def catalog_view(self) -> tuple[str, ColumnarCatalog]:
+        """
+        Returns: (version, mapping of code -> CatalogItem) for use as a catalog snapshot
+        """
+        catalog = await self._loaded()
+        return catalog.version, catalog
+
+    async def get_item(self, code: str) -> CatalogItem | None:
+        return (await self._loaded()).get(code)
+
+    async def get_items(self, codes: list[str]) -> dict[str, CatalogItem]:
+        return (await self._loaded()).get_many(codes)
+
+    async def get_all(self, table: str) -> list[dict]:
+        return list((await self._loaded()).rows(table))
+
+    async def get_by_id(self, table: str, id: int) -> list[dict]:
+        return (await self._loaded()).rows_with_id(table=table, id=id)
+
+    async def stream_all(self, table: str, chunk_size: int = 500):
+        catalog = await self._loaded()
+        if table not in ("prices", "offers"):
+            raise ValueError(f"No table found for : {table}")
+        return _stream_chunks(catalog.chunks(table=table, chunk_size=chunk_size))
+
+
+async def _stream_chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def load_columnar(source, chunk_size: int = 50000) -> ColumnarCatalog:
+    """
+    Streams the prices and offers tables of another catalog backend into a ColumnarCatalog
+    """
+    builder = ColumnarBuilder()
+    async for columns, rows in await source.stream_all(table="prices", chunk_size=chunk_size):
+        builder.add_prices(_ordered(rows, columns, PRICE_COLUMNS))
+    async for columns, rows in await source.stream_all(table="offers", chunk_size=chunk_size):
+        builder.add_offers(_ordered(rows, columns, OFFER_COLUMNS))
+    return builder.build()
+
+
+def _ordered(rows: list[tuple], columns: tuple, wanted: tuple) -> list[tuple]:
+    if tuple(columns) == wanted:
+        return rows
+    positions = [list(columns).index(column) for column in wanted]
+    return [tuple(row[position] for position in positions) for row in rows]
@@ -1,19 +1,96 @@
 import json
+import os
 import asyncio
+from src.backend.dao.catalogItem import CatalogItem
+
+DEFAULT_PRICING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pricing.json")
 
 
 class DaoRoutines:
-    
-    def __init__(self):
-        with open("src\\backend\\dao\\pricing.json", "r") as f:
-            self.data = json.load(f)
-    
+    """
+    Catalog backend over a pricing.json file
+
+    The file maps each code to {"price": n, "offer": {"amount": n, "price": n}}, with
+    "offers" holding a list of those for items with several tiers. latency and
+    bulk_latency simulate a remote catalog service per item and per full read. The file
+    is read once and again on every reload().
+    """
+
+    def __init__(self, path: str | None = None, latency: float = 0.05, bulk_latency: float = 1.0):
+        self.path = path or DEFAULT_PRICING_PATH
+        self.latency = latency
+        self.bulk_latency = bulk_latency
+        self.data, self.items, self.tables = self._read(self.path)
+
+    @classmethod
+    def _read(cls, path: str) -> tuple[dict, dict, dict]:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return data, *cls._index(data)
+
+    async def reload(self):
+        """
+        Re-reads the file, lookups see the previous contents until the new ones are indexed
+        """
+        data, items, tables = await asyncio.to_thread(self._read, self.path)
+        self.data, self.items, self.tables = data, items, tables
+
+    @staticmethod
+    def _index(data: dict) -> tuple[dict, dict]:
+        items = {}
+        prices = []
+        offers = []
+        for code, entry in data.items():
+            tiers = entry.get("offers") or ([entry["offer"]] if entry.get("offer") else [])
+            item_offers = tuple((int(tier["amount"]), int(tier["price"])) for tier in tiers)
+            items[code] = CatalogItem(code=code, price=int(entry["price"]), offers=item_offers)
+            prices.append({"id": len(prices) + 1, "code": code, "price": int(entry["price"])})
+            for amount, offerprice in item_offers:
+                offers.append({"id": len(offers) + 1, "code": code, "amount": amount, "offerprice": offerprice})
+        return items, {"prices": prices, "offers": offers}
+
+    async def _wait(self, seconds: float):
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
     async def get_data(self):
         # Long function
-        await asyncio.sleep(1)
+        await self._wait(self.bulk_latency)
         return self.data
 
     async def get_data_by_item(self, primary_key):
         # Quick function
-        await asyncio.sleep(0.05)
+        await self._wait(self.latency)
         return self.data.get(primary_key)
+
+    async def get_item(self, code: str) -> CatalogItem | None:
+        await self._wait(self.latency)
+        return self.items.get(code)
+
+    async def get_items(self, codes: list[str]) -> dict[str, CatalogItem]:
+        await self._wait(self.latency)
+        return {code: self.items[code] for code in dict.fromkeys(codes) if code in self.items}
+
+    async def get_all(self, table: str) -> list[dict]:
+        await self._wait(self.bulk_latency)
+        return list(self._table(table))
+
+    async def get_by_id(self, table: str, id: int) -> list[dict]:
+        await self._wait(self.latency)
+        return [row for row in self._table(table) if row["id"] == id]
+
+    async def stream_all(self, table: str, chunk_size: int = 500):
+        await self._wait(self.bulk_latency)
+        rows = self._table(table)
+        return row_chunks(rows=rows, chunk_size=chunk_size)
+
+    def _table(self, table: str) -> list[dict]:
+        if table not in self.tables:
+            raise ValueError(f"No table found for : {table}")
+        return self.tables[table]
+
+
+async def row_chunks(rows: list[dict], chunk_size: int):
+    columns = tuple(rows[0]) if rows else ()
+    for start in range(0, len(rows), chunk_size):
+        yield columns, [tuple(row.values()) for row in rows[start:start + chunk_size]]
@@ -0,0 +1,275 @@
+import argparse
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+import tempfile
+import time
+from collections.abc import Mapping
+from contextlib import closing
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.database.connectionPool import file_identity
+
+MAGIC = b"CATMMAP1"
+FORMAT_VERSION = 1
+# magic, format version, code width, item count, offer count, catalog version, padding
+HEADER = struct.Struct("<8sHHII16s4x")
+OFFER = struct.Struct("<qqq")
+PRICE_COLUMNS = ("id", "code", "price")
+OFFER_COLUMNS = ("id", "code", "amount", "offerprice")
+
+
+def _item_struct(code_width: int) -> struct.Struct:
+    # code, id, price, index of first offer, offer count
+    return struct.Struct(f"<{code_width}sqqII")
+
+
+def write_mmap_catalog(path: str, prices: list[dict], offers: list[dict]) -> str:
+    """
+    Writes prices and offers rows as a binary catalog and atomically replaces path with it
+
+    Layout: header, then one fixed-width record per item sorted by code, then the offers
+    of every item in the same order. Readers that still have the old file mapped keep
+    reading it until they notice the new one.
+
+    Returns: the catalog version, a digest of the records
+    """
+    offers_by_code = {}
+    for offer in offers:
+        offers_by_code.setdefault(offer["code"], []).append(offer)
+    rows = {row["code"].encode(): row for row in prices}
+    code_width = max((len(code) for code in rows), default=1) or 1
+    item = _item_struct(code_width)
+
+    body = bytearray()
+    offer_body = bytearray()
+    offer_count = 0
+    for code in sorted(code.ljust(code_width, b"\0") for code in rows):
+        row = rows[code.rstrip(b"\0")]
+        item_offers = sorted(offers_by_code.get(row["code"], ()), key=lambda offer: int(offer["amount"]))
+        body += item.pack(code, int(row["id"]), int(row["price"]), offer_count, len(item_offers))
+        for offer in item_offers:
+            offer_body += OFFER.pack(int(offer["id"]), int(offer["amount"]), int(offer["offerprice"]))
+        offer_count += len(item_offers)
+    digest = hashlib.blake2b(body + offer_body, digest_size=8).hexdigest()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(prefix=".catalog-", suffix=".bin", dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, code_width, len(rows), offer_count, digest.encode()))
+            file.write(body)
+            file.write(offer_body)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return digest
+
+
+def build_from_database(dbpath: str, path: str) -> str:
+    with closing(sqlite3.connect(dbpath)) as con:
+        prices = [dict(zip(PRICE_COLUMNS, row)) for row in con.execute("SELECT id, code, price FROM prices")]
+        offers = [dict(zip(OFFER_COLUMNS, row)) for row in con.execute("SELECT id, code, amount, offerprice FROM offers")]
+    return write_mmap_catalog(path=path, prices=prices, offers=offers)
+
+
+class MmapCatalog(Mapping):
+    """
+    Read-only view of a binary catalog file, mapping code -> CatalogItem
+
+    The file is mapped rather than read, so every worker process shares the same page
+    cache copy. Lookups binary search the sorted code records and only decode the one
+    item found. Items with several offer tiers are kept once decoded, so the pricing
+    plan compiled onto them is reused for as long as this mapping is.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, format_version, self.code_width, self.item_count, self.offer_count, version = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} binary catalog")
+        self.version = version.decode()
+        self._item = _item_struct(self.code_width)
+        self._items_start = HEADER.size
+        self._offers_start = self._items_start + self.item_count * self._item.size
+        self._tiered = {}
+
+    def _find(self, code: str) -> int:
+        key = code.encode()
+        if len(key) > self.code_width:
+            return -1
+        key = key.ljust(self.code_width, b"\0")
+        mm, size, start, width = self._mm, self._item.size, self._items_start, self.code_width
+        low, high = 0, self.item_count
+        while low < high:
+            middle = (low + high) // 2
+            position = start + middle * size
+            probe = mm[position:position + width]
+            if probe < key:
+                low = middle + 1
+            elif probe > key:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def _record(self, index: int) -> tuple:
+        return self._item.unpack_from(self._mm, self._items_start + index * self._item.size)
+
+    def _offers(self, first: int, count: int) -> list[tuple]:
+        return [OFFER.unpack_from(self._mm, self._offers_start + (first + n) * OFFER.size) for n in range(count)]
+
+    def _catalog_item(self, record: tuple) -> CatalogItem:
+        code, _, price, first, count = record
+        offers = tuple((amount, offerprice) for _, amount, offerprice in self._offers(first, count))
+        return CatalogItem(code=code.rstrip(b"\0").decode(), price=price, offers=offers)
+
+    def _item_at(self, index: int) -> CatalogItem:
+        item = self._tiered.get(index)
+        if item is None:
+            item = self._catalog_item(self._record(index))
+            if len(item.offers) > 1:
+                self._tiered[index] = item
+        return item
+
+    def tiered_items(self):
+        """
+        Yields every item with several offer tiers, the ones whose plans are worth compiling ahead
+        """
+        for index in range(self.item_count):
+            if self._record(index)[4] > 1:
+                yield self._item_at(index)
+
+    def get(self, code: str, default=None) -> CatalogItem | None:
+        index = self._find(code)
+        return default if index < 0 else self._item_at(index)
+
+    def __getitem__(self, code: str) -> CatalogItem:
+        item = self.get(code)
+        if item is None:
+            raise KeyError(code)
+        return item
+
+    def __contains__(self, code) -> bool:
+        return isinstance(code, str) and self._find(code) >= 0
+
+    def __iter__(self):
+        for index in range(self.item_count):
+            yield self._record(index)[0].rstrip(b"\0").decode()
+
+    def __len__(self) -> int:
+        return self.item_count
+
+    def values(self):
+        for index in range(self.item_count):
+            yield self._item_at(index)
+
+    def rows(self, table: str):
+        """
+        Yields the prices or offers table rows as dicts, in code order
+        """
+        if table not in ("prices", "offers"):
+            raise ValueError(f"No table found for : {table}")
+        for index in range(self.item_count):
+            code, item_id, price, first, count = self._record(index)
+            code = code.rstrip(b"\0").decode()
+            if table == "prices":
+                yield {"id": item_id, "code": code, "price": price}
+                continue
+            for offer_id, amount, offerprice in self._offers(first, count):
+                yield {"id": offer_id, "code": code, "amount": amount, "offerprice": offerprice}
+
+    def close(self):
+        self._mm.close()
+
+
+class MmapCatalogBackend:
+    """
+    Catalog backend over a binary catalog file
+
+    At most every check_interval seconds the file identity is checked, and a replaced
+    file is mapped and swapped in. In-flight lookups keep the old mapping, which is
+    released once nothing references it.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._catalog = None
+        self._file_id = None
+        self._next_check = 0.0
+
+    def catalog(self) -> MmapCatalog:
+        now = time.monotonic()
+        if self._catalog is None or now >= self._next_check:
+            self._next_check = now + self.check_interval
+            file_id = file_identity(self.path)
+            if self._catalog is None or file_id != self._file_id:
+                self._catalog = MmapCatalog(self.path)
+                self._file_id = file_id
+        return self._catalog
+
+    async def catalog_view(self) -> tuple[str, MmapCatalog]:
+        """
+        Returns: (version, mapping of code -> CatalogItem) for use as a catalog snapshot
+        """
+        catalog = self.catalog()
+        return catalog.version, catalog
+
+    async def get_item(self, code: str) -> CatalogItem | None:
+        return self.catalog().get(code)
+
+    async def get_items(self, codes: list[str]) -> dict[str, CatalogItem]:
+        catalog = self.catalog()
+        items = {}
+        for code in dict.fromkeys(codes):
+            item = catalog.get(code)
+            if item is not None:
+                items[code] = item
+        return items
+
+    async def get_all(self, table: str) -> list[dict]:
+        return list(self.catalog().rows(table))
+
+    async def get_by_id(self, table: str, id: int) -> list[dict]:
+        return [row for row in self.catalog().rows(table) if row["id"] == id]
+
+    async def stream_all(self, table: str, chunk_size: int = 500):
+        rows = self.catalog().rows(table)
+        columns = PRICE_COLUMNS if table == "prices" else OFFER_COLUMNS
+        first = next(rows, None)
+        return _stream_rows(first=first, rows=rows, columns=columns, chunk_size=chunk_size)
+
+
+async def _stream_rows(first: dict | None, rows, columns: tuple, chunk_size: int):
+    if first is None:
+        return
+    chunk = [tuple(first.values())]
+    for row in rows:
+        chunk.append(tuple(row.values()))
+        if len(chunk) >= chunk_size:
+            yield columns, chunk
+            chunk = []
+    if chunk:
+        yield columns, chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a binary catalog file from the catalog database")
+    parser.add_argument("--db", default="./src/backend/database/shoppingitems.db")
+    parser.add_argument("--out", default="./src/backend/database/catalog.bin")
+    args = parser.parse_args()
+    version = build_from_database(dbpath=args.db, path=args.out)
+    print(f"Binary catalog {version} written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,199 @@
+import asyncio
+import sqlite3
 from src.backend.database.dbConnectionFactory import DBConnectionFactory
-import json
-import pandas as pd
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.config.configService import AppConfig, config_service
+from src.backend.dao.singleFlight import single_flight
+from src.backend.metrics.metrics import ROW_CONVERSION
 
 
 class ReadDao:
-    def __init__(self):
-        self.dao = DBConnectionFactory()
+    """
+    Async reads over the catalog database
+
+    Each public method hands its blocking query to the factory's db thread pool,
+    so awaiting it never blocks the event loop
+    """
+    # SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds is 999
+    MAX_QUERY_PARAMS = 500
+
+    def __init__(self, config: AppConfig | None = None):
+        self.dao = DBConnectionFactory(config=config or config_service.get())
+    
+    
+    async def get_all_items(self, table:str, as_frame:bool=False):
+        return await self.dao.run(self._get_all_items, table=table, as_frame=as_frame)
+    
+    async def get_single_item(self, table:str, column:str, value:str, as_frame:bool=False):
+        return await self.dao.run(self._get_single_item, table=table, column=column, value=value, as_frame=as_frame)
+    
+    async def get_item_and_offer(self, table:str, column:str, value:str, as_frame:bool=False):
+        """
+        Gets the price and offers for one item
+        
+        Concurrent calls for the same item share one query, DataFrames are mutable so
+        as_frame calls always run their own
+        
+        Returns:
+            CatalogItem | None, or a DataFrame of the join rows when as_frame is set
+        """
+        if as_frame:
+            return await self.dao.run(self._get_item_and_offer, table=table, column=column, value=value, as_frame=True)
+        return await single_flight.do(key=(self.dao.dbpath, table, column, value),
+                                      func=lambda: self.dao.run(self._get_item_and_offer, table=table, column=column, value=value))
+    
+    async def get_items_and_offers(self, table:str, column:str, values:list[str]) -> dict[str, CatalogItem]:
+        """
+        Batched get_item_and_offer, resolves every value with one IN (...) query per chunk
+        
+        Codes another lookup is already fetching, batched or single, share that query and
+        only the rest are queried. Rows come back keyed by code, so lookups on any other
+        column always run their own query
+        
+        Input:
+            values: list[str] -> values of column to look up, duplicates are ignored
+            
+        Returns:
+            dict[str, CatalogItem] -> items keyed by code, codes with no price are left out
+        """
+        if column != "code":
+            return await self.dao.run(self._get_items_and_offers, table=table, column=column, values=values)
+        
+        async def fetch(keys: list) -> dict:
+            found = await self.dao.run(self._get_items_and_offers, table=table, column=column, values=[key[3] for key in keys])
+            return {key: found.get(key[3]) for key in keys}
+        
+        items = await single_flight.do_many(keys=[(self.dao.dbpath, table, column, value) for value in values], func=fetch)
+        return {key[3]: item for key, item in items.items() if item is not None}
+    
+    async def stream_all_items(self, table:str, chunk_size:int=500):
+        """
+        Streams every row of table without materialising it
+        
+        The table is checked before this returns, so a missing table raises here rather
+        than part way through a response. The pooled connection is only taken once the
+        iterator is first read and goes back when it finishes or is closed, so an
+        iterator that is never read holds nothing. A stream cancelled mid-read, e.g. by a
+        client disconnecting, hands it back once the db thread has finished that read.
+        
+        Returns:
+            async iterator of (columns, rows) chunks of at most chunk_size tuples
+        """
+        await self.dao.run(self._require_table, table=table)
+        return self._stream_chunks(query=f"SELECT * from {table}", table=table, chunk_size=chunk_size)
+    
+    def _require_table(self, table:str):
+        with self.dao.connection() as connection:
+            if not self.dao.schema.has_table(con=connection, table=table):
+                raise sqlite3.DatabaseError(f"No table found for : {table}")
+    
+    def _open_cursor(self, query:str, table:str):
+        connection = self.dao.pool.acquire()
+        try:
+            return connection, self.dao.execute(con=connection, query=query, table=table)
+        except BaseException:
+            self.dao.pool.release(connection)
+            raise
     
+    def _close_cursor(self, connection, cursor):
+        try:
+            cursor.close()
+        finally:
+            self.dao.pool.release(connection)
     
-    async def get_all_items(self, table:str):
-        connection = self.dao.connect()
+    def _close_opened(self, opening: asyncio.Future):
+        if not opening.cancelled() and opening.exception() is None:
+            self._close_cursor(*opening.result())
+    
+    def _close_fetched(self, connection, cursor, fetching: asyncio.Future):
+        if not fetching.cancelled():
+            # Retrieved so a failed read of an abandoned stream is not logged as unhandled
+            fetching.exception()
+        self._close_cursor(connection=connection, cursor=cursor)
+    
+    async def _stream_chunks(self, query:str, table:str, chunk_size:int):
+        opening = asyncio.ensure_future(self.dao.run(self._open_cursor, query=query, table=table))
+        try:
+            connection, cursor = await asyncio.shield(opening)
+        except asyncio.CancelledError:
+            # The cursor may still be opening on the db thread, give it back once it has
+            opening.add_done_callback(self._close_opened)
+            raise
+        fetching = None
+        try:
+            columns = [description[0] for description in cursor.description]
+            while True:
+                fetching = asyncio.ensure_future(self.dao.run(cursor.fetchmany, chunk_size))
+                rows = await asyncio.shield(fetching)
+                fetching = None
+                if not rows:
+                    break
+                yield columns, rows
+        finally:
+            if fetching is not None and not fetching.done():
+                # A db thread is still reading the cursor, close it and give the connection back once it is done
+                fetching.add_done_callback(lambda done: self._close_fetched(connection=connection, cursor=cursor, fetching=done))
+            else:
+                self._close_cursor(connection=connection, cursor=cursor)
+    
+    def _get_all_items(self, table:str, as_frame:bool=False):
         query = f"SELECT * from {table}"
-        data = self.dao.get_data(con=connection, query=query, table = table)
-        self.dao.close_connection(con=connection)
-        return json.loads(data.to_json(orient="records"))
-    
-    async def get_single_item(self, table:str, column:str, value:str):
-        connection = self.dao.connect()
-        query = f"SELECT * from {table} WHERE {column} = '{value}'"
-        data = self.dao.get_data(con=connection, query=query, table=table)
-        self.dao.close_connection(con =connection)
-        return json.loads(data.to_json(orient="records"))
-    
-    async def get_item_and_offer(self, table:str, column:str, value:str):
-        connection = self.dao.connect()
+        with self.dao.connection() as connection:
+            if as_frame:
+                return self.dao.get_data(con=connection, query=query, table = table)
+            columns, rows = self.dao.get_rows(con=connection, query=query, table = table)
+        with ROW_CONVERSION.time("dict"):
+            return [dict(zip(columns, row)) for row in rows]
+    
+    def _get_single_item(self, table:str, column:str, value:str, as_frame:bool=False):
+        query = f"SELECT * from {table} WHERE {column} = ?"
+        with self.dao.connection() as connection:
+            self.dao.validate_column(con=connection, table=table, column=column)
+            if as_frame:
+                return self.dao.get_data(con=connection, query=query, table=table, params=(value,))
+            columns, rows = self.dao.get_rows(con=connection, query=query, table=table, params=(value,))
+        with ROW_CONVERSION.time("dict"):
+            return [dict(zip(columns, row)) for row in rows]
+    
+    def _get_item_and_offer(self, table:str, column:str, value:str, as_frame:bool=False):
         query = f"""SELECT prices.code, prices.price, offers.amount, offers.offerprice 
                     FROM {table} 
                     LEFT JOIN offers 
                     ON prices.code = offers.code
-                    WHERE {table}.{column} = '{value}'"""
+                    WHERE {table}.{column} = ?"""
         
-        data = self.dao.get_data(con=connection, query=query, table = table)
-        self.dao.close_connection(con = connection)
-        return data
+        with self.dao.connection() as connection:
+            self.dao.validate_column(con=connection, table=table, column=column)
+            if as_frame:
+                return self.dao.get_data(con=connection, query=query, table = table, params=(value,))
+            _, rows = self.dao.get_rows(con=connection, query=query, table = table, params=(value,))
+        with ROW_CONVERSION.time("catalog_item"):
+            return CatalogItem.from_rows(rows)
+    
+    def _get_items_and_offers(self, table:str, column:str, values:list[str]) -> dict[str, CatalogItem]:
+        values = list(dict.fromkeys(values))
+        rows_by_code = {}
+        with self.dao.connection() as connection:
+            self.dao.validate_column(con=connection, table=table, column=column)
+            for start in range(0, len(values), self.MAX_QUERY_PARAMS):
+                chunk = values[start:start + self.MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"""SELECT prices.code, prices.price, offers.amount, offers.offerprice 
+                        FROM {table} 
+                        LEFT JOIN offers 
+                        ON prices.code = offers.code
+                        WHERE {table}.{column} IN ({placeholders})"""
+                _, rows = self.dao.get_rows(con=connection, query=query, table=table, params=chunk)
+                for row in rows:
+                    rows_by_code.setdefault(row[0], []).append(row)
+        with ROW_CONVERSION.time("catalog_item"):
+            return {code: CatalogItem.from_rows(rows) for code, rows in rows_by_code.items()}
     
     
 def main():
-    bob = ReadDao().get_single_item(table="prices", column="id", value="1")
+    import asyncio
+    bob = asyncio.run(ReadDao().get_single_item(table="prices", column="id", value="1"))
     print(bob)
     
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from collections import Counter
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call between concurrent callers asking for the same key
+
+    The first caller starts the work, everyone arriving before it finishes awaits the
+    same task and gets the same result or exception. Nothing is kept once it completes,
+    so this only removes duplicate concurrent work and never serves stale data.
+    """
+
+    def __init__(self, max_tracked_keys: int = 10000):
+        self.max_tracked_keys = max_tracked_keys
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._coalesced = Counter()
+
+    async def do(self, key, func):
+        """
+        Input:
+            key: hashable identifying the call, e.g. (dbpath, table, column, value)
+            func: no argument coroutine function doing the work
+
+        Returns: func's result, possibly from another caller's call
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = loop.create_task(func())
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+            with self._lock:
+                self._calls += 1
+        else:
+            with self._lock:
+                if key in self._coalesced or len(self._coalesced) < self.max_tracked_keys:
+                    self._coalesced[key] += 1
+        # shield so one caller being cancelled does not cancel the call for the others
+        return await asyncio.shield(task)
+
+    async def do_many(self, keys: list, func) -> dict:
+        """
+        Batched do(), keys another caller is already fetching share that call and the rest
+        are fetched together by one call of func
+
+        Input:
+            keys: hashable keys, duplicates are ignored
+            func: coroutine function taking the list of keys not in flight and returning {key: result}
+
+        Returns: {key: result} for every key, None for keys func left out
+        """
+        loop = asyncio.get_running_loop()
+        flights = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            flight = self._inflight.get((loop, key))
+            if flight is None:
+                missing.append(key)
+            else:
+                flights[key] = flight
+                with self._lock:
+                    if key in self._coalesced or len(self._coalesced) < self.max_tracked_keys:
+                        self._coalesced[key] += 1
+        if missing:
+            batch = loop.create_task(func(missing))
+            futures = {key: loop.create_future() for key in missing}
+            for key, future in futures.items():
+                self._inflight[(loop, key)] = future
+            batch.add_done_callback(lambda done: self._settle(loop=loop, futures=futures, batch=done))
+            flights.update(futures)
+            with self._lock:
+                self._calls += len(missing)
+        # gather retrieves every failure, shield keeps one caller's cancellation from reaching the others
+        results = await asyncio.gather(*(asyncio.shield(flight) for flight in flights.values()))
+        return dict(zip(flights, results))
+
+    def _settle(self, loop, futures: dict, batch: asyncio.Task):
+        for key, future in futures.items():
+            if self._inflight.get((loop, key)) is future:
+                del self._inflight[(loop, key)]
+            if batch.cancelled():
+                future.cancel()
+            elif batch.exception() is not None:
+                future.set_exception(batch.exception())
+            else:
+                future.set_result(batch.result().get(key))
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def coalesced(self, key) -> int:
+        with self._lock:
+            return self._coalesced.get(key, 0)
+
+    def stats(self, top: int = 10) -> dict:
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "coalesced": sum(self._coalesced.values()),
+                "in_flight": len(self._inflight),
+                "top_keys": self._coalesced.most_common(top),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._calls = 0
+            self._coalesced.clear()
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,161 @@
+import argparse
+import csv
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from itertools import islice
+from src.backend.database.migrations import migrate
+from src.backend.dao.mmapCatalog import build_from_database
+
+DEFAULT_DBPATH = "./src/backend/database/shoppingitems.db"
+DEFAULT_PRICES = "./src/backend/database/prices.csv"
+DEFAULT_OFFERS = "./src/backend/database/offers.csv"
+
+# Upsert keys match the unique indexes created by migrations. Rows in a file replace every row
+# of the same group, so an offers file lists the full set of tiers for each code it mentions
+TABLES = {
+    "prices": {"columns": ("id", "code", "price"), "key": ("code",), "group": None},
+    "offers": {"columns": ("id", "code", "amount", "offerprice"), "key": ("code", "amount"), "group": "code"},
+}
+
+
+def read_chunks(path: str, columns: tuple, chunk_size: int):
+    """
+    Yields lists of at most chunk_size rows from a CSV, reordered to columns
+
+    Input: path of a CSV with a header row containing every name in columns
+    """
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        header = [name.strip() for name in next(reader, [])]
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise ValueError(f"{path} is missing columns {missing}")
+        positions = [header.index(column) for column in columns]
+        rows = ([row[position] for position in positions] for row in reader if row)
+        while chunk := list(islice(rows, chunk_size)):
+            yield chunk
+
+
+def upsert_csv(con: sqlite3.Connection, table: str, path: str, chunk_size: int) -> int:
+    """
+    Upserts a CSV into table on its key, keeping the id primary key consistent
+
+    A row whose id is held by a different key replaces that row. For grouped tables, rows of
+    a group (e.g. an item's offer tiers) that are no longer in the file are deleted.
+    """
+    spec = TABLES[table]
+    columns, key = spec["columns"], spec["key"]
+    positions = [columns.index(column) for column in ("id",) + key]
+    other_key = " OR ".join(f"{column} IS NOT ?" for column in key)
+    clear_id = f'DELETE FROM "{table}" WHERE id = ? AND ({other_key})'
+    updates = ", ".join(f"{column}=excluded.{column}" for column in columns if column not in key)
+    statement = (f'INSERT INTO "{table}" ({", ".join(columns)}) VALUES ({", ".join("?" for _ in columns)}) '
+                 f'ON CONFLICT({", ".join(key)}) DO UPDATE SET {updates}')
+    group = spec["group"]
+    if group:
+        con.execute(f'CREATE TEMP TABLE "imported_{table}" ({", ".join(key)})')
+    loaded = 0
+    for chunk in read_chunks(path, columns, chunk_size):
+        con.executemany(clear_id, ([row[position] for position in positions] for row in chunk))
+        con.executemany(statement, chunk)
+        if group:
+            con.executemany(f'INSERT INTO "imported_{table}" VALUES ({", ".join("?" for _ in key)})',
+                            ([row[position] for position in positions[1:]] for row in chunk))
+        loaded += len(chunk)
+    if group:
+        con.execute(f'DELETE FROM "{table}" WHERE {group} IN (SELECT {group} FROM "imported_{table}") '
+                    f'AND ({", ".join(key)}) NOT IN (SELECT {", ".join(key)} FROM "imported_{table}")')
+        con.execute(f'DROP TABLE "imported_{table}"')
+    return loaded
+
+
+def import_catalog(dbpath: str, prices_path: str | None, offers_path: str | None, chunk_size: int = 50000,
+                   fresh: bool = False, in_place: bool = False) -> dict:
+    """
+    Upserts prices and offers CSVs into the catalog database in a single transaction
+
+    Input:
+        fresh: start from an empty catalog instead of the current database
+        in_place: write straight into dbpath instead of building a copy and renaming it over dbpath
+
+    By default the new catalog is built in a temporary file next to dbpath and moved into
+    place with os.replace, so readers see the old file or the new one and never wait on
+    the import. Prices upsert on code, offers on (code, amount), and an id taken by another
+    key moves to the imported row. Every code in the offers CSV ends up with exactly the
+    tiers listed for it. Items and offers of codes missing from the CSVs are kept, only
+    fresh removes them.
+
+    Returns: rows read from each CSV
+    """
+    logger = logging.getLogger()
+    started = time.perf_counter()
+    directory = os.path.dirname(os.path.abspath(dbpath))
+    target = dbpath
+    if not in_place:
+        handle, target = tempfile.mkstemp(prefix=".catalog-", suffix=".db", dir=directory)
+        os.close(handle)
+        if os.path.exists(dbpath):
+            os.chmod(target, os.stat(dbpath).st_mode & 0o777)
+    try:
+        con = sqlite3.connect(target, isolation_level=None)
+        try:
+            if not in_place:
+                if not fresh and os.path.exists(dbpath):
+                    with closing(sqlite3.connect(dbpath)) as source:
+                        source.backup(con)
+                # Nobody reads the temporary file until it is complete, so skip the journal
+                con.execute("PRAGMA journal_mode=OFF")
+                con.execute("PRAGMA synchronous=OFF")
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                if in_place and fresh:
+                    for table in TABLES:
+                        con.execute(f'DROP TABLE IF EXISTS "{table}"')
+                    con.execute("PRAGMA user_version = 0")
+                migrate(con)
+                counts = {}
+                for table, path in (("prices", prices_path), ("offers", offers_path)):
+                    if path:
+                        counts[table] = upsert_csv(con, table, path, chunk_size)
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+        finally:
+            con.close()
+        if not in_place:
+            with open(target, "rb+") as file:
+                os.fsync(file.fileno())
+            os.replace(target, dbpath)
+    except BaseException:
+        if not in_place and os.path.exists(target):
+            os.remove(target)
+        raise
+    logger.info(f"Imported {counts} into {dbpath} in {time.perf_counter() - started:.2f}s")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import prices and offers CSVs into the catalog database")
+    parser.add_argument("--db", default=DEFAULT_DBPATH)
+    parser.add_argument("--prices", default=DEFAULT_PRICES, help="prices CSV (id,code,price), empty to skip")
+    parser.add_argument("--offers", default=DEFAULT_OFFERS, help="offers CSV (id,code,amount,offerprice), empty to skip")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--fresh", action="store_true", help="replace the catalog instead of upserting into it")
+    parser.add_argument("--in-place", action="store_true", help="write into the live file instead of swapping in a new one")
+    parser.add_argument("--mmap", default=None, help="also write the binary catalog used by the mmap backend to this path")
+    args = parser.parse_args(argv)
+    counts = import_catalog(dbpath=args.db, prices_path=args.prices, offers_path=args.offers, chunk_size=args.chunk_size,
+                            fresh=args.fresh, in_place=args.in_place)
+    print(f"Catalog import complete: {counts}")
+    if args.mmap:
+        version = build_from_database(dbpath=args.db, path=args.mmap)
+        print(f"Binary catalog {version} written to {args.mmap}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+from collections import deque
+from src.backend.metrics.metrics import DB_CONNECT
+
+
+def file_identity(path: str) -> tuple | None:
+    """
+    Returns (device, inode) of path, which changes when another file is renamed over it
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections shared by every DBConnectionFactory for a db path
+
+    Connections are checked out for the duration of a unit of work and handed back,
+    so they can be used from whichever thread is running that work.
+
+    An open connection keeps reading the file it was opened on, so at most every
+    file_check_interval seconds the pool checks whether dbpath was replaced (e.g. by the
+    catalog importer) and retires connections to the old file as they come back.
+    """
+
+    def __init__(self, dbpath: str, max_size: int = 8, acquire_timeout: float = 5.0, health_check_interval: float = 30.0,
+                 schema_cache=None, file_check_interval: float = 1.0):
+        self.dbpath = dbpath
+        self.schema_cache = schema_cache
+        self.max_size = max(int(max_size), 1)
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.file_check_interval = file_check_interval
+        self.logger = logging.getLogger()
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._file_id = file_identity(dbpath)
+        self._next_file_check = time.monotonic() + file_check_interval
+        self._opened_on = {}
+        self._cond = threading.Condition(threading.Lock())
+        self._stats = {
+            "acquired": 0,
+            "created": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "file_replacements": 0,
+        }
+
+    def _new_connection(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.dbpath, check_same_thread=False)
+        with self._cond:
+            self._stats["created"] += 1
+            self._opened_on[con] = self._file_id
+        return con
+
+    def _check_file(self) -> list:
+        """
+        Called with the lock held, returns idle connections to a replaced file for closing
+        """
+        now = time.monotonic()
+        if now < self._next_file_check:
+            return []
+        self._next_file_check = now + self.file_check_interval
+        file_id = file_identity(self.dbpath)
+        if file_id == self._file_id:
+            return []
+        self._file_id = file_id
+        self._stats["file_replacements"] += 1
+        stale = [con for con, _ in self._idle]
+        self._idle.clear()
+        self._size -= len(stale)
+        for con in stale:
+            self._opened_on.pop(con, None)
+        return stale
+
+    def _healthy(self, con: sqlite3.Connection) -> bool:
+        try:
+            # schema_version doubles as the liveness probe and tells the schema cache about DDL
+            schema_version = con.execute("PRAGMA schema_version").fetchone()[0]
+            if self.schema_cache is not None:
+                self.schema_cache.observe_version(schema_version)
+            return True
+        except sqlite3.Error as e:
+            self.logger.warning(f"WARNING: Discarding unhealthy pooled connection to {self.dbpath}, Error: {e}")
+            return False
+
+    def acquire(self, timeout: float | None = None) -> sqlite3.Connection:
+        started = time.perf_counter()
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = None
+        with self._cond:
+            stale = self._check_file()
+            while True:
+                if self._idle:
+                    con, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    con, last_used = None, None
+                    break
+                if waited is None:
+                    waited = time.monotonic()
+                    self._stats["waits"] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if self._idle or self._size < self.max_size:
+                        continue
+                    self._stats["timeouts"] += 1
+                    self._stats["wait_time_total"] += time.monotonic() - waited
+                    raise sqlite3.OperationalError(f"Timed out after {timeout}s waiting for a connection to {self.dbpath}")
+            if waited is not None:
+                self._stats["wait_time_total"] += time.monotonic() - waited
+            self._in_use += 1
+            self._stats["acquired"] += 1
+
+        for stale_con in stale:
+            self._close_quietly(stale_con)
+        try:
+            if con is not None and time.monotonic() - last_used > self.health_check_interval and not self._healthy(con):
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+                    self._opened_on.pop(con, None)
+                self._close_quietly(con)
+                con = None
+            if con is None:
+                con = self._new_connection()
+            DB_CONNECT.observe(time.perf_counter() - started)
+            return con
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, con: sqlite3.Connection, discard: bool = False):
+        with self._cond:
+            if self._opened_on.get(con, self._file_id) != self._file_id:
+                discard = True
+        if not discard:
+            try:
+                if con.in_transaction:
+                    con.rollback()
+            except sqlite3.Error:
+                discard = True
+        if discard:
+            self._close_quietly(con)
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._size -= 1
+                self._opened_on.pop(con, None)
+            else:
+                self._idle.append((con, time.monotonic()))
+            self._cond.notify()
+
+    def warm(self, count: int) -> int:
+        """
+        Opens connections up front so the first requests do not pay for them
+
+        Returns: idle connections now in the pool
+        """
+        connections = []
+        try:
+            for _ in range(min(count, self.max_size)):
+                connections.append(self.acquire())
+        finally:
+            for con in connections:
+                self.release(con)
+        with self._cond:
+            return len(self._idle)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                **self._stats,
+            }
+
+    def close_all(self):
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            for con, _ in idle:
+                self._opened_on.pop(con, None)
+        for con, _ in idle:
+            self._close_quietly(con)
+
+    def _close_quietly(self, con: sqlite3.Connection):
+        try:
+            con.close()
+        except sqlite3.Error:
+            pass
@@ -1,17 +1,38 @@
 import sqlite3
+import asyncio
+import functools
+import threading
 import yaml
 import logging
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from yaml.loader import SafeLoader
+from src.backend.database.connectionPool import ConnectionPool
+from src.backend.database.schemaCache import SchemaCache
+from src.backend.config.configService import AppConfig
+from src.backend.metrics.metrics import DB_QUERY
 
 class DBConnectionFactory:
+    # One pool per database file, shared by every factory instance in the process
+    _pools = {}
+    _pools_lock = threading.Lock()
+    _schemas = {}
+    # Blocking sqlite3 work runs here so it never stalls the event loop
+    _executor = None
+    _executor_lock = threading.Lock()
     
-    def __init__(self):
+    def __init__(self, config: AppConfig | None = None):
         self.config = {}
-        with open("./config/config.yml", "r") as file:
-            self.config = yaml.load(file, Loader=SafeLoader)
+        if config is None:
+            # Standalone use, request paths pass the process-wide config instead
+            with open("./config/config.yml", "r") as file:
+                self.config = yaml.load(file, Loader=SafeLoader)
+            config = AppConfig.from_dict(self.config)
+        else:
+            self.config = config.raw
+        self.settings = config
         self.logger = logging.getLogger()
-        self.dbpath = self.config.get("dbpath")
+        self.dbpath = self.settings.dbpath
             
     def connect(self) -> sqlite3.Connection:
         try:
@@ -22,8 +43,84 @@ class DBConnectionFactory:
         except Exception as e:
             self.logger.error(f"ERROR: {e} in dbConnectionFactory - connect function")
             
+    @property
+    def pool(self) -> ConnectionPool:
+        pool = DBConnectionFactory._pools.get(self.dbpath)
+        if pool is None:
+            schema = self.schema
+            with DBConnectionFactory._pools_lock:
+                pool = DBConnectionFactory._pools.get(self.dbpath)
+                if pool is None:
+                    pool_config = self.settings.pool
+                    pool = ConnectionPool(dbpath=self.dbpath,
+                                          max_size=pool_config.max_size,
+                                          acquire_timeout=pool_config.acquire_timeout,
+                                          health_check_interval=pool_config.health_check_interval,
+                                          file_check_interval=pool_config.file_check_interval,
+                                          schema_cache=schema)
+                    DBConnectionFactory._pools[self.dbpath] = pool
+        return pool
+
+    @property
+    def schema(self) -> SchemaCache:
+        schema = DBConnectionFactory._schemas.get(self.dbpath)
+        if schema is None:
+            with DBConnectionFactory._pools_lock:
+                schema = DBConnectionFactory._schemas.setdefault(self.dbpath, SchemaCache(dbpath=self.dbpath))
+        return schema
+
+    def validate_column(self, con: sqlite3.Connection, table: str, column: str):
+        """
+        Raises DatabaseError unless column exists on table, for callers that put names into SQL
+        """
+        if not self.schema.has_column(con=con, table=table, column=column):
+            raise sqlite3.DatabaseError(f"No column {column} found for : {table}")
+
+    @contextmanager
+    def connection(self):
+        """
+        Checks a connection out of the pool for the duration of the with block
+        """
+        con = self.pool.acquire()
+        try:
+            yield con
+        except (sqlite3.ProgrammingError, sqlite3.InterfaceError):
+            self.pool.release(con, discard=True)
+            raise
+        except BaseException:
+            self.pool.release(con)
+            raise
+        else:
+            self.pool.release(con)
+
+    def pool_stats(self) -> dict:
+        return self.pool.stats()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if DBConnectionFactory._executor is None:
+            with DBConnectionFactory._executor_lock:
+                if DBConnectionFactory._executor is None:
+                    DBConnectionFactory._executor = ThreadPoolExecutor(max_workers=self.settings.executor.max_workers,
+                                                                       thread_name_prefix="db")
+        return DBConnectionFactory._executor
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs a blocking database function on the bounded db thread pool and awaits its result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    @classmethod
+    def shutdown_executor(cls):
+        with cls._executor_lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
     def add_data(self, con: sqlite3.Connection, query: str, table:str):
-        if self.check_table(con=con, table=table):
+        if self.schema.has_table(con=con, table=table):
             cur = con.cursor()
             try:
                 cur.execute(query)
@@ -41,10 +138,39 @@ class DBConnectionFactory:
             return False
         return True
 
-    def get_data(self, con:sqlite3.Connection, query:str, table:str):
-        if not self.check_table(con=con, table=table):
+    def get_data(self, con:sqlite3.Connection, query:str, table:str, params=None):
+        """
+        Returns the query result as a DataFrame, for analytics callers that want pandas
+        """
+        import pandas as pd
+        if not self.schema.has_table(con=con, table=table):
             raise sqlite3.DatabaseError(f"No table found for : {table}")
-        return pd.read_sql(sql=query, con=con)
+        with DB_QUERY.time(table):
+            return pd.read_sql(sql=query, con=con, params=params)
+
+    def execute(self, con:sqlite3.Connection, query:str, table:str, params=()) -> sqlite3.Cursor:
+        """
+        Runs a read query against table and returns the open cursor
+        """
+        if not self.schema.has_table(con=con, table=table):
+            raise sqlite3.DatabaseError(f"No table found for : {table}")
+        try:
+            return con.execute(query, params)
+        except sqlite3.OperationalError:
+            # The cached schema may be stale, e.g. the table was dropped since it was loaded
+            self.schema.invalidate()
+            if not self.schema.has_table(con=con, table=table):
+                raise sqlite3.DatabaseError(f"No table found for : {table}")
+            raise
+
+    def get_rows(self, con:sqlite3.Connection, query:str, table:str, params=()) -> tuple[list[str], list[tuple]]:
+        """
+        Returns the column names and plain tuple rows straight from the cursor
+        """
+        with DB_QUERY.time(table):
+            cur = self.execute(con=con, query=query, table=table, params=params)
+            rows = cur.fetchall()
+        return [description[0] for description in cur.description], rows
     
     def close_connection(self, con:sqlite3.Connection):
         con.close()
@@ -1,12 +1,6 @@
-import sqlite3
-import pandas as pd
-con = sqlite3.connect("./src/backend/database/shoppingitems.db")
-cur = con.cursor()
+from src.backend.database.catalogImport import import_catalog, DEFAULT_DBPATH, DEFAULT_PRICES, DEFAULT_OFFERS
 
-prices_data = pd.read_csv("./src/backend/database/prices.csv", delimiter=',')
-prices_data.to_sql('prices', con, index=False, if_exists="append")
+# Kept for the README instructions, safe to re-run as the import upserts
+counts = import_catalog(dbpath=DEFAULT_DBPATH, prices_path=DEFAULT_PRICES, offers_path=DEFAULT_OFFERS)
 
-offer_data = pd.read_csv("./src/backend/database/offers.csv", delimiter=',')
-offer_data.to_sql('offers', con, index=False, if_exists="append")
-
-print("Database Setup Complete")
\ No newline at end of file
+print(f"Database Setup Complete {counts}")
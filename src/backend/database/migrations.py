@@ -0,0 +1,139 @@
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from urllib.request import pathname2url
+
+
+def _has_unique_index(con: sqlite3.Connection, table: str, name: str) -> bool:
+    return any(unique and index == name for _, index, unique, *_ in con.execute(f'PRAGMA index_list("{table}")'))
+
+
+def _keyed_tables(con: sqlite3.Connection):
+    """
+    Creates prices and offers with primary keys and unique keys, rebuilding unkeyed tables
+
+    Tables from the old pandas loader can hold duplicates from repeated runs, the last
+    row loaded for each key wins
+    """
+    tables = {
+        "prices": ('CREATE TABLE "prices" ("id" INTEGER PRIMARY KEY, "code" TEXT NOT NULL, "price" INTEGER NOT NULL)',
+                   "prices_code", ("code",), ("id", "code", "price")),
+        "offers": ('CREATE TABLE "offers" ("id" INTEGER PRIMARY KEY, "code" TEXT NOT NULL, "amount" INTEGER NOT NULL, '
+                   '"offerprice" INTEGER NOT NULL)',
+                   "offers_code_amount", ("code", "amount"), ("id", "code", "amount", "offerprice")),
+    }
+    for table, (create, index, key, columns) in tables.items():
+        exists = con.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+        if exists and _has_unique_index(con, table, index):
+            continue
+        if exists:
+            con.execute(f'ALTER TABLE "{table}" RENAME TO "{table}_legacy"')
+        con.execute(create)
+        con.execute(f'CREATE UNIQUE INDEX "{index}" ON "{table}" ({", ".join(key)})')
+        if exists:
+            con.execute(f'INSERT INTO "{table}" ({", ".join(columns)}) SELECT {", ".join(columns)} FROM "{table}_legacy" '
+                        f'WHERE rowid IN (SELECT MAX(rowid) FROM "{table}_legacy" GROUP BY {", ".join(key)})')
+            con.execute(f'DROP TABLE "{table}_legacy"')
+
+
+def _covering_offer_index(con: sqlite3.Connection):
+    # The prices to offers join only reads these columns, so it never touches the offers table
+    con.execute('CREATE INDEX IF NOT EXISTS "offers_code_amount_offerprice" ON "offers" ("code", "amount", "offerprice")')
+
+
+# (user_version, description, apply), append only, a released migration must never change
+MIGRATIONS = [
+    (1, "keyed prices and offers tables", _keyed_tables),
+    (2, "covering index for the prices to offers join", _covering_offer_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+HOT_QUERIES = {
+    "price_by_id": ("SELECT * from prices WHERE id = ?", (1,)),
+    "price_by_code": ("SELECT * from prices WHERE code = ?", ("A",)),
+    "offer_by_code": ("SELECT * from offers WHERE code = ?", ("A",)),
+    "item_and_offer": ("""SELECT prices.code, prices.price, offers.amount, offers.offerprice
+                    FROM prices
+                    LEFT JOIN offers
+                    ON prices.code = offers.code
+                    WHERE prices.code = ?""", ("A",)),
+    "items_and_offers": ("""SELECT prices.code, prices.price, offers.amount, offers.offerprice
+                        FROM prices
+                        LEFT JOIN offers
+                        ON prices.code = offers.code
+                        WHERE prices.code IN (?, ?)""", ("A", "B")),
+}
+
+
+def schema_version(con: sqlite3.Connection) -> int:
+    return con.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(con: sqlite3.Connection, target: int = LATEST_VERSION) -> list[int]:
+    """
+    Brings the database up to target, tracking the applied version in PRAGMA user_version
+
+    Each migration commits on its own and re-reads the version under the write lock, so
+    several processes starting together apply each migration once. When the caller already
+    holds a transaction the migrations join it instead.
+
+    Returns: versions applied
+    """
+    logger = logging.getLogger()
+    applied = []
+    for version, description, apply in MIGRATIONS:
+        if version > target or schema_version(con) >= version:
+            continue
+        own_transaction = not con.in_transaction
+        if own_transaction:
+            con.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(con) < version:
+                apply(con)
+                con.execute(f"PRAGMA user_version = {int(version)}")
+                applied.append(version)
+                logger.info(f"Applied migration {version}: {description}")
+            if own_transaction:
+                con.execute("COMMIT")
+        except BaseException:
+            if own_transaction:
+                con.execute("ROLLBACK")
+            raise
+    return applied
+
+
+def connect_existing(dbpath: str, **kwargs) -> sqlite3.Connection:
+    """
+    Opens dbpath read-write without creating it, a wrong path must not become an empty catalog
+    """
+    if not os.path.isfile(dbpath):
+        raise FileNotFoundError(f"Catalog database not found at {dbpath}")
+    return sqlite3.connect(f"file:{pathname2url(os.path.abspath(dbpath))}?mode=rw", uri=True, **kwargs)
+
+
+def migrate_database(dbpath: str, target: int = LATEST_VERSION) -> list[int]:
+    with closing(connect_existing(dbpath, isolation_level=None)) as con:
+        return migrate(con, target=target)
+
+
+def check_query_plans(dbpath: str) -> dict[str, list[str]]:
+    with closing(connect_existing(dbpath)) as con:
+        return unindexed_queries(con)
+
+
+def unindexed_queries(con: sqlite3.Connection) -> dict[str, list[str]]:
+    """
+    Runs EXPLAIN QUERY PLAN over HOT_QUERIES
+
+    Returns: query name -> plan steps that scan a whole table or index, empty when every
+    hot query is an index search
+    """
+    scans = {}
+    for name, (query, params) in HOT_QUERIES.items():
+        steps = [row[-1] for row in con.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+        full_scans = [step for step in steps if step.startswith("SCAN")]
+        if full_scans:
+            scans[name] = full_scans
+    return scans
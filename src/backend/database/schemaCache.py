@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+
+
+class SchemaCache:
+    """
+    Table and column names for one database file
+
+    Loaded once and trusted until SQLite's schema_version moves, a lookup misses,
+    or a query reports a missing table or column, so the hot path does not
+    query sqlite_master before every statement.
+    """
+
+    def __init__(self, dbpath: str):
+        self.dbpath = dbpath
+        self.schema_version = None
+        self._tables = None
+        self._lock = threading.Lock()
+
+    def has_table(self, con: sqlite3.Connection, table: str) -> bool:
+        tables = self._tables
+        if tables is not None and table in tables:
+            return True
+        # A miss may be a table created since the last load, so always confirm it
+        return table in self.refresh(con=con)
+
+    def columns(self, con: sqlite3.Connection, table: str) -> tuple:
+        tables = self._tables
+        if tables is None or table not in tables:
+            tables = self.refresh(con=con)
+            if table not in tables:
+                raise sqlite3.DatabaseError(f"No table found for : {table}")
+        columns = tables[table]
+        if columns is None:
+            rows = con.cursor().execute(f"PRAGMA table_info('{table}')").fetchall()
+            columns = tuple(row[1] for row in rows)
+            tables[table] = columns
+        return columns
+
+    def has_column(self, con: sqlite3.Connection, table: str, column: str) -> bool:
+        if column in self.columns(con=con, table=table):
+            return True
+        self.invalidate()
+        return column in self.columns(con=con, table=table)
+
+    def refresh(self, con: sqlite3.Connection) -> dict:
+        cur = con.cursor()
+        names = cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        version = cur.execute("PRAGMA schema_version").fetchone()
+        tables = {row[0]: None for row in names}
+        with self._lock:
+            self._tables = tables
+            self.schema_version = version[0] if version else None
+        return tables
+
+    def observe_version(self, schema_version):
+        """
+        Drops the cache when a connection reports a different schema_version
+        """
+        if schema_version != self.schema_version:
+            self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._tables = None
+            self.schema_version = None
@@ -0,0 +1,65 @@
+from src.backend.metrics.metrics import registry
+from src.backend.database.dbConnectionFactory import DBConnectionFactory
+from src.backend.checkout.quoteCache import quote_cache
+from src.backend.checkout.responseCache import response_cache
+from src.backend.dao.singleFlight import single_flight
+
+_registered = False
+
+
+POOL_GAUGES = ("size", "in_use", "idle", "max_size")
+QUOTE_CACHE_GAUGES = ("size", "capacity")
+RESPONSE_CACHE_GAUGES = ("bytes",)
+
+
+def _reading(prefix: str, description: str, stat: str, values: dict, gauges: tuple) -> tuple:
+    """
+    Stats not listed in gauges only ever grow and are exported as counters named *_total
+    """
+    if stat in gauges:
+        return f"{prefix}_{stat}", f"{description} {stat.replace('_', ' ')}", values, "gauge"
+    stat = stat.removesuffix("_total")
+    return f"{prefix}_{stat}_total", f"{description} {stat.replace('_', ' ')}", values, "counter"
+
+
+def pool_readings():
+    readings = {}
+    for dbpath, pool in list(DBConnectionFactory._pools.items()):
+        for stat, value in pool.stats().items():
+            readings.setdefault(stat, {})[(("dbpath", dbpath),)] = value
+    return [_reading("db_pool", "Connection pool", stat, values, gauges=POOL_GAUGES) for stat, values in readings.items()]
+
+
+def quote_cache_readings():
+    return [_reading("quote_cache", "Quote cache", stat, {(): value}, gauges=QUOTE_CACHE_GAUGES)
+            for stat, value in quote_cache.stats().items()]
+
+
+def response_cache_readings():
+    return [_reading("response_cache", "Response cache", stat, {(): value}, gauges=RESPONSE_CACHE_GAUGES)
+            for stat, value in response_cache.stats().items()]
+
+
+def single_flight_readings():
+    stats = single_flight.stats()
+    by_key = {(("table", key[1]), ("key", f"{key[2]}={key[3]}")): count for key, count in stats["top_keys"]}
+    return [
+        ("db_lookups_total", "Item lookups that ran a query", {(): stats["calls"]}, "counter"),
+        ("db_lookups_coalesced_total", "Item lookups that shared another caller's in-flight query", {(): stats["coalesced"]}, "counter"),
+        ("db_lookups_in_flight", "Item lookup queries currently running", {(): stats["in_flight"]}, "gauge"),
+        ("db_lookups_coalesced_by_key_total", "Coalesced lookups for the most coalesced keys", by_key, "counter"),
+    ]
+
+
+def register_default_collectors():
+    """
+    Adds pool, quote cache, response cache and lookup coalescing readings to the registry, safe to call more than once
+    """
+    global _registered
+    if _registered:
+        return
+    registry.add_collector(pool_readings)
+    registry.add_collector(quote_cache_readings)
+    registry.add_collector(response_cache_readings)
+    registry.add_collector(single_flight_readings)
+    _registered = True
@@ -0,0 +1,40 @@
+import time
+from src.backend.metrics.metrics import REQUEST_LATENCY, REQUESTS_IN_FLIGHT, REQUEST_ERRORS
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware recording latency, in-flight requests and errors per route
+
+    Routes are labelled by their path template (e.g. /checkout/prices/{priceid}) so
+    label cardinality stays bounded; unmatched paths share a single label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        in_flight = REQUESTS_IN_FLIGHT.labels()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            route = scope.get("route")
+            route_label = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.observe(elapsed, scope["method"], route_label, str(status))
+            if status >= 400:
+                REQUEST_ERRORS.inc(scope["method"], route_label, str(status))
@@ -0,0 +1,149 @@
+import asyncio
+import cProfile
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from src.backend.config.configService import ProfilingConfig
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+class StackSampler:
+    """
+    Periodically samples the stacks of the event loop thread and the db executor threads
+
+    Produces collapsed stacks ("outer;inner count" per line) that flamegraph tools read.
+    Unlike cProfile this also sees the ReadDao queries running in the executor, but
+    those threads are shared, so under concurrency some samples belong to other requests.
+    """
+
+    def __init__(self, interval: float, loop_thread_id: int, thread_prefix: str = "db"):
+        self.interval = interval
+        self.loop_thread_id = loop_thread_id
+        self.thread_prefix = thread_prefix
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _targets(self) -> set:
+        targets = {self.loop_thread_id}
+        for thread in threading.enumerate():
+            if thread.name.startswith(self.thread_prefix):
+                targets.add(thread.ident)
+        return targets
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self._targets():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Plain ASGI middleware profiling selected requests
+
+    A request is profiled when it carries the configured header with the configured
+    token, or when it is picked by sample_rate. The result is written to output_dir as
+    <request id>.pstats (cProfile) or <request id>.collapsed (sampling) and the request
+    id is returned in the X-Request-ID header. Only one request is profiled at a time;
+    others arriving meanwhile are served normally.
+
+    Only install this when profiling is enabled, so disabled means no per-request cost.
+    """
+
+    def __init__(self, app, config: ProfilingConfig):
+        self.app = app
+        self.config = config
+        self.header = config.header.lower().encode("latin-1")
+        self.token = config.token.encode("latin-1")
+        self.logger = logging.getLogger()
+        self._active = False
+        os.makedirs(config.output_dir, exist_ok=True)
+
+    def _selected(self, scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == self.header:
+                    return hmac.compare_digest(value, self.token)
+        return self.config.sample_rate > 0 and random.random() < self.config.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = uuid.uuid4().hex
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+                break
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (REQUEST_ID_HEADER, request_id.encode("latin-1"))]
+            await send(message)
+
+        self._active = True
+        try:
+            if self.config.mode == "sampling":
+                await self._sample(scope, receive, send_wrapper, request_id)
+            else:
+                await self._cprofile(scope, receive, send_wrapper, request_id)
+        finally:
+            self._active = False
+
+    async def _cprofile(self, scope, receive, send, request_id: str):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            path = self._path(request_id, "pstats")
+            await asyncio.to_thread(profiler.dump_stats, path)
+            self.logger.info(f"Profiled {scope['method']} {scope['path']} as {path}")
+
+    async def _sample(self, scope, receive, send, request_id: str):
+        sampler = StackSampler(interval=self.config.sample_interval, loop_thread_id=threading.get_ident())
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+            path = self._path(request_id, "collapsed")
+            await asyncio.to_thread(self._write, path, sampler.collapsed())
+            self.logger.info(f"Profiled {scope['method']} {scope['path']} as {path}")
+
+    def _path(self, request_id: str, extension: str) -> str:
+        safe_id = "".join(c for c in request_id if c.isalnum() or c in "-_")[:64] or uuid.uuid4().hex
+        return os.path.join(self.config.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_id}.{extension}")
+
+    @staticmethod
+    def _write(path: str, content: str):
+        with open(path, "w") as file:
+            file.write(content)
@@ -0,0 +1,76 @@
+import random
+import numpy as np
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.backend.checkout.batchPricing import CatalogArrays, arrays_for_snapshot, price_baskets
+from src.backend.checkout.functions import CheckoutItem, calculate_catalog_total
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.dao.catalogSnapshot import CatalogSnapshot
+from main import app
+
+
+ITEMS = {
+    "A": CatalogItem(code="A", price=50, offers=((3, 140),)),
+    "B": CatalogItem(code="B", price=35, offers=((2, 60),)),
+    "C": CatalogItem(code="C", price=25),
+    "T": CatalogItem(code="T", price=50, offers=((3, 140), (10, 450))),
+}
+
+
+def basket(*lines):
+    return [CheckoutItem(code=code, quant=quant) for code, quant in lines]
+
+
+def test_price_baskets():
+    catalog = CatalogArrays(ITEMS)
+    baskets = [
+        basket(("A", 4), ("C", 1)),
+        basket(("B", 5)),
+        basket(("X", 3)),
+        basket(),
+        basket(("T", 13), ("A", 0)),
+    ]
+    assert price_baskets(baskets=baskets, catalog=catalog) == [215, 155, 0, 0, 590]
+
+
+def test_matches_scalar_pricing():
+    rng = random.Random(7)
+    catalog = CatalogArrays(ITEMS)
+    codes = list(ITEMS) + ["X"]
+    baskets = [basket(*[(rng.choice(codes), rng.randint(-2, 40)) for _ in range(rng.randint(0, 8))]) for _ in range(200)]
+    expected = [sum(calculate_catalog_total(ITEMS[line.code], line.quant) for line in b if line.code in ITEMS) for b in baskets]
+    assert price_baskets(baskets=baskets, catalog=catalog) == expected
+
+
+def test_huge_quantities_do_not_overflow():
+    catalog = CatalogArrays(ITEMS)
+    baskets = [basket(("B", 10 ** 18)), basket(("A", 10 ** 20), ("C", -(10 ** 19))), basket(("T", 2 ** 62), ("X", 10 ** 30))]
+    expected = [sum(calculate_catalog_total(ITEMS[line.code], line.quant) for line in b if line.code in ITEMS) for b in baskets]
+    assert price_baskets(baskets=baskets, catalog=catalog) == expected
+    assert expected[0] == 30000000000000000000
+
+
+def test_empty_catalog():
+    assert price_baskets(baskets=[basket(("A", 1))], catalog=CatalogArrays({})) == [0]
+
+
+def test_arrays_cached_per_snapshot_version():
+    snapshot = CatalogSnapshot(version="v1", items=ITEMS)
+    arrays = arrays_for_snapshot(snapshot)
+    assert arrays_for_snapshot(snapshot) is arrays
+    assert isinstance(arrays.prices, np.ndarray)
+    assert arrays_for_snapshot(CatalogSnapshot(version="v2", items=ITEMS)) is not arrays
+
+
+@patch('src.backend.dao.catalogBackend.ReadDao')
+def test_batch_endpoint(mock_read_dao):
+    mock_dao_instance = MagicMock()
+    mock_read_dao.return_value = mock_dao_instance
+    mock_dao_instance.get_items_and_offers = AsyncMock(return_value={"A": ITEMS["A"], "C": ITEMS["C"]})
+
+    client = TestClient(app)
+    payload = [[{"code": "A", "quant": 3}], [{"code": "A", "quant": 1}, {"code": "C", "quant": 2}], []]
+    r = client.post("/checkout/batch", json=payload)
+    assert r.status_code == 200
+    assert r.json() == {"message": "Batch checkout complete", "totals": [140, 100, 0]}
+    mock_dao_instance.get_items_and_offers.assert_awaited_once()
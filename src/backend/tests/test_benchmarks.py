@@ -0,0 +1,27 @@
+import sqlite3
+from src.backend.benchmarks.catalogGenerator import generate_catalog, generate_csvs
+from src.backend.benchmarks.runBenchmarks import compare
+
+
+def test_generate_catalog(tmp_path):
+    dbpath = generate_catalog(out_dir=str(tmp_path), skus=25)
+    con = sqlite3.connect(dbpath)
+    assert con.execute("SELECT COUNT(*) FROM prices").fetchone() == (25,)
+    assert con.execute("SELECT COUNT(*) FROM offers WHERE code NOT IN (SELECT code FROM prices)").fetchone() == (0,)
+    con.close()
+
+
+def test_generator_is_deterministic(tmp_path):
+    first = generate_csvs(out_dir=str(tmp_path / "a"), skus=50)
+    second = generate_csvs(out_dir=str(tmp_path / "b"), skus=50)
+    for left, right in zip(first, second):
+        assert open(left).read() == open(right).read()
+
+
+def test_compare_flags_regressions():
+    results = {"fast": {"p50_us": 10.0}, "slow": {"p50_us": 30.0}, "new": {"p50_us": 5.0}}
+    baseline = {"fast": {"p50_us": 10.0}, "slow": {"p50_us": 20.0}}
+    regressions = compare(results=results, baseline=baseline, max_regression=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow")
+    assert results["slow"]["ratio"] == 1.5
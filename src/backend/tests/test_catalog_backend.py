@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+import sqlite3
+import pytest
+from fastapi.testclient import TestClient
+from src.backend.config.configService import AppConfig, get_config
+from src.backend.checkout.functions import CheckoutItem, get_total, get_totals
+from src.backend.dao.catalogBackend import (CatalogBackend, MemoryCatalogBackend, SqliteCatalogBackend, clear_backends,
+                                            get_backend)
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.dao.daoRoutines import DaoRoutines
+from src.backend.dao.mmapCatalog import build_from_database
+from src.backend.database.catalogImport import import_catalog
+from main import app
+
+PRICES = [{"id": 1, "code": "A", "price": 50}, {"id": 2, "code": "B", "price": 35}, {"id": 3, "code": "C", "price": 25}]
+OFFERS = [{"id": 1, "code": "A", "amount": 3, "offerprice": 140}, {"id": 2, "code": "B", "amount": 2, "offerprice": 60}]
+PRICING = {
+    "A": {"price": 50, "offer": {"amount": 3, "price": 140}},
+    "B": {"price": 35, "offer": {"amount": 2, "price": 60}},
+    "C": {"price": 25},
+}
+
+
+@pytest.fixture
+def catalog_files(tmp_path):
+    (tmp_path / "prices.csv").write_text("id,code,price\n1,A,50\n2,B,35\n3,C,25\n")
+    (tmp_path / "offers.csv").write_text("id,code,amount,offerprice\n1,A,3,140\n2,B,2,60\n")
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=str(tmp_path / "prices.csv"), offers_path=str(tmp_path / "offers.csv"))
+    json_path = tmp_path / "pricing.json"
+    json_path.write_text(json.dumps(PRICING))
+    build_from_database(dbpath=dbpath, path=str(tmp_path / "catalog.bin"))
+    yield dbpath, str(json_path)
+    clear_backends()
+
+
+def config_for(kind, dbpath, json_path, **catalog):
+    mmap_path = os.path.join(os.path.dirname(dbpath), "catalog.bin")
+    return AppConfig.from_dict({"dbpath": dbpath, "catalog": {"backend": kind, "json_path": json_path, "mmap_path": mmap_path, **catalog}})
+
+
+@pytest.fixture(params=["sqlite", "json", "memory", "columnar", "mmap"])
+def backend(request, catalog_files):
+    return get_backend(config=config_for(request.param, *catalog_files))
+
+
+@pytest.mark.asyncio
+async def test_backends_agree(backend):
+    assert isinstance(backend, CatalogBackend)
+    assert await backend.get_item("A") == CatalogItem(code="A", price=50, offers=((3, 140),))
+    assert await backend.get_item("X") is None
+    assert await backend.get_items(["B", "X", "C", "B"]) == {"B": CatalogItem(code="B", price=35, offers=((2, 60),)),
+                                                            "C": CatalogItem(code="C", price=25)}
+    assert await backend.get_all("prices") == PRICES
+    assert await backend.get_all("offers") == OFFERS
+    assert await backend.get_by_id("prices", 2) == [PRICES[1]]
+    rows = []
+    async for columns, chunk in await backend.stream_all("offers", chunk_size=1):
+        rows += [dict(zip(columns, row)) for row in chunk]
+    assert rows == OFFERS
+
+
+@pytest.mark.asyncio
+async def test_missing_table_raises(backend):
+    with pytest.raises(Exception):
+        await backend.get_all("nothing")
+
+
+def test_get_backend_selection(catalog_files):
+    assert isinstance(get_backend(config=config_for("sqlite", *catalog_files)), SqliteCatalogBackend)
+    json_backend = get_backend(config=config_for("json", *catalog_files))
+    assert isinstance(json_backend, DaoRoutines)
+    assert get_backend(config=config_for("json", *catalog_files)) is json_backend
+    memory = get_backend(config=config_for("memory", *catalog_files, memory_source="json"))
+    assert isinstance(memory, MemoryCatalogBackend)
+    assert isinstance(memory.source, DaoRoutines)
+    assert isinstance(get_backend(config=config_for("columnar", *catalog_files)).source, SqliteCatalogBackend)
+    with pytest.raises(ValueError):
+        get_backend(config=config_for("redis", *catalog_files))
+
+
+@pytest.mark.asyncio
+async def test_json_backend_offer_tiers_and_latency(tmp_path):
+    path = tmp_path / "pricing.json"
+    path.write_text(json.dumps({"A": {"price": 50, "offers": [{"amount": 3, "price": 140}, {"amount": 6, "price": 270}]}}))
+    backend = DaoRoutines(path=str(path), latency=0, bulk_latency=0)
+    assert (await backend.get_item("A")).offers == ((3, 140), (6, 270))
+    assert len(await backend.get_all("offers")) == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_from_rows():
+    backend = MemoryCatalogBackend(prices=PRICES, offers=OFFERS)
+    assert (await backend.get_item("C")).price == 25
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["sqlite", "json", "memory", "columnar", "mmap"])
+async def test_checkout_through_each_backend(catalog_files, kind):
+    catalog_store.clear()
+    config = config_for(kind, *catalog_files)
+    assert await get_total(CheckoutItem(code="A", quant=4), config=config) == 190
+    assert await get_totals([CheckoutItem(code="B", quant=2), CheckoutItem(code="X", quant=1)], config=config) == [60, 0]
+    snapshot = await catalog_store.load(config=config)
+    try:
+        assert len(snapshot) == 3
+        assert await get_total(CheckoutItem(code="C", quant=2), config=config) == 50
+    finally:
+        catalog_store.clear()
+
+
+def set_price_of_c(kind, catalog_files, price):
+    dbpath, json_path = catalog_files
+    if kind == "json":
+        with open(json_path, "w") as f:
+            json.dump({**PRICING, "C": {"price": price}}, f)
+        return
+    con = sqlite3.connect(dbpath)
+    con.execute("UPDATE prices SET price = ? WHERE code = 'C'", (price,))
+    con.commit()
+    con.close()
+
+
+@pytest.mark.parametrize("kind, source", [("memory", "sqlite"), ("columnar", "sqlite"), ("json", "json"), ("memory", "json"),
+                                          ("columnar", "json")])
+def test_reload_route_rereads_copied_catalogs(catalog_files, kind, source):
+    config = config_for(kind, *catalog_files, memory_source=source)
+    app.dependency_overrides[get_config] = lambda: config
+    try:
+        client = TestClient(app)
+        assert client.post("/checkout/", json={"C": 1}).json()["total"] == 25
+        set_price_of_c(source, catalog_files, 30)
+        r = client.post("/checkout/catalog/reload")
+        assert r.status_code == 200
+        assert r.json()["items"] == 3
+        assert client.post("/checkout/", json={"C": 1}).json()["total"] == 30
+        assert asyncio.run(get_backend(config=config).get_item("C")).price == 30
+    finally:
+        app.dependency_overrides.clear()
+        catalog_store.clear()
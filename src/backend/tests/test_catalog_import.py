@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import pytest
+from src.backend.config.configService import AppConfig
+from src.backend.dao.catalogSnapshot import CatalogStore
+from src.backend.database.catalogImport import import_catalog, read_chunks
+from src.backend.database.connectionPool import ConnectionPool
+
+
+def write_csv(path, lines):
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def csvs(tmp_path):
+    prices = write_csv(tmp_path / "prices.csv", ["id,code,price", "1,A,50", "2,B,35", "3,C,25"])
+    offers = write_csv(tmp_path / "offers.csv", ["id,code,amount,offerprice", "1,A,3,140", "2,B,2,60"])
+    return prices, offers
+
+
+def rows(dbpath, query):
+    con = sqlite3.connect(dbpath)
+    try:
+        return con.execute(query).fetchall()
+    finally:
+        con.close()
+
+
+def test_import_creates_keyed_tables(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    assert import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1]) == {"prices": 3, "offers": 2}
+    assert rows(dbpath, "SELECT code, price FROM prices ORDER BY code") == [("A", 50), ("B", 35), ("C", 25)]
+    assert ("prices_code",) in rows(dbpath, "SELECT name FROM sqlite_master WHERE type='index'")
+    assert ("offers_code_amount",) in rows(dbpath, "SELECT name FROM sqlite_master WHERE type='index'")
+    assert [name for name in os.listdir(tmp_path) if name.startswith(".catalog-")] == []
+
+
+def test_rerun_is_idempotent(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    assert rows(dbpath, "SELECT COUNT(*) FROM prices") == [(3,)]
+    assert rows(dbpath, "SELECT COUNT(*) FROM offers") == [(2,)]
+
+
+def test_upsert_updates_and_keeps_offer_tiers(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    prices = write_csv(tmp_path / "update.csv", ["code,price,id", "A,55,1", "D,12,4"])
+    offers = write_csv(tmp_path / "tiers.csv", ["id,code,amount,offerprice", "1,A,3,150", "3,A,6,270"])
+    import_catalog(dbpath=dbpath, prices_path=prices, offers_path=offers, chunk_size=1)
+    assert rows(dbpath, "SELECT code, price FROM prices ORDER BY code") == [("A", 55), ("B", 35), ("C", 25), ("D", 12)]
+    assert rows(dbpath, "SELECT code, amount, offerprice FROM offers ORDER BY code, amount") == [
+        ("A", 3, 150), ("A", 6, 270), ("B", 2, 60)]
+
+
+def test_reimport_changed_tier_and_moved_ids(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    prices = write_csv(tmp_path / "moved.csv", ["id,code,price", "2,D,12", "5,B,35"])
+    offers = write_csv(tmp_path / "changed.csv", ["id,code,amount,offerprice", "1,A,4,180"])
+    import_catalog(dbpath=dbpath, prices_path=prices, offers_path=offers, chunk_size=1)
+    assert rows(dbpath, "SELECT id, code, price FROM prices ORDER BY id") == [(1, "A", 50), (2, "D", 12), (3, "C", 25),
+                                                                            (5, "B", 35)]
+    # A's 3 for 140 tier is gone because the file lists A's tiers, B is not in the file so keeps its offer
+    assert rows(dbpath, "SELECT id, code, amount, offerprice FROM offers ORDER BY id") == [(1, "A", 4, 180), (2, "B", 2, 60)]
+
+
+def test_fresh_replaces_catalog(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    prices = write_csv(tmp_path / "only.csv", ["id,code,price", "9,Z,1"])
+    import_catalog(dbpath=dbpath, prices_path=prices, offers_path=None, fresh=True)
+    assert rows(dbpath, "SELECT code FROM prices") == [("Z",)]
+    assert rows(dbpath, "SELECT COUNT(*) FROM offers") == [(0,)]
+
+
+@pytest.mark.parametrize("in_place", [False, True])
+def test_legacy_tables_are_rebuilt_without_duplicates(tmp_path, csvs, in_place):
+    dbpath = str(tmp_path / "legacy.db")
+    con = sqlite3.connect(dbpath)
+    con.execute('CREATE TABLE "prices" ("id" INTEGER, "code" TEXT, "price" INTEGER)')
+    con.execute('CREATE TABLE "offers" ("id" INTEGER, "code" TEXT, "amount" INTEGER, "offerprice" INTEGER)')
+    con.executemany("INSERT INTO prices VALUES (?, ?, ?)", [(1, "A", 50), (1, "A", 50), (5, "E", 7)])
+    con.commit()
+    con.close()
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1], in_place=in_place)
+    assert rows(dbpath, "SELECT code FROM prices ORDER BY code") == [("A",), ("B",), ("C",), ("E",)]
+
+
+def test_bad_csv_leaves_database_untouched(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    bad = write_csv(tmp_path / "bad.csv", ["id,code,amount", "3,C,2"])
+    with pytest.raises(ValueError):
+        import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=bad)
+    assert rows(dbpath, "SELECT COUNT(*) FROM offers") == [(2,)]
+    assert [name for name in os.listdir(tmp_path) if name.startswith(".catalog-")] == []
+
+
+def test_read_chunks_splits_rows(csvs):
+    chunks = list(read_chunks(csvs[0], ("code", "price"), chunk_size=2))
+    assert chunks == [[["A", "50"], ["B", "35"]], [["C", "25"]]]
+
+
+def test_open_readers_keep_old_file_and_pool_moves_on(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    pool = ConnectionPool(dbpath=dbpath, max_size=2, file_check_interval=0)
+    old = pool.acquire()
+    prices = write_csv(tmp_path / "update.csv", ["id,code,price", "1,A,99"])
+    import_catalog(dbpath=dbpath, prices_path=prices, offers_path=None)
+    assert old.execute("SELECT price FROM prices WHERE code='A'").fetchone() == (50,)
+    pool.release(old)
+    new = pool.acquire()
+    assert new is not old
+    assert new.execute("SELECT price FROM prices WHERE code='A'").fetchone() == (99,)
+    pool.release(new)
+    assert pool.stats()["file_replacements"] == 1
+    pool.close_all()
+
+
+@pytest.mark.asyncio
+async def test_catalog_store_notices_replaced_file(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    config = AppConfig.from_dict({"dbpath": dbpath, "catalog": {"refresh_interval": 0}, "pool": {"file_check_interval": 0}})
+    store = CatalogStore()
+    first = await store.load(config=config)
+    prices = write_csv(tmp_path / "update.csv", ["id,code,price", "1,A,99"])
+    import_catalog(dbpath=dbpath, prices_path=prices, offers_path=None)
+    current = await store.current(config=config)
+    assert current.version != first.version
+    assert current.get("A").price == 99
+    store.clear()
+
+
+def test_fresh_in_place_reapplies_migrations(tmp_path, csvs):
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=csvs[1])
+    import_catalog(dbpath=dbpath, prices_path=csvs[0], offers_path=None, fresh=True, in_place=True)
+    assert rows(dbpath, "SELECT COUNT(*) FROM prices") == [(3,)]
+    assert ("offers_code_amount_offerprice",) in rows(dbpath, "SELECT name FROM sqlite_master WHERE type='index'")
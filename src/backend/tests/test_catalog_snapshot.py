@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import AsyncMock, patch, MagicMock
+from src.backend.dao.catalogSnapshot import CatalogItem, CatalogSnapshot, CatalogStore, catalog_store
+from src.backend.checkout.functions import CheckoutItem, get_total
+
+
+PRICES = [
+    {"id": 1, "code": "A", "price": 50},
+    {"id": 2, "code": "B", "price": 35},
+    {"id": 3, "code": "C", "price": 25},
+]
+OFFERS = [
+    {"id": 1, "code": "A", "amount": 3, "offerprice": 140},
+    {"id": 2, "code": "B", "amount": 2, "offerprice": 60},
+]
+
+
+@pytest.fixture
+def loaded_store():
+    catalog_store._snapshot = CatalogSnapshot.from_rows(prices=PRICES, offers=OFFERS)
+    yield catalog_store
+    catalog_store.clear()
+
+
+def test_from_rows_builds_items():
+    snapshot = CatalogSnapshot.from_rows(prices=PRICES, offers=OFFERS)
+    assert len(snapshot) == 3
+    assert snapshot.get("A") == CatalogItem(code="A", price=50, offers=((3, 140),))
+    assert snapshot.get("C").offers == ()
+    assert snapshot.get("X") is None
+
+
+def test_version_follows_data():
+    first = CatalogSnapshot.from_rows(prices=PRICES, offers=OFFERS)
+    same = CatalogSnapshot.from_rows(prices=list(PRICES), offers=list(OFFERS))
+    changed = CatalogSnapshot.from_rows(prices=PRICES[:2], offers=OFFERS)
+    assert first.version == same.version
+    assert first.version != changed.version
+
+
+@pytest.mark.asyncio
+@patch('src.backend.dao.catalogBackend.ReadDao')
+async def test_store_load_swaps_snapshot(mock_read_dao):
+    mock_dao_instance = MagicMock()
+    mock_read_dao.return_value = mock_dao_instance
+    mock_dao_instance.get_all_items = AsyncMock(side_effect=[PRICES, OFFERS, PRICES[:1], OFFERS])
+
+    store = CatalogStore()
+    assert not store.is_loaded
+    first = await store.load()
+    assert store.snapshot is first
+    second = await store.reload()
+    assert store.snapshot is second
+    assert len(second) == 1
+    assert first.version != second.version
+    assert all(item.plan is not None for item in first.items.values())
+
+
+@pytest.mark.asyncio
+@patch('src.backend.dao.catalogBackend.ReadDao')
+async def test_get_total_uses_snapshot(mock_read_dao, loaded_store):
+    total = await get_total(CheckoutItem(code="A", quant=4))
+    assert total == 190
+    mock_read_dao.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_total_unknown_in_snapshot(loaded_store):
+    total = await get_total(CheckoutItem(code="X", quant=2))
+    assert total == 0
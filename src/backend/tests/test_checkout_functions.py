@@ -1,7 +1,8 @@
 import pytest
 import pandas as pd
 from unittest.mock import AsyncMock, patch, MagicMock
-from src.backend.checkout.functions import get_item_data, CheckoutItem, get_total, calculate_total, calculate_total_with_offer
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.checkout.functions import get_item_data, CheckoutItem, get_total, get_totals, calculate_total, calculate_total_with_offer, normalize_basket
 
 
 @pytest.mark.asyncio
@@ -11,7 +12,7 @@ async def test_get_item_data_empty():
 
 
 @pytest.mark.asyncio
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.dao.catalogBackend.ReadDao')
 async def test_get_item_data_existing(mock_read_dao):
     """Test get_item_data returns DataFrame with price"""
     mock_dao_instance = MagicMock()
@@ -40,7 +41,7 @@ async def test_get_total_unknown():
 
 
 @pytest.mark.asyncio
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.dao.catalogBackend.ReadDao')
 async def test_get_total_known(mock_read_dao):
     """Test get_total with known item 'a'"""
     mock_dao_instance = MagicMock()
@@ -60,7 +61,7 @@ async def test_get_total_known(mock_read_dao):
 
 
 @pytest.mark.asyncio
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.dao.catalogBackend.ReadDao')
 async def test_get_total_with_offer(mock_read_dao):
     """Test item 'a' with quantity for special offer (3 items)"""
     mock_dao_instance = MagicMock()
@@ -80,7 +81,7 @@ async def test_get_total_with_offer(mock_read_dao):
 
 
 @pytest.mark.asyncio
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.dao.catalogBackend.ReadDao')
 async def test_get_total_with_offer_and_remainder(mock_read_dao):
     """Test item 'a' with quantity more than offer (4 items = 1 offer + 1 regular)"""
     mock_dao_instance = MagicMock()
@@ -100,7 +101,7 @@ async def test_get_total_with_offer_and_remainder(mock_read_dao):
 
 
 @pytest.mark.asyncio
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.dao.catalogBackend.ReadDao')
 async def test_get_total_with_multiple_offers(mock_read_dao):
     """Test item 'a' with quantity for multiple offers (6 items = 2 offers)"""
     mock_dao_instance = MagicMock()
@@ -120,7 +121,7 @@ async def test_get_total_with_multiple_offers(mock_read_dao):
 
 
 @pytest.mark.asyncio
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.dao.catalogBackend.ReadDao')
 async def test_get_total_item_without_offer(mock_read_dao):
     """Test item 'c' which has no special offer"""
     mock_dao_instance = MagicMock()
@@ -179,3 +180,83 @@ def test_calculate_total_with_offer_multiple():
     total = calculate_total_with_offer(item_data=item_data, quant=5)
     assert total == 155  # (60 * 2) + (35 * 1) - two offers plus one regular price
 
+
+@pytest.mark.asyncio
+@patch('src.backend.dao.catalogBackend.ReadDao')
+async def test_get_totals_single_batched_lookup(mock_read_dao):
+    """Test get_totals prices the whole basket from one batched lookup"""
+    mock_dao_instance = MagicMock()
+    mock_read_dao.return_value = mock_dao_instance
+    
+    mock_dao_instance.get_items_and_offers = AsyncMock(return_value={
+        'a': CatalogItem(code='a', price=50, offers=((3, 140),)),
+        'c': CatalogItem(code='c', price=25),
+    })
+    
+    items = [CheckoutItem(code="a", quant=4), CheckoutItem(code="c", quant=2), CheckoutItem(code="a", quant=1), CheckoutItem(code="x", quant=1)]
+    totals = await get_totals(items)
+    
+    assert totals == [190, 50, 50, 0]
+    mock_dao_instance.get_items_and_offers.assert_awaited_once()
+    assert mock_dao_instance.get_items_and_offers.call_args.kwargs["values"] == ["a", "c", "x"]
+
+
+@pytest.mark.asyncio
+async def test_get_totals_database():
+    """Test get_totals against the bundled database"""
+    items = [CheckoutItem(code="A", quant=3), CheckoutItem(code="B", quant=5), CheckoutItem(code="C", quant=1), CheckoutItem(code="x", quant=1)]
+    totals = await get_totals(items)
+    assert totals == [140, 155, 25, 0]
+
+
+@pytest.mark.asyncio
+async def test_get_totals_empty_basket():
+    totals = await get_totals([])
+    assert totals == []
+
+
+@pytest.mark.asyncio
+@patch('src.backend.dao.catalogBackend.ReadDao')
+async def test_get_total_with_catalog_item(mock_read_dao):
+    """Test get_total with the row path returning a CatalogItem"""
+    mock_dao_instance = MagicMock()
+    mock_read_dao.return_value = mock_dao_instance
+    mock_dao_instance.get_item_and_offer = AsyncMock(return_value=CatalogItem(code="b", price=35, offers=((2, 60),)))
+    
+    total = await get_total(CheckoutItem(code="b", quant=5))
+    assert total == 155
+
+
+def test_calculate_total_with_catalog_item():
+    item = CatalogItem(code="d", price=12)
+    assert calculate_total(item_data=item, quant=3) == 36
+
+
+def test_catalog_item_from_join_rows():
+    item = CatalogItem.from_rows([("A", 50, 3, 140)])
+    assert item == CatalogItem(code="A", price=50, offers=((3, 140),))
+    assert CatalogItem.from_rows([("C", 25, None, None)]).offers == ()
+    assert CatalogItem.from_rows([]) is None
+
+
+def test_normalize_basket_merges_lines():
+    items = [CheckoutItem(code="A", quant=1), CheckoutItem(code="B", quant=2), CheckoutItem(code="A", quant=1),
+             {"code": "A", "quant": 1}, CheckoutItem(code="C", quant=0), CheckoutItem(code="", quant=4),
+             CheckoutItem(code="D", quant=2), CheckoutItem(code="D", quant=-2)]
+    assert normalize_basket(items) == [CheckoutItem(code="A", quant=3), CheckoutItem(code="B", quant=2)]
+
+
+def test_normalize_basket_compact_forms():
+    assert normalize_basket("AABAC") == [CheckoutItem(code="A", quant=3), CheckoutItem(code="B", quant=1),
+                                         CheckoutItem(code="C", quant=1)]
+    assert normalize_basket("SKU1, SKU2 SKU1\n") == [CheckoutItem(code="SKU1", quant=2), CheckoutItem(code="SKU2", quant=1)]
+    assert normalize_basket({"B": 2, "C": 0, "D": -1}) == [CheckoutItem(code="B", quant=2)]
+    assert normalize_basket("") == [] and normalize_basket([]) == [] and normalize_basket({}) == []
+
+
+@pytest.mark.asyncio
+async def test_scanned_basket_qualifies_for_offer():
+    """Three separate scans of A are priced as one line and get the 3 for 140 offer"""
+    totals = await get_totals(normalize_basket("ABAAB" * 200))
+    assert sum(totals) == 200 * 140 + 200 * 60
+    assert len(totals) == 2
@@ -1,6 +1,8 @@
+import json
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock, AsyncMock
 import pandas as pd
+from src.backend.dao.catalogItem import CatalogItem
 from main import app
 
 
@@ -11,7 +13,7 @@ def test_check_health():
     assert r.json() == {"message": "Checkout Route is working"}
 
 
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.dao.catalogBackend.ReadDao')
 def test_checkout_post(mock_read_dao):
     """Test checkout POST with mocked ReadDao"""
     mock_dao_instance = MagicMock()
@@ -24,6 +26,7 @@ def test_checkout_post(mock_read_dao):
         'offerprice': [140]
     })
     mock_dao_instance.get_item_and_offer = AsyncMock(return_value=mock_df)
+    mock_dao_instance.get_items_and_offers = AsyncMock(return_value={"A": CatalogItem(code="A", price=50, offers=((3, 140),))})
     
     client = TestClient(app)
     payload = [{"code": "A", "quant": 1}]
@@ -33,7 +36,7 @@ def test_checkout_post(mock_read_dao):
     assert data["message"] == "Checkout complete"
     assert data["total"] == 50
     
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.checkout.functions.get_backend')
 def test_prices_get(mock_read_dao):
     """Test prices GET with mocked ReadDao"""
     mock_dao_instance = MagicMock()
@@ -53,7 +56,7 @@ def test_prices_get(mock_read_dao):
     data = r.json()
     assert len(data) == 4
     
-@patch('src.backend.checkout.functions.ReadDao')
+@patch('src.backend.checkout.functions.get_backend')
 def test_prices_get(mock_read_dao):
     """Test prices GET with mocked ReadDao"""
     mock_dao_instance = MagicMock()
@@ -73,4 +76,34 @@ def test_prices_get(mock_read_dao):
     assert r.status_code == 200
     data = r.json()
     assert len(data) == 2
-    
+
+
+def test_prices_stream_flag():
+    """Test prices streamed as NDJSON with ?stream=1"""
+    client = TestClient(app)
+    r = client.get("/checkout/prices", params={"stream": 1})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = r.text.splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[0]) == {"id": 1, "code": "A", "price": 50}
+
+
+def test_offers_stream_accept_header():
+    """Test offers streamed as NDJSON when the client accepts it"""
+    client = TestClient(app)
+    r = client.get("/checkout/offers", headers={"Accept": "application/x-ndjson"})
+    assert r.status_code == 200
+    assert [json.loads(line)["code"] for line in r.text.splitlines()] == ["A", "B"]
+
+
+def test_checkout_accepts_compact_baskets():
+    """Test checkout with split lines, a {code: quantity} map and a scan string against the bundled database"""
+    client = TestClient(app)
+    split = [{"code": "A", "quant": 1}, {"code": "A", "quant": 1}, {"code": "A", "quant": 1}, {"code": "C", "quant": 0}]
+    assert client.post("/checkout/", json=split).json()["total"] == 140
+    assert client.post("/checkout/", json={"A": 3, "B": 2}).json()["total"] == 200
+    assert client.post("/checkout/", json="AABAB").json()["total"] == 200
+    r = client.post("/checkout/batch", json=[[{"code": "B", "quant": 1}, {"code": "B", "quant": 1}], {"D": 2}, "AAA"])
+    assert r.json()["totals"] == [60, 24, 140]
+    assert client.post("/checkout/", json=5).status_code == 422
@@ -0,0 +1,135 @@
+import random
+import sqlite3
+import tracemalloc
+import pytest
+from src.backend.config.configService import AppConfig
+from src.backend.checkout.batchPricing import CatalogArrays, arrays_for_snapshot, price_baskets
+from src.backend.checkout.functions import CheckoutItem, get_total
+from src.backend.checkout.pricingEngine import plan_for
+from src.backend.dao.catalogBackend import clear_backends
+from src.backend.dao.catalogItem import CatalogItem, items_from_rows
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.dao.columnarCatalog import ColumnarCatalog
+from src.backend.database.catalogImport import import_catalog
+
+PRICES = [(1, "A", 50), (2, "BB", 35), (3, "C", 25), (4, "A", 55)]
+OFFERS = [(1, "A", 6, 270), (2, "A", 3, 140), (3, "BB", 2, 60), (4, "X", 2, 1), (5, "C", None, None)]
+
+
+def generated(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    prices = [(n, f"SKU{n:06d}", rng.randint(10, 500)) for n in range(count)]
+    offers = [(n, code, rng.randint(2, 6), price * 2) for n, code, price in prices if n % 3 == 0]
+    offers += [(count + n, code, 10, price * 7) for n, code, price in prices if n % 30 == 0]
+    return prices, offers
+
+
+def test_lookups():
+    catalog = ColumnarCatalog.from_rows(prices=PRICES, offers=OFFERS)
+    assert len(catalog) == 3
+    assert list(catalog) == ["A", "BB", "C"]
+    assert catalog["A"] == CatalogItem(code="A", price=55, offers=((3, 140), (6, 270)))
+    assert catalog.get("C") == CatalogItem(code="C", price=25)
+    assert catalog.get("X") is None and catalog.get("BBB") is None and catalog.get("B") is None
+    assert "BB" in catalog and "X" not in catalog and 1 not in catalog
+    assert catalog.code_ids(["C", "X", "A"]).tolist() == [2, -1, 0]
+    assert catalog.get_many(["C", "X", "C"]) == {"C": CatalogItem(code="C", price=25)}
+    with pytest.raises(KeyError):
+        catalog["X"]
+
+
+def test_tiered_items_keep_their_plan():
+    catalog = ColumnarCatalog.from_rows(prices=PRICES, offers=OFFERS)
+    plan = plan_for(catalog["A"])
+    assert catalog.get("A") is catalog["A"]
+    assert plan_for(catalog.get_many(["A", "BB"])["A"]) is plan
+    assert [item.code for item in catalog.tiered_items()] == ["A"]
+
+
+def test_tables():
+    catalog = ColumnarCatalog.from_rows(prices=PRICES, offers=OFFERS)
+    assert list(catalog.rows("prices")) == [{"id": 4, "code": "A", "price": 55}, {"id": 2, "code": "BB", "price": 35},
+                                            {"id": 3, "code": "C", "price": 25}]
+    assert [row["id"] for row in catalog.rows("offers")] == [2, 1, 3]
+    assert catalog.rows_with_id(table="offers", id=3) == [{"id": 3, "code": "BB", "amount": 2, "offerprice": 60}]
+    assert [len(chunk) for _, chunk in catalog.chunks(table="prices", chunk_size=2)] == [2, 1]
+    with pytest.raises(ValueError):
+        list(catalog.rows("nothing"))
+
+
+def test_hash_index_finds_every_code():
+    prices, offers = generated(5000)
+    catalog = ColumnarCatalog.from_rows(prices=prices, offers=offers)
+    codes = [code for _, code, _ in prices] + [f"MISSING{n}" for n in range(500)]
+    random.Random(1).shuffle(codes)
+    expected = [int(code[3:]) if code.startswith("SKU") else -1 for code in codes]
+    assert [catalog.code_id(code) for code in codes] == expected
+    assert catalog.code_ids(codes).tolist() == expected
+    assert ColumnarCatalog.from_rows(prices=[], offers=[]).code_ids(["A"]).tolist() == [-1]
+
+
+def test_version_follows_the_data():
+    prices, offers = generated(100)
+    assert ColumnarCatalog.from_rows(prices, offers).version == ColumnarCatalog.from_rows(prices, offers).version
+    changed = [(1, prices[1][1], prices[1][2] + 1)]
+    assert ColumnarCatalog.from_rows(prices + changed, offers).version != ColumnarCatalog.from_rows(prices, offers).version
+
+
+def test_far_smaller_than_rows_and_items():
+    prices, offers = generated(20000)
+    price_rows = [dict(zip(("id", "code", "price"), row)) for row in prices]
+    offer_rows = [dict(zip(("id", "code", "amount", "offerprice"), row)) for row in offers]
+
+    def traced(build):
+        tracemalloc.start()
+        try:
+            kept = build()
+            return tracemalloc.get_traced_memory()[0], kept
+        finally:
+            tracemalloc.stop()
+
+    columnar, catalog = traced(lambda: ColumnarCatalog.from_rows(prices=price_rows, offers=offer_rows))
+    items, _ = traced(lambda: items_from_rows(prices=price_rows, offers=offer_rows))
+    rows, _ = traced(lambda: ([dict(row) for row in price_rows], [dict(row) for row in offer_rows]))
+    assert catalog.nbytes <= columnar
+    assert columnar * 2 < items
+    assert columnar * 5 < items + rows
+
+
+def test_columnar_arrays_price_like_item_arrays():
+    prices, offers = generated(300)
+    offers.append((9999, "SKU000001", 2, 10 ** 6))
+    catalog = ColumnarCatalog.from_rows(prices=prices, offers=offers)
+    rng = random.Random(5)
+    codes = list(catalog) + ["X"]
+    baskets = [[CheckoutItem(code=rng.choice(codes), quant=rng.randint(-1, 45)) for _ in range(rng.randint(0, 6))]
+               for _ in range(300)]
+    expected = price_baskets(baskets=baskets, catalog=CatalogArrays(dict(catalog.items())))
+    assert price_baskets(baskets=baskets, catalog=CatalogArrays.from_columnar(catalog)) == expected
+
+
+@pytest.fixture
+def config(tmp_path):
+    (tmp_path / "prices.csv").write_text("id,code,price\n1,A,50\n2,B,35\n")
+    (tmp_path / "offers.csv").write_text("id,code,amount,offerprice\n1,A,3,140\n2,A,10,450\n")
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=str(tmp_path / "prices.csv"), offers_path=str(tmp_path / "offers.csv"))
+    yield AppConfig.from_dict({"dbpath": dbpath, "catalog": {"backend": "columnar", "memory_source": "sqlite"}})
+    catalog_store.clear()
+    clear_backends()
+
+
+@pytest.mark.asyncio
+async def test_catalog_store_reloads_columnar_snapshot(config):
+    snapshot = await catalog_store.load(config=config)
+    assert isinstance(snapshot.items, ColumnarCatalog)
+    assert snapshot.items["A"].plan is not None
+    assert await get_total(CheckoutItem(code="A", quant=4), config=config) == 190
+    assert price_baskets([[CheckoutItem(code="B", quant=2)]], arrays_for_snapshot(snapshot)) == [70]
+    con = sqlite3.connect(config.dbpath)
+    con.execute("UPDATE prices SET price = 40 WHERE code = 'B'")
+    con.commit()
+    con.close()
+    reloaded = await catalog_store.reload(config=config)
+    assert reloaded.version != snapshot.version
+    assert await get_total(CheckoutItem(code="B", quant=1), config=config) == 40
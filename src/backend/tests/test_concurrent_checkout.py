@@ -0,0 +1,109 @@
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import patch
+from pydantic import ValidationError
+from src.backend.config.configService import AppConfig
+from src.backend.checkout.functions import CheckoutItem, get_totals
+from src.backend.dao.catalogBackend import clear_backends
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.dao.catalogSnapshot import catalog_store
+
+
+class RecordingBackend:
+    def __init__(self, failing=(), latency=0.01):
+        self.failing = failing
+        self.latency = latency
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_item(self, code):
+        self.calls.append(code)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if code in self.failing:
+                raise LookupError(f"lookup failed for {code}")
+            return CatalogItem(code=code, price=10) if code != "X" else None
+        finally:
+            self.in_flight -= 1
+
+
+def concurrent_config(max_concurrency=16, **catalog):
+    return AppConfig.from_dict({"checkout": {"resolution": "concurrent", "max_concurrency": max_concurrency}, "catalog": catalog})
+
+
+@pytest.fixture(autouse=True)
+def no_snapshot():
+    catalog_store.clear()
+    yield
+    clear_backends()
+
+
+@pytest.mark.asyncio
+async def test_latency_close_to_single_lookup(tmp_path):
+    pricing = {f"P{i}": {"price": i + 1} for i in range(20)}
+    path = tmp_path / "pricing.json"
+    path.write_text(json.dumps(pricing))
+    config = concurrent_config(backend="json", json_path=str(path), json_latency=0.05)
+    items = [CheckoutItem(code=f"P{i}", quant=2) for i in range(20)]
+    started = time.perf_counter()
+    totals = await get_totals(items, config=config)
+    elapsed = time.perf_counter() - started
+    assert totals == [(i + 1) * 2 for i in range(20)]
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_duplicate_codes_looked_up_once():
+    backend = RecordingBackend()
+    with patch("src.backend.checkout.functions.get_backend", return_value=backend):
+        items = [CheckoutItem(code=code, quant=1) for code in ["A", "B", "A", "X", "B"]]
+        assert await get_totals(items, config=concurrent_config()) == [10, 10, 10, 0, 10]
+    assert sorted(backend.calls) == ["A", "B", "X"]
+
+
+@pytest.mark.asyncio
+async def test_semaphore_bounds_in_flight_lookups():
+    backend = RecordingBackend()
+    with patch("src.backend.checkout.functions.get_backend", return_value=backend):
+        items = [CheckoutItem(code=f"C{i}", quant=1) for i in range(12)]
+        assert sum(await get_totals(items, config=concurrent_config(max_concurrency=3))) == 120
+    assert backend.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_first_failing_line_reported():
+    # C fails faster than B, the error still follows basket order
+    backend = RecordingBackend(failing=("B", "C"))
+    original = backend.get_item
+
+    async def get_item(code):
+        if code == "B":
+            await asyncio.sleep(0.02)
+        return await original(code)
+
+    backend.get_item = get_item
+    with patch("src.backend.checkout.functions.get_backend", return_value=backend):
+        items = [CheckoutItem(code=code, quant=1) for code in ["A", "B", "C"]]
+        with pytest.raises(LookupError, match="for B"):
+            await get_totals(items, config=concurrent_config())
+
+
+@pytest.mark.asyncio
+async def test_matches_batch_resolution(tmp_path):
+    path = tmp_path / "pricing.json"
+    path.write_text(json.dumps({"A": {"price": 50, "offer": {"amount": 3, "price": 140}}, "C": {"price": 25}}))
+    items = [CheckoutItem(code="A", quant=7), CheckoutItem(code="C", quant=3), CheckoutItem(code="Q", quant=1)]
+    batch = AppConfig.from_dict({"catalog": {"backend": "json", "json_path": str(path)}})
+    concurrent = concurrent_config(backend="json", json_path=str(path))
+    assert await get_totals(items, config=concurrent) == await get_totals(items, config=batch) == [330, 75, 0]
+
+
+@pytest.mark.parametrize("checkout", [{"resolution": "concurent"}, {"max_concurrency": 0}, {"max_concurrency": -4}])
+def test_bad_checkout_config_rejected(checkout):
+    with pytest.raises(ValidationError):
+        AppConfig.from_dict({"checkout": checkout})
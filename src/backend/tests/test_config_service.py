@@ -0,0 +1,78 @@
+import os
+import pytest
+from unittest.mock import patch
+from src.backend.config.configService import AppConfig, ConfigService
+from src.backend.database.dbConnectionFactory import DBConnectionFactory
+from src.backend.dao.readDao import ReadDao
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text('dbpath: "./first.db"\npool:\n  max_size: 2\n')
+    return path
+
+
+def touch_later(path, text):
+    path.write_text(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestConfigService:
+
+    def test_typed_config(self, config_path):
+        config = ConfigService(path=str(config_path)).get()
+        assert isinstance(config, AppConfig)
+        assert config.dbpath == "./first.db"
+        assert config.pool.max_size == 2
+        assert config.executor.max_workers == 8
+        assert config.raw["pool"] == {"max_size": 2}
+
+    def test_parsed_once(self, config_path):
+        service = ConfigService(path=str(config_path), check_interval=0)
+        with patch('src.backend.config.configService.yaml.load', wraps=__import__('yaml').load) as mock_load:
+            first = service.get()
+            for _ in range(10):
+                assert service.get() is first
+        assert mock_load.call_count == 1
+
+    def test_reload_on_mtime_change(self, config_path):
+        service = ConfigService(path=str(config_path), check_interval=0)
+        assert service.get().dbpath == "./first.db"
+        touch_later(config_path, 'dbpath: "./second.db"\n')
+        assert service.get().dbpath == "./second.db"
+
+    def test_mtime_not_checked_within_interval(self, config_path):
+        service = ConfigService(path=str(config_path), check_interval=60)
+        service.get()
+        touch_later(config_path, 'dbpath: "./second.db"\n')
+        assert service.get().dbpath == "./first.db"
+        service.request_reload()
+        assert service.get().dbpath == "./second.db"
+
+    def test_invalid_reload_keeps_previous(self, config_path):
+        service = ConfigService(path=str(config_path), check_interval=0)
+        service.get()
+        touch_later(config_path, "pool: [not, a, mapping\n")
+        assert service.get().dbpath == "./first.db"
+
+
+class TestConfigInjection:
+
+    @patch('builtins.open')
+    def test_factory_uses_injected_config(self, mock_file):
+        config = AppConfig.from_dict({"dbpath": ":memory:", "pool": {"max_size": 4}})
+        factory = DBConnectionFactory(config=config)
+        assert factory.dbpath == ":memory:"
+        assert factory.settings.pool.max_size == 4
+        mock_file.assert_not_called()
+
+    @patch('builtins.open')
+    def test_read_dao_uses_config_service(self, mock_file):
+        config = AppConfig.from_dict({"dbpath": ":memory:"})
+        with patch('src.backend.dao.readDao.config_service') as mock_service:
+            mock_service.get.return_value = config
+            dao = ReadDao()
+        assert dao.dao.settings is config
+        mock_file.assert_not_called()
@@ -0,0 +1,101 @@
+import pytest
+import sqlite3
+import threading
+from unittest.mock import patch, mock_open
+from src.backend.database.connectionPool import ConnectionPool
+from src.backend.database.dbConnectionFactory import DBConnectionFactory
+
+
+@pytest.fixture
+def dbpath(tmp_path):
+    path = str(tmp_path / "pool.db")
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE prices (id INTEGER, code TEXT, price INTEGER)")
+    con.execute("INSERT INTO prices VALUES (1, 'A', 50)")
+    con.commit()
+    con.close()
+    return path
+
+
+class TestConnectionPool:
+
+    def test_reuses_released_connection(self, dbpath):
+        pool = ConnectionPool(dbpath=dbpath, max_size=2)
+        con = pool.acquire()
+        pool.release(con)
+        assert pool.acquire() is con
+        stats = pool.stats()
+        assert stats["created"] == 1
+        assert stats["acquired"] == 2
+        assert stats["in_use"] == 1
+
+    def test_connection_usable_from_other_thread(self, dbpath):
+        pool = ConnectionPool(dbpath=dbpath, max_size=1)
+        con = pool.acquire()
+        result = []
+        thread = threading.Thread(target=lambda: result.append(con.execute("SELECT price FROM prices").fetchone()))
+        thread.start()
+        thread.join()
+        pool.release(con)
+        assert result == [(50,)]
+
+    def test_acquire_timeout_when_exhausted(self, dbpath):
+        pool = ConnectionPool(dbpath=dbpath, max_size=1, acquire_timeout=0.05)
+        pool.acquire()
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire()
+        stats = pool.stats()
+        assert stats["timeouts"] == 1
+        assert stats["waits"] == 1
+        assert stats["wait_time_total"] > 0
+
+    def test_waiter_gets_released_connection(self, dbpath):
+        pool = ConnectionPool(dbpath=dbpath, max_size=1, acquire_timeout=2)
+        con = pool.acquire()
+        timer = threading.Timer(0.05, pool.release, args=(con,))
+        timer.start()
+        assert pool.acquire() is con
+        assert pool.stats()["waits"] == 1
+
+    def test_unhealthy_connection_replaced(self, dbpath):
+        pool = ConnectionPool(dbpath=dbpath, max_size=1, health_check_interval=0)
+        con = pool.acquire()
+        pool.release(con)
+        con.close()
+        fresh = pool.acquire()
+        assert fresh is not con
+        assert fresh.execute("SELECT 1").fetchone() == (1,)
+        assert pool.stats()["health_check_failures"] == 1
+
+    def test_release_rolls_back_open_transaction(self, dbpath):
+        pool = ConnectionPool(dbpath=dbpath, max_size=1)
+        con = pool.acquire()
+        con.execute("INSERT INTO prices VALUES (2, 'B', 35)")
+        pool.release(con)
+        assert not con.in_transaction
+        assert pool.acquire().execute("SELECT COUNT(*) FROM prices").fetchone() == (1,)
+
+
+class TestDBConnectionFactoryPool:
+
+    @patch('yaml.load')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_pool_shared_between_factories(self, mock_file, mock_yaml_load, dbpath):
+        mock_yaml_load.return_value = {"dbpath": dbpath, "pool": {"max_size": 3}}
+        first = DBConnectionFactory()
+        second = DBConnectionFactory()
+        assert first.pool is second.pool
+        assert first.pool.max_size == 3
+
+    @patch('yaml.load')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_connection_context_returns_to_pool(self, mock_file, mock_yaml_load, dbpath):
+        mock_yaml_load.return_value = {"dbpath": dbpath}
+        factory = DBConnectionFactory()
+        with factory.connection() as con:
+            assert factory.pool_stats()["in_use"] == 1
+            data = factory.get_data(con=con, query="SELECT * FROM prices", table="prices")
+        assert len(data) == 1
+        stats = factory.pool_stats()
+        assert stats["in_use"] == 0
+        assert stats["idle"] == 1
@@ -0,0 +1,83 @@
+import sqlite3
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from src.backend.config.configService import AppConfig
+from src.backend.dao.catalogSnapshot import CatalogStore, catalog_store
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+    catalog_store.clear()
+
+
+@pytest.fixture
+def config(tmp_path):
+    dbpath = str(tmp_path / "catalog.db")
+    con = sqlite3.connect(dbpath)
+    con.execute("CREATE TABLE prices (id INTEGER, code TEXT, price INTEGER)")
+    con.execute("CREATE TABLE offers (id INTEGER, code TEXT, amount INTEGER, offerprice INTEGER)")
+    con.execute("INSERT INTO prices VALUES (1, 'A', 50)")
+    con.commit()
+    con.close()
+    return AppConfig.from_dict({"dbpath": dbpath, "catalog": {"refresh_interval": 0}})
+
+
+def test_prices_etag_and_not_modified(client):
+    r = client.get("/checkout/prices")
+    etag = r.headers["etag"]
+    assert etag == f'"{catalog_store.snapshot.version}"'
+    assert r.headers["cache-control"] == "no-cache"
+
+    with patch('src.backend.dao.catalogBackend.ReadDao') as mock_read_dao:
+        r = client.get("/checkout/prices", headers={"If-None-Match": etag})
+        mock_read_dao.assert_not_called()
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+
+
+def test_stale_etag_gets_full_response(client):
+    r = client.get("/checkout/offers", headers={"If-None-Match": '"stale"'})
+    assert r.status_code == 200
+    assert len(r.json()) == 2
+
+
+def test_stream_has_own_etag(client):
+    json_etag = client.get("/checkout/prices").headers["etag"]
+    stream_etag = client.get("/checkout/prices", params={"stream": 1}).headers["etag"]
+    assert json_etag != stream_etag
+    r = client.get("/checkout/prices", params={"stream": 1}, headers={"If-None-Match": f'W/{stream_etag}'})
+    assert r.status_code == 304
+
+
+def test_single_item_routes(client):
+    r = client.get("/checkout/prices/1")
+    assert r.json() == [{"id": 1, "code": "A", "price": 50}]
+    assert client.get("/checkout/offer/1", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+
+def test_no_etag_without_snapshot():
+    r = TestClient(app).get("/checkout/prices")
+    assert r.status_code == 200
+    assert "etag" not in r.headers
+
+
+@pytest.mark.asyncio
+async def test_store_reloads_after_external_write(config):
+    store = CatalogStore()
+    first = await store.load(config=config)
+    assert await store.current(config=config) is first
+
+    con = sqlite3.connect(config.dbpath)
+    con.execute("UPDATE prices SET price = 55 WHERE code = 'A'")
+    con.commit()
+    con.close()
+
+    second = await store.current(config=config)
+    assert second is not first
+    assert second.version != first.version
+    assert second.get("A").price == 55
+    store.clear()
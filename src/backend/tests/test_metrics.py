@@ -0,0 +1,86 @@
+import threading
+from fastapi.testclient import TestClient
+from src.backend.metrics.metrics import MetricsRegistry
+from main import app
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 5.55' in text
+
+
+def test_counter_and_gauge():
+    registry = MetricsRegistry()
+    counter = registry.counter("errors_total", "Errors", ("status",))
+    gauge = registry.gauge("in_flight", "In flight")
+    counter.inc("500")
+    counter.inc("500", amount=2)
+    gauge.labels().inc()
+    gauge.labels().dec()
+    text = registry.render()
+    assert 'errors_total{status="500"} 3' in text
+    assert "in_flight 0" in text
+
+
+def test_counter_thread_safe():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits")
+
+    def worker():
+        for _ in range(10000):
+            counter.inc()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert "hits_total 40000" in registry.render()
+
+
+def test_collector_readings():
+    registry = MetricsRegistry()
+    registry.add_collector(lambda: [("pool_in_use", "In use", {(("dbpath", "x.db"),): 2})])
+    assert 'pool_in_use{dbpath="x.db"} 2' in registry.render()
+
+
+def test_collector_counter_readings():
+    registry = MetricsRegistry()
+    registry.add_collector(lambda: [("pool_waits_total", "Waits", {(): 3}, "counter"), ("pool_idle", "Idle", {(): 1}, "gauge")])
+    text = registry.render()
+    assert "# TYPE pool_waits_total counter\npool_waits_total 3" in text
+    assert "# TYPE pool_idle gauge\npool_idle 1" in text
+
+
+def test_metrics_endpoint():
+    client = TestClient(app)
+    client.get("/checkout/prices/1")
+    client.get("/no/such/route")
+    client.post("/checkout/", json=[{"code": "A", "quant": 3}])
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    text = r.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/checkout/prices/{priceid}",status="200"}' in text
+    assert 'http_request_errors_total{method="GET",route="unmatched",status="404"}' in text
+    assert "http_requests_in_flight 1" in text
+    assert 'db_query_seconds_count{table="prices"}' in text
+    assert "db_connect_seconds_count" in text
+    assert "pricing_seconds_count" in text
+    assert "# TYPE db_pool_in_use gauge" in text
+    assert "# TYPE db_pool_acquired_total counter" in text
+    assert "# TYPE db_pool_wait_time_total counter" in text
+    assert "# TYPE quote_cache_hits_total counter" in text
+    assert "# TYPE quote_cache_size gauge" in text
+    assert "# TYPE db_lookups_coalesced_total counter" in text
+    assert "# TYPE db_lookups_in_flight gauge" in text
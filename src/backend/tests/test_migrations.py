@@ -0,0 +1,83 @@
+import os
+import sqlite3
+import pytest
+from unittest.mock import patch
+from src.backend.database import migrations
+from src.backend.database.migrations import LATEST_VERSION, migrate, migrate_database, schema_version, unindexed_queries
+
+
+@pytest.fixture
+def con():
+    con = sqlite3.connect(":memory:", isolation_level=None)
+    yield con
+    con.close()
+
+
+def legacy_tables(con):
+    con.execute('CREATE TABLE "prices" ("id" INTEGER, "code" TEXT, "price" INTEGER)')
+    con.execute('CREATE TABLE "offers" ("id" INTEGER, "code" TEXT, "amount" INTEGER, "offerprice" INTEGER)')
+    con.executemany("INSERT INTO prices VALUES (?, ?, ?)", [(1, "A", 50), (2, "B", 35), (1, "A", 50)])
+    con.executemany("INSERT INTO offers VALUES (?, ?, ?, ?)", [(1, "A", 3, 140), (1, "A", 3, 140)])
+
+
+def test_empty_database_migrated_to_latest(con):
+    assert migrate(con) == [version for version, _, _ in migrations.MIGRATIONS]
+    assert schema_version(con) == LATEST_VERSION
+    assert unindexed_queries(con) == {}
+
+
+def test_legacy_tables_scan_until_migrated(con):
+    legacy_tables(con)
+    assert set(unindexed_queries(con)) >= {"price_by_id", "price_by_code", "offer_by_code"}
+    migrate(con)
+    assert unindexed_queries(con) == {}
+    assert con.execute("SELECT id, code, price FROM prices ORDER BY id").fetchall() == [(1, "A", 50), (2, "B", 35)]
+    assert con.execute("SELECT COUNT(*) FROM offers").fetchone() == (1,)
+
+
+def test_migrate_is_idempotent(con):
+    migrate(con)
+    assert migrate(con) == []
+
+
+def test_migrate_to_target_then_rest(con):
+    assert migrate(con, target=1) == [1]
+    assert schema_version(con) == 1
+    assert migrate(con) == list(range(2, LATEST_VERSION + 1))
+
+
+def test_failed_migration_rolls_back(con):
+    def broken(con):
+        con.execute("CREATE TABLE half_done (id INTEGER)")
+        raise sqlite3.OperationalError("broken")
+
+    with patch.object(migrations, "MIGRATIONS", migrations.MIGRATIONS + [(LATEST_VERSION + 1, "broken", broken)]):
+        with pytest.raises(sqlite3.OperationalError):
+            migrate(con, target=LATEST_VERSION + 1)
+    assert schema_version(con) == LATEST_VERSION
+    assert con.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+
+
+def test_hot_queries_search_indexes(con):
+    migrate(con)
+    for name, (query, params) in migrations.HOT_QUERIES.items():
+        steps = [row[-1] for row in con.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+        assert all(step.startswith("SEARCH") for step in steps), (name, steps)
+
+
+def test_shipped_database_is_current():
+    dbpath = "./src/backend/database/shoppingitems.db"
+    assert migrate_database(dbpath) == []
+    con = sqlite3.connect(dbpath)
+    try:
+        assert schema_version(con) == LATEST_VERSION
+        assert unindexed_queries(con) == {}
+    finally:
+        con.close()
+
+
+def test_missing_database_is_not_created(tmp_path):
+    dbpath = str(tmp_path / "typo.db")
+    with pytest.raises(FileNotFoundError):
+        migrate_database(dbpath)
+    assert not os.path.exists(dbpath)
@@ -0,0 +1,89 @@
+import pytest
+from src.backend.config.configService import AppConfig
+from src.backend.checkout.batchPricing import arrays_for_snapshot, price_baskets
+from src.backend.checkout.functions import CheckoutItem, get_total
+from src.backend.checkout.pricingEngine import plan_for
+from src.backend.dao.catalogBackend import clear_backends
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.dao.mmapCatalog import MmapCatalog, MmapCatalogBackend, write_mmap_catalog
+
+PRICES = [{"id": 1, "code": "A", "price": 50}, {"id": 2, "code": "BB", "price": 35}, {"id": 3, "code": "C", "price": 25}]
+OFFERS = [{"id": 2, "code": "A", "amount": 6, "offerprice": 270}, {"id": 1, "code": "A", "amount": 3, "offerprice": 140},
+          {"id": 3, "code": "BB", "amount": 2, "offerprice": 60}]
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_mmap_catalog(path=path, prices=PRICES, offers=OFFERS)
+    yield path
+    catalog_store.clear()
+    clear_backends()
+
+
+def test_lookups_and_misses(catalog_path):
+    catalog = MmapCatalog(catalog_path)
+    assert len(catalog) == 3
+    assert list(catalog) == ["A", "BB", "C"]
+    assert catalog["A"] == CatalogItem(code="A", price=50, offers=((3, 140), (6, 270)))
+    assert catalog.get("C") == CatalogItem(code="C", price=25)
+    assert catalog.get("B") is None
+    assert catalog.get("BBB") is None
+    assert "BB" in catalog and "X" not in catalog
+    with pytest.raises(KeyError):
+        catalog["X"]
+    catalog.close()
+
+
+def test_tiered_items_keep_their_plan(catalog_path):
+    catalog = MmapCatalog(catalog_path)
+    plan = plan_for(catalog["A"])
+    assert catalog.get("A") is catalog["A"]
+    assert plan_for(catalog.get("A")) is plan
+    assert [item.code for item in catalog.tiered_items()] == ["A"]
+    catalog.close()
+
+
+def test_rows_and_version(catalog_path, tmp_path):
+    catalog = MmapCatalog(catalog_path)
+    assert list(catalog.rows("prices")) == PRICES
+    assert list(catalog.rows("offers")) == [OFFERS[1], OFFERS[0], OFFERS[2]]
+    same = write_mmap_catalog(path=str(tmp_path / "same.bin"), prices=PRICES[::-1], offers=OFFERS)
+    assert same == catalog.version
+    catalog.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        MmapCatalog(str(path))
+
+
+@pytest.mark.asyncio
+async def test_backend_picks_up_replaced_file(catalog_path):
+    backend = MmapCatalogBackend(path=catalog_path, check_interval=0)
+    old_version, old_catalog = await backend.catalog_view()
+    write_mmap_catalog(path=catalog_path, prices=[{"id": 1, "code": "A", "price": 55}], offers=[])
+    version, catalog = await backend.catalog_view()
+    assert version != old_version
+    assert await backend.get_item("A") == CatalogItem(code="A", price=55)
+    assert await backend.get_items(["A", "C"]) == {"A": CatalogItem(code="A", price=55)}
+    # lookups already holding the old mapping keep reading it
+    assert old_catalog.get("C") == CatalogItem(code="C", price=25)
+
+
+@pytest.mark.asyncio
+async def test_catalog_store_uses_the_mapping(catalog_path):
+    config = AppConfig.from_dict({"catalog": {"backend": "mmap", "mmap_path": catalog_path, "refresh_interval": 0}})
+    snapshot = await catalog_store.load(config=config)
+    assert isinstance(snapshot.items, MmapCatalog)
+    assert snapshot.items["A"].plan is not None
+    assert await get_total(CheckoutItem(code="A", quant=7), config=config) == 320
+    arrays = arrays_for_snapshot(snapshot)
+    assert price_baskets([[CheckoutItem(code="BB", quant=3)], [CheckoutItem(code="X", quant=1)]], arrays) == [95, 0]
+    write_mmap_catalog(path=catalog_path, prices=[{"id": 1, "code": "A", "price": 10}], offers=[])
+    current = await catalog_store.current(config=config)
+    assert current.version != snapshot.version
+    assert current.get("A").price == 10
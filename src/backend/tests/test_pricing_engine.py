@@ -0,0 +1,90 @@
+import random
+import pytest
+from src.backend.checkout.pricingEngine import PricingPlan, compile_plans, plan_for
+from src.backend.dao.catalogItem import CatalogItem
+
+
+def brute_force_total(price, offers, quant):
+    best = [0] + [None] * quant
+    for q in range(1, quant + 1):
+        options = [best[q - 1] + price]
+        options += [best[q - amount] + offerprice for amount, offerprice in offers if amount <= q]
+        best[q] = min(options)
+    return best[quant]
+
+
+def test_no_offer():
+    plan = PricingPlan(price=25)
+    assert plan.total(3) == 75
+    assert plan.table is None
+
+
+def test_single_offer_matches_greedy():
+    plan = PricingPlan(price=50, offers=((3, 140),))
+    assert [plan.total(q) for q in range(8)] == [0, 50, 100, 140, 190, 240, 280, 330]
+    assert plan.table is None
+
+
+def test_tiered_offers_pick_cheapest_combination():
+    plan = PricingPlan(price=50, offers=((3, 140), (10, 450)))
+    assert plan.total(10) == 450
+    assert plan.total(13) == 590
+    assert plan.total(9) == 420
+
+
+def test_unprofitable_offer_ignored():
+    plan = PricingPlan(price=10, offers=((3, 40),))
+    assert plan.tiers == ()
+    assert plan.total(3) == 30
+
+
+def test_bulk_quantity_is_constant_time():
+    plan = PricingPlan(price=50, offers=((3, 140), (10, 450)))
+    assert plan.total(10**12) == 45 * 10**12
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    price = rng.randint(5, 60)
+    offers = tuple((rng.randint(2, 12), rng.randint(10, 600)) for _ in range(rng.randint(1, 4)))
+    plan = PricingPlan(price=price, offers=offers)
+    for quant in range(0, 300):
+        assert plan.total(quant) == brute_force_total(price, offers, quant), (price, offers, quant)
+
+
+def test_wholesale_tiers_keep_table_small():
+    price, offers = 1, ((500, 400), (1000, 700))
+    plan = PricingPlan(price=price, offers=offers)
+    assert len(plan.table) <= 1000
+    expected = brute_force_total(price, offers, 5000)
+    assert plan.total(5000) == expected == 3500
+    for quant in (499, 500, 999, 1499, 1500, 2501, 4999):
+        assert plan.total(quant) == brute_force_total(price, offers, quant), quant
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_large_bundles_match_brute_force(seed):
+    rng = random.Random(seed)
+    price = rng.randint(5, 60)
+    offers = tuple((rng.randint(20, 150), rng.randint(100, 6000)) for _ in range(rng.randint(2, 4)))
+    plan = PricingPlan(price=price, offers=offers)
+    best = [0]
+    for quant in range(1, 1500):
+        options = [best[quant - 1] + price] + [best[quant - amount] + offerprice for amount, offerprice in offers
+                                              if amount <= quant]
+        best.append(min(options))
+        assert plan.total(quant) == best[quant], (price, offers, quant)
+
+
+def test_compile_plans_skips_compiled_items():
+    items = [CatalogItem(code="A", price=50, offers=((3, 140), (10, 450))), CatalogItem(code="B", price=35)]
+    plan = plan_for(items[0])
+    assert compile_plans(items) == 1
+    assert items[0].plan is plan and items[1].plan is not None
+
+
+def test_plan_cached_on_item():
+    item = CatalogItem(code="A", price=50, offers=((3, 140),))
+    plan = plan_for(item)
+    assert plan_for(item) is plan
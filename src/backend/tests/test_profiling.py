@@ -0,0 +1,66 @@
+import os
+import pstats
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.backend.config.configService import ProfilingConfig
+from src.backend.metrics.profilingMiddleware import ProfilingMiddleware
+
+
+def make_client(**settings) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        return {"total": sum(range(10000))}
+
+    app.add_middleware(ProfilingMiddleware, config=ProfilingConfig(enabled=True, **settings))
+    return TestClient(app)
+
+
+def test_authorised_header_writes_pstats(tmp_path):
+    client = make_client(token="secret", output_dir=str(tmp_path))
+    r = client.get("/work", headers={"X-Profile": "secret"})
+    assert r.status_code == 200
+    request_id = r.headers["x-request-id"]
+    files = os.listdir(tmp_path)
+    assert len(files) == 1
+    assert files[0].endswith(f"{request_id}.pstats")
+    pstats.Stats(str(tmp_path / files[0]))
+
+
+def test_wrong_token_not_profiled(tmp_path):
+    client = make_client(token="secret", output_dir=str(tmp_path))
+    r = client.get("/work", headers={"X-Profile": "guess"})
+    assert r.status_code == 200
+    assert "x-request-id" not in r.headers
+    assert os.listdir(tmp_path) == []
+
+
+def test_header_ignored_without_token(tmp_path):
+    client = make_client(output_dir=str(tmp_path))
+    r = client.get("/work", headers={"X-Profile": ""})
+    assert "x-request-id" not in r.headers
+    assert os.listdir(tmp_path) == []
+
+
+def test_sample_rate_keeps_incoming_request_id(tmp_path):
+    client = make_client(sample_rate=1.0, output_dir=str(tmp_path))
+    r = client.get("/work", headers={"X-Request-ID": "basket-42"})
+    assert r.headers["x-request-id"] == "basket-42"
+    assert os.listdir(tmp_path)[0].endswith("basket-42.pstats")
+
+
+def test_sampling_mode_writes_collapsed_stacks(tmp_path):
+    client = make_client(sample_rate=1.0, mode="sampling", sample_interval=0.0005, output_dir=str(tmp_path))
+    r = client.get("/work")
+    files = os.listdir(tmp_path)
+    assert files[0].endswith(f"{r.headers['x-request-id']}.collapsed")
+    for line in (tmp_path / files[0]).read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack
+        assert int(count) > 0
+
+
+def test_not_installed_when_disabled():
+    from main import app
+    assert all(middleware.cls is not ProfilingMiddleware for middleware in app.user_middleware)
@@ -0,0 +1,77 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from src.backend.checkout.quoteCache import QuoteCache, quote_cache
+from src.backend.checkout.functions import CheckoutItem, get_totals
+from src.backend.dao.catalogSnapshot import CatalogSnapshot, catalog_store
+from src.backend.dao.catalogItem import CatalogItem
+
+
+def test_hit_after_miss():
+    cache = QuoteCache(capacity=4)
+    compute = MagicMock(return_value=140)
+    assert cache.get_or_compute(version="v1", code="A", quant=3, compute=compute) == 140
+    assert cache.get_or_compute(version="v1", code="A", quant=3, compute=compute) == 140
+    compute.assert_called_once()
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_least_recently_used_evicted():
+    cache = QuoteCache(capacity=2)
+    cache.get_or_compute(version="v1", code="A", quant=1, compute=lambda: 50)
+    cache.get_or_compute(version="v1", code="B", quant=1, compute=lambda: 35)
+    cache.get_or_compute(version="v1", code="A", quant=1, compute=lambda: 50)
+    cache.get_or_compute(version="v1", code="C", quant=1, compute=lambda: 25)
+    compute = MagicMock(return_value=35)
+    cache.get_or_compute(version="v1", code="B", quant=1, compute=compute)
+    compute.assert_called_once()
+    assert cache.stats()["evictions"] == 2
+
+
+def test_new_version_invalidates_everything():
+    cache = QuoteCache(capacity=4)
+    cache.get_or_compute(version="v1", code="A", quant=1, compute=lambda: 50)
+    assert cache.get_or_compute(version="v2", code="A", quant=1, compute=lambda: 55) == 55
+    stats = cache.stats()
+    assert stats["invalidations"] == 1
+    assert stats["size"] == 1
+
+
+def test_zero_capacity_disables():
+    cache = QuoteCache(capacity=0)
+    compute = MagicMock(return_value=1)
+    cache.get_or_compute(version="v1", code="A", quant=1, compute=compute)
+    cache.get_or_compute(version="v1", code="A", quant=1, compute=compute)
+    assert compute.call_count == 2
+
+
+def test_thread_safe_under_contention():
+    cache = QuoteCache(capacity=16)
+
+    def worker(offset):
+        for i in range(2000):
+            quant = (i + offset) % 32
+            assert cache.get_or_compute(version="v1", code="A", quant=quant, compute=lambda: quant * 50) == quant * 50
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()["size"] <= 16
+
+
+@pytest.mark.asyncio
+async def test_get_totals_uses_quote_cache():
+    catalog_store._snapshot = CatalogSnapshot(version="quote-test", items={"A": CatalogItem(code="A", price=50, offers=((3, 140),))})
+    quote_cache.clear()
+    try:
+        assert await get_totals([CheckoutItem(code="A", quant=3), CheckoutItem(code="A", quant=3)]) == [140, 140]
+        stats = quote_cache.stats()
+        assert stats["misses"] >= 1
+        assert stats["hits"] >= 1
+    finally:
+        catalog_store.clear()
+        quote_cache.clear()
@@ -0,0 +1,146 @@
+import pytest
+import sqlite3
+import asyncio
+import threading
+import time
+import pandas as pd
+from src.backend.dao.readDao import ReadDao
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.database.dbConnectionFactory import DBConnectionFactory
+
+
+@pytest.mark.asyncio
+async def test_get_all_items_returns_dicts():
+    items = await ReadDao().get_all_items(table="prices")
+    assert items[0] == {"id": 1, "code": "A", "price": 50}
+    assert len(items) == 4
+
+
+@pytest.mark.asyncio
+async def test_get_all_items_as_frame():
+    data = await ReadDao().get_all_items(table="offers", as_frame=True)
+    assert isinstance(data, pd.DataFrame)
+    assert len(data) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_single_item():
+    items = await ReadDao().get_single_item(table="prices", column="id", value="2")
+    assert items == [{"id": 2, "code": "B", "price": 35}]
+
+
+@pytest.mark.asyncio
+async def test_get_item_and_offer_returns_catalog_item():
+    item = await ReadDao().get_item_and_offer(table="prices", column="code", value="A")
+    assert item == CatalogItem(code="A", price=50, offers=((3, 140),))
+    assert await ReadDao().get_item_and_offer(table="prices", column="code", value="Z") is None
+
+
+@pytest.mark.asyncio
+async def test_get_items_and_offers():
+    items = await ReadDao().get_items_and_offers(table="prices", column="code", values=["C", "A", "C", "Z"])
+    assert set(items) == {"A", "C"}
+    assert items["C"] == CatalogItem(code="C", price=25)
+
+
+@pytest.mark.asyncio
+async def test_missing_table_raises():
+    with pytest.raises(sqlite3.DatabaseError):
+        await ReadDao().get_all_items(table="missing")
+
+
+@pytest.mark.asyncio
+async def test_queries_run_on_db_thread_pool():
+    dao = ReadDao()
+    thread_names = []
+    original = dao.dao.get_rows
+
+    def recording_get_rows(**kwargs):
+        thread_names.append(threading.current_thread().name)
+        return original(**kwargs)
+
+    dao.dao.get_rows = recording_get_rows
+    await dao.get_all_items(table="prices")
+    assert thread_names[0].startswith("db")
+
+
+@pytest.mark.asyncio
+async def test_blocking_work_does_not_stall_event_loop():
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    start = time.monotonic()
+    await asyncio.gather(DBConnectionFactory().run(time.sleep, 0.2), ticker())
+    assert len(ticks) == 5
+    assert ticks[-1] - start < 0.15
+
+
+@pytest.mark.asyncio
+async def test_stream_all_items_in_chunks():
+    dao = ReadDao()
+    chunks = await dao.stream_all_items(table="prices", chunk_size=3)
+    received = [(columns, rows) async for columns, rows in chunks]
+    assert [len(rows) for _, rows in received] == [3, 1]
+    assert received[0][0] == ["id", "code", "price"]
+    assert dao.dao.pool_stats()["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_dropped_streams_return_their_connection():
+    dao = ReadDao()
+    unstarted = await dao.stream_all_items(table="prices", chunk_size=3)
+    del unstarted
+    assert dao.dao.pool_stats()["in_use"] == 0
+    started = await dao.stream_all_items(table="prices", chunk_size=3)
+    await started.__anext__()
+    assert dao.dao.pool_stats()["in_use"] == 1
+    await started.aclose()
+    assert dao.dao.pool_stats()["in_use"] == 0
+    for _ in range(dao.dao.pool.max_size + 1):
+        await dao.stream_all_items(table="prices")
+    assert len(await dao.get_all_items(table="prices")) == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_cancelled_mid_fetch_returns_its_connection():
+    dao = ReadDao()
+    run = dao.dao.run
+    fetching, finish = threading.Event(), threading.Event()
+
+    async def slow_fetch_run(func, *args, **kwargs):
+        if getattr(func, "__name__", None) == "fetchmany":
+            def blocked(*fetch_args):
+                fetching.set()
+                finish.wait(5)
+                return func(*fetch_args)
+            return await run(blocked, *args, **kwargs)
+        return await run(func, *args, **kwargs)
+
+    dao.dao.run = slow_fetch_run
+    stream = await dao.stream_all_items(table="prices", chunk_size=3)
+    reading = asyncio.ensure_future(stream.__anext__())
+    assert await asyncio.to_thread(fetching.wait, 5)
+    reading.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await reading
+    assert dao.dao.pool_stats()["in_use"] == 1
+    finish.set()
+    for _ in range(100):
+        if dao.dao.pool_stats()["in_use"] == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert dao.dao.pool_stats()["in_use"] == 0
+    dao.dao.run = run
+    assert len(await dao.get_all_items(table="prices")) == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_missing_table_raises_before_streaming():
+    dao = ReadDao()
+    with pytest.raises(sqlite3.DatabaseError):
+        await dao.stream_all_items(table="missing")
+    assert dao.dao.pool_stats()["in_use"] == 0
@@ -0,0 +1,121 @@
+import asyncio
+import gzip
+import json
+import sqlite3
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src.backend.config.configService import AppConfig, config_service, get_config
+from src.backend.checkout import responseCache
+from src.backend.checkout.responseCache import ResponseCache, choose_encoding, response_cache
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.database.catalogImport import import_catalog
+from main import app
+
+ROWS = [{"id": n, "code": f"SKU{n:04d}", "price": n * 10} for n in range(200)]
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate", offered=["br", "gzip"]) == "gzip"
+    assert choose_encoding("", offered=["br", "gzip"]) == "identity"
+    assert choose_encoding("gzip;q=0", offered=["gzip"]) == "identity"
+    assert choose_encoding("*", offered=["gzip"]) == "gzip"
+    assert choose_encoding("gzip", offered=[]) == "identity"
+    with patch.dict(responseCache.COMPRESSORS, {"br": lambda body: body}):
+        assert choose_encoding("gzip;q=0.5, br", offered=["br", "gzip"]) == "br"
+        assert choose_encoding("gzip, br;q=0.4", offered=["br", "gzip"]) == "gzip"
+        assert choose_encoding("gzip, br", offered=["br", "gzip"]) == "br"
+    assert choose_encoding("br", offered=["br", "gzip"]) == ("br" if responseCache.brotli else "identity")
+
+
+@pytest.mark.asyncio
+async def test_encodes_once_per_version():
+    cache = ResponseCache()
+    loads = []
+
+    async def load_rows():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return ROWS
+
+    results = await asyncio.gather(*(cache.get(table="prices", version="v1", encoding="gzip", load_rows=load_rows)
+                                     for _ in range(5)))
+    body, used = results[0]
+    assert used == "gzip" and all(result == results[0] for result in results)
+    assert json.loads(gzip.decompress(body)) == ROWS
+    identity, used = await cache.get(table="prices", version="v1", encoding="identity", load_rows=load_rows)
+    assert (used, json.loads(identity)) == ("identity", ROWS)
+    assert len(loads) == 1
+    await cache.get(table="prices", version="v2", encoding="identity", load_rows=load_rows)
+    assert len(loads) == 2
+    assert cache.stats()["bytes"] == len(identity)
+
+
+@pytest.mark.asyncio
+async def test_small_bodies_not_compressed():
+    async def load_rows():
+        return ROWS[:1]
+
+    body, used = await ResponseCache().get(table="offers", version="v1", encoding="gzip", load_rows=load_rows, min_size=1024)
+    assert used == "identity"
+    assert json.loads(body) == ROWS[:1]
+
+
+@pytest.fixture
+def client():
+    config = AppConfig.from_dict({**config_service.get().raw, "http": {"compression_min_size": 0}})
+    app.dependency_overrides[get_config] = lambda: config
+    response_cache.clear()
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+    response_cache.clear()
+    catalog_store.clear()
+
+
+def test_router_serves_cached_bodies(client):
+    r = client.get("/checkout/prices", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["etag"] == f'"{catalog_store.snapshot.version}-gzip"'
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert [row["code"] for row in r.json()] == ["A", "B", "C", "D"]
+
+    with patch("src.backend.dao.catalogBackend.ReadDao") as mock_read_dao:
+        plain = client.get("/checkout/prices", headers={"Accept-Encoding": "identity"})
+        again = client.get("/checkout/prices", headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"]})
+        mock_read_dao.assert_not_called()
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == f'"{catalog_store.snapshot.version}"'
+    assert plain.json() == r.json()
+    assert again.status_code == 304
+    assert response_cache.stats()["hits"] >= 2
+
+
+def test_cached_body_matches_snapshot_version(tmp_path):
+    dbpath = str(tmp_path / "catalog.db")
+    (tmp_path / "prices.csv").write_text("id,code,price\n1,A,50\n")
+    (tmp_path / "offers.csv").write_text("id,code,amount,offerprice\n")
+    import_catalog(dbpath=dbpath, prices_path=str(tmp_path / "prices.csv"), offers_path=str(tmp_path / "offers.csv"))
+    config = AppConfig.from_dict({"dbpath": dbpath, "catalog": {"refresh_interval": 3600}})
+    app.dependency_overrides[get_config] = lambda: config
+    response_cache.clear()
+    try:
+        with TestClient(app) as client:
+            snapshot = asyncio.run(catalog_store.load(config=config))
+            con = sqlite3.connect(dbpath)
+            con.execute("UPDATE prices SET price = 99 WHERE code = 'A'")
+            con.commit()
+            con.close()
+            # The write lands before the snapshot notices it, the body must still be the snapshot's
+            r = client.get("/checkout/prices")
+            assert r.headers["etag"] == f'"{snapshot.version}"'
+            assert r.json() == [{"id": 1, "code": "A", "price": 50}]
+            reloaded = asyncio.run(catalog_store.reload(config=config))
+            r = client.get("/checkout/prices")
+            assert r.headers["etag"] == f'"{reloaded.version}"'
+            assert r.json() == [{"id": 1, "code": "A", "price": 99}]
+    finally:
+        app.dependency_overrides.clear()
+        response_cache.clear()
+        catalog_store.clear()
@@ -0,0 +1,102 @@
+import pytest
+import sqlite3
+from unittest.mock import patch, mock_open
+from src.backend.database.schemaCache import SchemaCache
+from src.backend.database.dbConnectionFactory import DBConnectionFactory
+
+
+@pytest.fixture
+def dbpath(tmp_path):
+    path = str(tmp_path / "schema.db")
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE prices (id INTEGER, code TEXT, price INTEGER)")
+    con.execute("INSERT INTO prices VALUES (1, 'A', 50)")
+    con.commit()
+    con.close()
+    return path
+
+
+@pytest.fixture
+def factory(dbpath):
+    with patch('builtins.open', new_callable=mock_open), patch('yaml.load', return_value={"dbpath": dbpath}):
+        return DBConnectionFactory()
+
+
+def record_statements(con):
+    statements = []
+    con.set_trace_callback(statements.append)
+    return statements
+
+
+class TestSchemaCache:
+
+    def test_loaded_once(self, dbpath):
+        cache = SchemaCache(dbpath=dbpath)
+        con = sqlite3.connect(dbpath)
+        statements = record_statements(con)
+        assert cache.has_table(con, "prices")
+        assert cache.has_table(con, "prices")
+        assert len([s for s in statements if "sqlite_master" in s]) == 1
+
+    def test_miss_picks_up_new_table(self, dbpath):
+        cache = SchemaCache(dbpath=dbpath)
+        con = sqlite3.connect(dbpath)
+        assert not cache.has_table(con, "offers")
+        con.execute("CREATE TABLE offers (id INTEGER, code TEXT)")
+        assert cache.has_table(con, "offers")
+
+    def test_columns(self, dbpath):
+        cache = SchemaCache(dbpath=dbpath)
+        con = sqlite3.connect(dbpath)
+        assert cache.columns(con, "prices") == ("id", "code", "price")
+        assert cache.has_column(con, "prices", "code")
+        assert not cache.has_column(con, "prices", "code; DROP TABLE prices")
+
+    def test_observe_version_invalidates(self, dbpath):
+        cache = SchemaCache(dbpath=dbpath)
+        con = sqlite3.connect(dbpath)
+        cache.has_table(con, "prices")
+        version = cache.schema_version
+        cache.observe_version(version)
+        assert cache.schema_version == version
+        cache.observe_version(version + 1)
+        assert cache.schema_version is None
+
+
+class TestFactorySchemaCache:
+
+    def test_get_rows_skips_sqlite_master(self, factory):
+        with factory.connection() as con:
+            factory.get_rows(con=con, query="SELECT * FROM prices", table="prices")
+            statements = record_statements(con)
+            columns, rows = factory.get_rows(con=con, query="SELECT * FROM prices", table="prices")
+            con.set_trace_callback(None)
+        assert rows == [(1, "A", 50)]
+        assert statements == ["SELECT * FROM prices"]
+
+    def test_dropped_table_reported_missing(self, factory, dbpath):
+        with factory.connection() as con:
+            factory.get_rows(con=con, query="SELECT * FROM prices", table="prices")
+        other = sqlite3.connect(dbpath)
+        other.execute("DROP TABLE prices")
+        other.close()
+        with factory.connection() as con:
+            with pytest.raises(sqlite3.DatabaseError, match="No table found for : prices"):
+                factory.get_rows(con=con, query="SELECT * FROM prices", table="prices")
+
+    def test_validate_column(self, factory):
+        with factory.connection() as con:
+            factory.validate_column(con=con, table="prices", column="code")
+            with pytest.raises(sqlite3.DatabaseError):
+                factory.validate_column(con=con, table="prices", column="missing")
+
+    def test_pool_health_check_feeds_schema_version(self, factory, dbpath):
+        factory.pool.health_check_interval = 0
+        with factory.connection() as con:
+            factory.schema.has_table(con, "prices")
+        other = sqlite3.connect(dbpath)
+        other.execute("CREATE INDEX idx_prices_code ON prices (code)")
+        other.close()
+        with factory.connection():
+            pass
+        assert factory.schema.schema_version is None
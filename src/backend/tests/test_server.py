@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src.backend.config.configService import AppConfig
+from src.backend.dao.catalogSnapshot import catalog_store
+from src.backend.database.connectionPool import ConnectionPool
+from main import app, server_options, warm_up
+
+
+def test_server_options_from_config():
+    config = AppConfig.from_dict({"server": {"host": "10.0.0.1", "port": 9000, "workers": 3, "keep_alive": 15, "backlog": 512}})
+    options = server_options(config)
+    assert options["reload"] is False
+    assert (options["host"], options["port"], options["workers"]) == ("10.0.0.1", 9000, 3)
+    assert options["timeout_keep_alive"] == 15
+    assert options["backlog"] == 512
+
+
+def test_server_options_defaults_to_every_core():
+    with patch("main.os.cpu_count", return_value=6):
+        assert server_options(AppConfig.from_dict({}))["workers"] == 6
+
+
+def test_server_options_fall_back_without_uvloop_or_httptools():
+    with patch("main.find_spec", return_value=None):
+        options = server_options(AppConfig.from_dict({}))
+    assert (options["loop"], options["http"]) == ("asyncio", "h11")
+    with patch("main.find_spec", return_value=object()):
+        options = server_options(AppConfig.from_dict({}))
+    assert (options["loop"], options["http"]) == ("uvloop", "httptools")
+
+
+def test_ready_after_warm_up():
+    try:
+        with TestClient(app) as client:
+            r = client.get("/ready")
+            assert r.status_code == 200
+            data = r.json()
+            assert data["ready"] is True
+            assert data["catalog_items"] == 4
+            assert data["connections"] >= 1
+        r = TestClient(app).get("/ready")
+        assert r.status_code == 503
+        assert r.json() == {"ready": False}
+    finally:
+        catalog_store.clear()
+
+
+def test_pool_warm_opens_idle_connections(tmp_path):
+    dbpath = str(tmp_path / "warm.db")
+    sqlite3.connect(dbpath).close()
+    pool = ConnectionPool(dbpath=dbpath, max_size=3)
+    assert pool.warm(5) == 3
+    stats = pool.stats()
+    assert (stats["created"], stats["idle"], stats["in_use"]) == (3, 3, 0)
+    pool.close_all()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fails_for_missing_database(tmp_path):
+    dbpath = str(tmp_path / "missing.db")
+    with pytest.raises(FileNotFoundError):
+        await warm_up(AppConfig.from_dict({"dbpath": dbpath}))
+    assert not os.path.exists(dbpath)
@@ -0,0 +1,167 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from src.backend.config.configService import AppConfig
+from src.backend.dao.catalogItem import CatalogItem
+from src.backend.dao.readDao import ReadDao
+from src.backend.dao.singleFlight import SingleFlight, single_flight
+from src.backend.database.catalogImport import import_catalog
+from src.backend.metrics.collectors import single_flight_readings
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do(key="A", func=work) for _ in range(10)))
+    assert results == ["result"] * 10
+    assert len(calls) == 1
+    assert flight.coalesced("A") == 9
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_later_calls_run_separately():
+    flight = SingleFlight()
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    assert await asyncio.gather(flight.do(key="A", func=lambda: work("A")), flight.do(key="B", func=lambda: work("B"))) == ["A", "B"]
+    assert await flight.do(key="A", func=lambda: work("A")) == "A"
+    assert calls == ["A", "B", "A"]
+    assert flight.stats()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_shared_then_retried():
+    flight = SingleFlight()
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("database is locked")
+
+    results = await asyncio.gather(*(flight.do(key="A", func=failing) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(attempts) == 1
+    with pytest.raises(ValueError):
+        await flight.do(key="A", func=failing)
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.03)
+        return 42
+
+    first = asyncio.ensure_future(flight.do(key="A", func=work))
+    second = asyncio.ensure_future(flight.do(key="A", func=work))
+    await asyncio.sleep(0.005)
+    first.cancel()
+    assert await second == 42
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_batches_share_keys_in_flight():
+    flight = SingleFlight()
+    batches = []
+
+    async def fetch(keys):
+        batches.append(keys)
+        await asyncio.sleep(0.02)
+        return {key: key.lower() for key in keys if key != "X"}
+
+    first = asyncio.ensure_future(flight.do_many(keys=["A", "B", "A"], func=fetch))
+    await asyncio.sleep(0)
+    single = asyncio.ensure_future(flight.do(key="B", func=lambda: fetch(["B"])))
+    second = await flight.do_many(keys=["B", "C", "X"], func=fetch)
+    assert await first == {"A": "a", "B": "b"}
+    assert await single == "b"
+    assert second == {"B": "b", "C": "c", "X": None}
+    assert batches == [["A", "B"], ["C", "X"]]
+    assert flight.coalesced("B") == 2
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_reaches_every_caller():
+    flight = SingleFlight()
+
+    async def failing(keys):
+        await asyncio.sleep(0.01)
+        raise ValueError("database is locked")
+
+    results = await asyncio.gather(flight.do_many(keys=["A", "B"], func=failing), flight.do(key="A", func=lambda: failing(["A"])),
+                                   return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.in_flight() == 0
+
+
+@pytest.fixture
+def config(tmp_path):
+    (tmp_path / "prices.csv").write_text("id,code,price\n1,A,50\n2,B,35\n3,C,25\n")
+    (tmp_path / "offers.csv").write_text("id,code,amount,offerprice\n1,A,3,140\n")
+    dbpath = str(tmp_path / "catalog.db")
+    import_catalog(dbpath=dbpath, prices_path=str(tmp_path / "prices.csv"), offers_path=str(tmp_path / "offers.csv"))
+    single_flight.clear()
+    yield AppConfig.from_dict({"dbpath": dbpath})
+    single_flight.clear()
+
+
+@pytest.mark.asyncio
+async def test_read_dao_coalesces_item_lookups(config):
+    original = ReadDao._get_item_and_offer
+    queries = []
+
+    def slow_query(self, **kwargs):
+        queries.append(kwargs["value"])
+        time.sleep(0.02)
+        return original(self, **kwargs)
+
+    with patch.object(ReadDao, "_get_item_and_offer", slow_query):
+        lookups = [ReadDao(config=config).get_item_and_offer(table="prices", column="code", value="A") for _ in range(20)]
+        items = await asyncio.gather(*lookups)
+        frames = await asyncio.gather(*(ReadDao(config=config).get_item_and_offer(table="prices", column="code", value="A",
+                                                                                  as_frame=True) for _ in range(2)))
+    assert items == [CatalogItem(code="A", price=50, offers=((3, 140),))] * 20
+    assert len(frames) == 2
+    assert queries == ["A"] * 3
+    assert single_flight.coalesced((config.dbpath, "prices", "code", "A")) == 19
+    readings = {name: values for name, _, values, _ in single_flight_readings()}
+    assert readings["db_lookups_coalesced_by_key_total"] == {(("table", "prices"), ("key", "code=A")): 19}
+
+
+@pytest.mark.asyncio
+async def test_read_dao_coalesces_batched_lookups(config):
+    original = ReadDao._get_items_and_offers
+    queries = []
+
+    def slow_query(self, **kwargs):
+        queries.append(sorted(kwargs["values"]))
+        time.sleep(0.02)
+        return original(self, **kwargs)
+
+    with patch.object(ReadDao, "_get_items_and_offers", slow_query):
+        baskets = [["A", "B"]] * 10 + [["B", "C", "Z"]]
+        results = await asyncio.gather(*(ReadDao(config=config).get_items_and_offers(table="prices", column="code", values=basket)
+                                         for basket in baskets))
+    assert results[0] == {"A": CatalogItem(code="A", price=50, offers=((3, 140),)), "B": CatalogItem(code="B", price=35)}
+    assert results[-1] == {"B": CatalogItem(code="B", price=35), "C": CatalogItem(code="C", price=25)}
+    assert queries == [["A", "B"], ["C", "Z"]]
+    assert single_flight.coalesced((config.dbpath, "prices", "code", "B")) == 10